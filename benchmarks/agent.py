@@ -0,0 +1,351 @@
+"""
+Simulated Mimosa SNMP agent for benchmarks.
+
+``SimulatedAgent`` answers SNMPv1/v2c GET, GETNEXT and GETBULK requests from
+an in-memory OID table on localhost UDP ports, one port per simulated radio.
+Latency, jitter, packet loss and a maximum response size can be injected to
+reproduce congested wireless backhauls. The agent counts the requests it
+receives, so benchmarks can report round trips per getter.
+
+"""
+
+import asyncio
+import bisect
+import multiprocessing
+import random
+
+from pyasn1.codec.ber import decoder, encoder
+from pysnmp.proto import api, rfc1902, rfc1905
+
+MIMOSA = "1.3.6.1.4.1.43356.2.1.2."
+IF_TABLE = "1.3.6.1.2.1.2.2.1."
+IFX_TABLE = "1.3.6.1.2.1.31.1.1.1."
+
+
+def _interfaces():
+    data = {}
+    interfaces = [
+        ("eth1_emac1", 1, "001122334401"),
+        ("eth1_emac2", 2, "001122334402"),
+        ("wifi0", 1, "001122334403"),
+    ]
+    for index, (name, oper_status, mac) in enumerate(interfaces, 1):
+        data.update(
+            {
+                f"{IF_TABLE}1.{index}": rfc1902.Integer(index),
+                f"{IF_TABLE}2.{index}": rfc1902.OctetString(name),
+                f"{IF_TABLE}4.{index}": rfc1902.Integer(1500),
+                f"{IF_TABLE}5.{index}": rfc1902.Gauge32(
+                    1000000000 if index < 3 else 0
+                ),
+                f"{IF_TABLE}6.{index}": rfc1902.OctetString(hexValue=mac),
+                f"{IF_TABLE}7.{index}": rfc1902.Integer(1),
+                f"{IF_TABLE}8.{index}": rfc1902.Integer(oper_status),
+            }
+        )
+        for column in (10, 11, 13, 14, 16, 17, 19, 20):
+            data[f"{IF_TABLE}{column}.{index}"] = rfc1902.Counter32(
+                1000 * index + column
+            )
+        for column in range(6, 14):
+            data[f"{IFX_TABLE}{column}.{index}"] = rfc1902.Counter64(
+                2**33 * index + column
+            )
+    return data
+
+
+def _system(model):
+    return {
+        "1.3.6.1.2.1.1.2.0": rfc1902.ObjectIdentifier(f"1.3.6.1.4.1.43356.1.1.{model}"),
+        "1.3.6.1.2.1.1.3.0": rfc1902.TimeTicks(53614393),
+        MIMOSA + "1.1.0": rfc1902.OctetString("mimosa"),
+        MIMOSA + "1.2.0": rfc1902.OctetString("1021234567"),
+        MIMOSA + "1.3.0": rfc1902.OctetString("2.8.0"),
+    }
+
+
+def b_c_series_data():
+    """
+    OID table of a B5 radio.
+    """
+    data = {**_system(1), **_interfaces()}
+    octets = {
+        "1.6.0": "UNLOCK-CODE",
+        "1.9.0": "United States",
+        "3.1.0": "mimosa064",
+        "5.2.0": "mimosaR064",
+        "5.3.0": "mimosaM064",
+    }
+    integers = {
+        "3.3.0": 2,
+        "4.1.0": 1,
+        "4.2.0": 1,
+        "4.4.0": 4,
+        "4.5.0": 3,
+        "5.1.0": 3,
+        "5.4.0": 6,
+        "8.1.0": 2,
+        "8.2.0": 2,
+        "8.3.0": 1,
+        "8.6.0": 2,
+    }
+    addresses = {
+        "5.8.0": "10.10.10.5",
+        "5.9.0": "255.255.255.0",
+        "5.12.0": "8.8.8.8",
+        "5.13.0": "8.8.4.4",
+    }
+    data.update({MIMOSA + k: rfc1902.OctetString(v) for k, v in octets.items()})
+    data.update({MIMOSA + k: rfc1902.Integer(v) for k, v in integers.items()})
+    data.update({MIMOSA + k: rfc1902.IpAddress(v) for k, v in addresses.items()})
+    # Per-chain TX power, RX power, noise and SNR in tenths of dB(m), then
+    # per-stream TX PHY rate, TX MCS, width, RX PHY rate, RX MCS, width, EVM
+    _add_table(
+        data,
+        "6.1.1",
+        [(240, -553, -905, 352), (240, -561, -903, 342)],
+    )
+    _add_table(
+        data,
+        "6.2.1",
+        [(433, 9, 80, 390, 8, 80, -285), (433, 9, 80, 390, 8, 80, -279)],
+    )
+    return data
+
+
+def a_series_data():
+    """
+    OID table of an A5 access point with four SSIDs and two radios.
+    """
+    data = {**_system(3), **_interfaces()}
+    data.update(
+        {
+            MIMOSA + "9.7.1.0": rfc1902.IpAddress("10.10.10.5"),
+            MIMOSA + "9.7.2.0": rfc1902.IpAddress("255.255.255.0"),
+            MIMOSA + "9.7.5.0": rfc1902.IpAddress("8.8.8.8"),
+            MIMOSA + "9.7.6.0": rfc1902.IpAddress("8.8.4.4"),
+            MIMOSA + "9.2.1.0": rfc1902.Integer(2),
+            MIMOSA + "9.3.1.0": rfc1902.Integer(2),
+            MIMOSA + "9.7.7.0": rfc1902.Integer(0),
+            MIMOSA + "9.7.9.0": rfc1902.Integer(0),
+        }
+    )
+    # Stations: MAC, RSSI and SNR in tenths of dB(m), TX/RX MCS, TX/RX PHY
+    # rates and TX/RX bytes
+    stations = [
+        (
+            bytes.fromhex(f"0011223344{index:02x}"),
+            -600 - index,
+            300 - index,
+            7,
+            6,
+            260,
+            234,
+            10**9 * index,
+            10**8 * index,
+        )
+        for index in range(1, 9)
+    ]
+    _add_table(data, "9.4.1.1", stations)
+    tables = {
+        "9.1.1.1": [
+            ("labtest3", 1, 1, 1, 1),
+            ("guest", 1, 1, 1, 1),
+            ("backhaul", 0, 2, 1, 1),
+            ("mimosaM336", 0, 1, 1, 1),
+        ],
+        "9.3.3.1": [
+            ("MIMOSA-5Ghz-1", 5240, 48, 20, 24, 5240, 48, 20, 24, 2, 0),
+            ("MIMOSA-2Ghz-1", 2437, 6, 20, 16, 2437, 6, 20, 16, 0, 0),
+        ],
+    }
+    for table, rows in tables.items():
+        _add_table(data, table, rows)
+    return data
+
+
+def _add_table(data, entry, rows):
+    # Column 1 is the row index, the others follow in the order of ``rows``
+    for index, row in enumerate(rows, 1):
+        data[f"{MIMOSA}{entry}.1.{index}"] = rfc1902.Integer(index)
+        for column, value in enumerate(row, 2):
+            if isinstance(value, (str, bytes)):
+                value = rfc1902.OctetString(value)
+            elif value >= 2**31:
+                value = rfc1902.Counter64(value)
+            else:
+                value = rfc1902.Integer(value)
+            data[f"{MIMOSA}{entry}.{column}.{index}"] = value
+
+
+class _AgentProtocol(asyncio.DatagramProtocol):
+    def __init__(self, responder):
+        self.responder = responder
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, message, address):
+        responder = self.responder
+        responder.requests.value += 1
+        if responder.random.random() < responder.loss:
+            return
+        response = responder.respond(message)
+        delay = responder.latency + responder.random.uniform(0, responder.jitter)
+        asyncio.get_event_loop().call_later(
+            delay, self.transport.sendto, response, address
+        )
+
+
+# Values an SNMPv1 agent cannot send
+_no_v1_value = (
+    rfc1905.NoSuchObject,
+    rfc1905.NoSuchInstance,
+    rfc1905.EndOfMibView,
+    rfc1902.Counter64,
+)
+
+
+class _Responder:
+    def __init__(self, data, latency, jitter, loss, max_message_size, seed, requests):
+        self.data = {rfc1902.ObjectName(oid): value for oid, value in data.items()}
+        self.oids = sorted(self.data)
+        # GetNext in SNMPv1 skips the Counter64 objects
+        self.v1_oids = [
+            oid
+            for oid in self.oids
+            if not isinstance(self.data[oid], rfc1902.Counter64)
+        ]
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.max_message_size = max_message_size
+        self.random = random.Random(seed)
+        self.requests = requests
+
+    def serve(self, ports, connection):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        addresses = []
+        for _ in range(ports):
+            transport, _ = loop.run_until_complete(
+                loop.create_datagram_endpoint(
+                    lambda: _AgentProtocol(self), local_addr=("127.0.0.1", 0)
+                )
+            )
+            addresses.append(transport.get_extra_info("sockname"))
+        connection.send(addresses)
+        loop.run_forever()
+
+    def _next(self, oid, oids):
+        position = bisect.bisect_right(oids, oid)
+        if position < len(oids):
+            name = oids[position]
+            return name, self.data[name]
+        return oid, rfc1905.endOfMibView
+
+    def respond(self, message):
+        version = int(api.decodeMessageVersion(message))
+        proto = api.protoModules[version]
+        request, _ = decoder.decode(message, asn1Spec=proto.Message())
+        response = proto.apiMessage.getResponse(request)
+        request_pdu = proto.apiMessage.getPDU(request)
+        response_pdu = proto.apiMessage.getPDU(response)
+        var_binds = proto.apiPDU.getVarBinds(request_pdu)
+        oids = self.oids if version else self.v1_oids
+
+        if request_pdu.isSameTypeWith(proto.GetRequestPDU()):
+            answer = [
+                (oid, self.data.get(oid, rfc1905.noSuchObject)) for oid, _ in var_binds
+            ]
+        elif request_pdu.isSameTypeWith(proto.GetNextRequestPDU()):
+            answer = [self._next(oid, oids) for oid, _ in var_binds]
+        elif version and request_pdu.isSameTypeWith(proto.GetBulkRequestPDU()):
+            non_repeaters = int(proto.apiBulkPDU.getNonRepeaters(request_pdu))
+            max_repetitions = int(proto.apiBulkPDU.getMaxRepetitions(request_pdu))
+            answer = [self._next(oid, oids) for oid, _ in var_binds[:non_repeaters]]
+            names = [oid for oid, _ in var_binds[non_repeaters:]]
+            for _ in range(max_repetitions):
+                row = [self._next(name, oids) for name in names]
+                answer.extend(row)
+                names = [name for name, _ in row]
+        else:
+            answer = var_binds
+
+        if not version:
+            # SNMPv1 has neither exception values nor Counter64: the first
+            # var-bind without a v1 value fails the request with noSuchName
+            missing = [
+                index
+                for index, (_, value) in enumerate(answer, 1)
+                if isinstance(value, _no_v1_value)
+            ]
+            if missing:
+                answer = var_binds
+                proto.apiPDU.setErrorStatus(response_pdu, 2)
+                proto.apiPDU.setErrorIndex(response_pdu, missing[0])
+
+        proto.apiPDU.setVarBinds(response_pdu, answer)
+        encoded = encoder.encode(response)
+        if len(encoded) > self.max_message_size:
+            proto.apiPDU.setVarBinds(response_pdu, var_binds)
+            proto.apiPDU.setErrorStatus(response_pdu, 1)
+            encoded = encoder.encode(response)
+        return encoded
+
+
+class SimulatedAgent:
+    """
+    SNMP agent serving ``data`` on ``ports`` localhost UDP ports.
+
+    The agent runs in a child process so that its CPU time and allocations
+    do not show up in the measurements of the driver.
+
+    :param data: dict mapping dotted OIDs to pysnmp values
+    :param ports: Number of radios to simulate; each gets its own port
+    :param latency: Seconds added before every response is sent
+    :param jitter: Upper bound of a random delay added to ``latency``
+    :param loss: Fraction of requests silently dropped
+    :param max_message_size: Responses larger than this are answered with
+        tooBig, like a radio with a small SNMP buffer
+    :param seed: Seed of the loss and jitter random generator
+    """
+
+    def __init__(
+        self,
+        data,
+        ports=1,
+        latency=0.0,
+        jitter=0.0,
+        loss=0.0,
+        max_message_size=65507,
+        seed=0,
+    ):
+        self._requests = multiprocessing.Value("L", 0, lock=False)
+        responder = _Responder(
+            data, latency, jitter, loss, max_message_size, seed, self._requests
+        )
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(
+            target=responder.serve, args=(ports, sender), daemon=True
+        )
+        self._process.start()
+        self.addresses = receiver.recv()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    @property
+    def requests(self):
+        """
+        Number of requests received so far, dropped ones included.
+        """
+        return self._requests.value
+
+    def close(self):
+        self._process.terminate()
+        self._process.join()
@@ -0,0 +1,302 @@
+"""
+Benchmark the Mimosa driver getters and fleet polls against a simulated agent.
+
+Run from the repository root, e.g.:
+
+    python -m benchmarks.bench_driver
+    python -m benchmarks.bench_driver --series a_series --latency 0.02 --loss 0.01
+    python -m benchmarks.bench_driver --devices 50 --json
+    python -m benchmarks.bench_driver --devices 200 --workers 4
+    python -m benchmarks.bench_driver --replay
+
+For every getter, and for a poll of ``--devices`` radios, it reports the
+SNMP round trips (requests received by the agent), wall time, CPU time of the
+polling thread and the peak memory allocated while polling.
+
+The simulated agent runs on the same machine and needs a few milliseconds of
+CPU per response, so keep ``--concurrency`` low enough for it to keep up
+with the driver's timeouts on small machines.
+
+Where pysnmp's asyncio hlapi does not run (pysnmp 4.4 on Python 3.10 and
+newer), the ``poll_fleet()`` and collector rows measure the drivers' threaded
+fallback instead.
+
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.agent import SimulatedAgent, a_series_data, b_c_series_data
+from napalm_mimosa.fleet import poll_fleet_sync
+from napalm_mimosa.mimosa import MimosaDriver
+from napalm_mimosa.replay import SnmpReplay
+
+GETTERS = (
+    "get_facts",
+    "get_interfaces_list",
+    "get_interfaces",
+    "get_interfaces_counters",
+    "get_interfaces_ip",
+    "get_wireless_settings",
+    "get_wireless_performance",
+    "get_dns_servers",
+    "get_services",
+)
+
+COLUMNS = ("round_trips", "wall_ms", "cpu_ms", "alloc_peak_kib", "errors")
+
+
+def radio(agent, n, optional_args=None):
+    """
+    Driver arguments of the n-th simulated radio, which answers on the n-th
+    port of ``agent``.
+    """
+    hostname, port = agent.addresses[n]
+    return {
+        "hostname": hostname,
+        "optional_args": {**(optional_args or {}), "snmp_port": port},
+    }
+
+
+def measure(agent, poll, repeat):
+    """
+    Time ``repeat`` runs of ``poll``, then trace the allocations of one more.
+
+    ``poll`` returns the number of results that were errors.
+    """
+    requests = agent.requests
+    wall = cpu = 0.0
+    errors = 0
+    for _ in range(repeat):
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        errors += poll()
+        wall += time.perf_counter() - wall_start
+        cpu += time.thread_time() - cpu_start
+    round_trips = (agent.requests - requests) / repeat
+
+    tracemalloc.start()
+    poll()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "round_trips": round_trips,
+        "wall_ms": wall / repeat * 1000,
+        "cpu_ms": cpu / repeat * 1000,
+        "alloc_peak_kib": peak / 1024,
+        "errors": errors / repeat,
+    }
+
+
+def is_error(result):
+    return isinstance(result, str) and result.startswith("Error")
+
+
+def bench_getters(agent, args, optional_args):
+    results = {}
+    for getter in args.getters:
+
+        def poll():
+            driver = MimosaDriver(
+                args.community, args.series, **radio(agent, 0, optional_args)
+            )
+            try:
+                return int(is_error(getattr(driver, getter)()))
+            finally:
+                driver.close()
+
+        poll()  # warm up the engine and MIB loading
+        results[getter] = measure(agent, poll, args.repeat)
+        if args.replay:
+            results[f"{getter}, replayed"] = bench_replay(
+                agent, args, optional_args, getter
+            )
+    return results
+
+
+def bench_replay(agent, args, optional_args, getter):
+    """
+    Record the responses to ``getter`` once, then measure the getter served
+    from the capture, i.e. its request plans and decoding without the network.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "capture.jsonl")
+        driver = MimosaDriver(
+            args.community,
+            args.series,
+            **radio(agent, 0, {**optional_args, "record": path}),
+        )
+        getattr(driver, getter)()
+        driver.close()
+        replay = SnmpReplay(path)
+
+    def poll():
+        driver = MimosaDriver(
+            args.community,
+            args.series,
+            **radio(agent, 0, {**optional_args, "replay": replay}),
+        )
+        try:
+            return int(is_error(getattr(driver, getter)()))
+        finally:
+            driver.close()
+
+    return measure(agent, poll, args.repeat)
+
+
+def bench_fleet(agent, args, optional_args):
+    hosts = [radio(agent, n) for n in range(args.devices)]
+    results = {}
+
+    def poll_sequential():
+        errors = 0
+        for n in range(args.devices):
+            driver = MimosaDriver(
+                args.community, args.series, **radio(agent, n, optional_args)
+            )
+            try:
+                errors += sum(
+                    is_error(getattr(driver, getter)()) for getter in args.getters
+                )
+            finally:
+                driver.close()
+        return errors
+
+    poll_sequential()
+    results[f"fleet of {args.devices}, sequential"] = measure(
+        agent, poll_sequential, args.repeat
+    )
+
+    fleet_args = {k: v for k, v in optional_args.items() if k != "shared_engine"}
+
+    def poll_concurrent():
+        errors = 0
+        for result in poll_fleet_sync(
+            hosts,
+            getters=args.getters,
+            concurrency=args.concurrency,
+            deadline=args.deadline,
+            snmp_community=args.community,
+            radio_type=args.series,
+            optional_args=fleet_args,
+        ):
+            if result.error is not None:
+                errors += len(args.getters)
+            else:
+                errors += sum(map(is_error, result.results.values()))
+        return errors
+
+    poll_concurrent()
+    results[f"fleet of {args.devices}, poll_fleet"] = measure(
+        agent, poll_concurrent, args.repeat
+    )
+    if not args.workers:
+        return results
+
+    from napalm_mimosa.collector import collect
+
+    def poll_collector():
+        errors = 0
+        for result in collect(
+            hosts,
+            getters=args.getters,
+            workers=args.workers,
+            concurrency=args.concurrency,
+            deadline=args.deadline,
+            snmp_community=args.community,
+            radio_type=args.series,
+            optional_args=fleet_args,
+        ):
+            if result.error is not None:
+                errors += len(args.getters)
+            else:
+                errors += sum(map(is_error, result.results.values()))
+        return errors
+
+    results[f"fleet of {args.devices}, {args.workers} workers"] = measure(
+        agent, poll_collector, args.repeat
+    )
+    return results
+
+
+def print_table(results):
+    width = max(len(name) for name in results)
+    print(f"{'':{width}}  " + "  ".join(f"{column:>14}" for column in COLUMNS))
+    for name, figures in results.items():
+        print(
+            f"{name:{width}}  "
+            + "  ".join(f"{figures[column]:14.2f}" for column in COLUMNS)
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--series", choices=["a_series", "b_c_series"], default="b_c_series"
+    )
+    parser.add_argument("--getters", nargs="+", default=GETTERS, choices=GETTERS)
+    parser.add_argument("--community", default="public")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds added per response"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="random extra latency, seconds"
+    )
+    parser.add_argument(
+        "--loss", type=float, default=0.0, help="fraction of requests dropped"
+    )
+    parser.add_argument("--max-message-size", type=int, default=65507)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--devices", type=int, default=0, help="radios in the fleet poll (0 skips it)"
+    )
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="worker processes of a collector fleet poll (0 skips it)",
+    )
+    parser.add_argument("--deadline", type=float, default=30.0)
+    parser.add_argument(
+        "--optional-args",
+        type=json.loads,
+        default={},
+        help='driver optional_args as JSON, e.g. \'{"snmp_version": "v1"}\'',
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="also measure every getter served from a capture of its responses",
+    )
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    # Drivers share one engine so the figures exclude engine bootstrap
+    optional_args = {"shared_engine": True, **args.optional_args}
+    data = a_series_data() if args.series == "a_series" else b_c_series_data()
+
+    with SimulatedAgent(
+        data,
+        ports=max(args.devices, 1),
+        latency=args.latency,
+        jitter=args.jitter,
+        loss=args.loss,
+        max_message_size=args.max_message_size,
+    ) as agent:
+        results = bench_getters(agent, args, optional_args)
+        if args.devices:
+            results.update(bench_fleet(agent, args, optional_args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
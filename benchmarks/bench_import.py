@@ -0,0 +1,118 @@
+"""
+Benchmark the start-up cost of the Mimosa driver: importing napalm_mimosa and
+the first query made after it.
+
+Run from the repository root, e.g.:
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --series a_series --getter get_interfaces
+
+Every run is made in a fresh interpreter, so nothing is imported or cached
+beforehand. It reports the time to import napalm itself and then
+napalm_mimosa, whether pysnmp was loaded by the import, and the wall time of
+the first and second getter calls against the simulated agent, each made by
+a new driver with its own SNMP engine.
+
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from benchmarks.agent import SimulatedAgent, a_series_data, b_c_series_data
+
+COLUMNS = (
+    "import_napalm_ms",
+    "import_driver_ms",
+    "first_query_ms",
+    "second_query_ms",
+)
+
+# Run in the child interpreter with the getter, series and agent address
+# formatted in
+CHILD = """
+import json, sys, time
+
+started = time.perf_counter()
+import napalm.base.base
+imported_napalm = time.perf_counter()
+from napalm_mimosa import mimosa
+imported_driver = time.perf_counter()
+pysnmp_loaded = "pysnmp.hlapi" in sys.modules
+
+queries = []
+for _ in range(2):
+    query_started = time.perf_counter()
+    driver = mimosa.MimosaDriver(
+        "public", {series!r}, {hostname!r}, optional_args={{"snmp_port": {port!r}}}
+    )
+    result = driver.{getter}()
+    driver.close()
+    queries.append(time.perf_counter() - query_started)
+    if isinstance(result, str) and result.startswith("Error"):
+        sys.exit(result)
+
+print(json.dumps({{
+    "import_napalm_ms": (imported_napalm - started) * 1000,
+    "import_driver_ms": (imported_driver - imported_napalm) * 1000,
+    "pysnmp_loaded_by_import": pysnmp_loaded,
+    "first_query_ms": queries[0] * 1000,
+    "second_query_ms": queries[1] * 1000,
+}}))
+"""
+
+
+def run_child(address, args):
+    child = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            CHILD.format(
+                hostname=address[0],
+                port=address[1],
+                series=args.series,
+                getter=args.getter,
+            ),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if child.returncode:
+        sys.exit(child.stderr)
+    return json.loads(child.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--series", choices=["a_series", "b_c_series"], default="b_c_series"
+    )
+    parser.add_argument("--getter", default="get_wireless_settings")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    data = a_series_data() if args.series == "a_series" else b_c_series_data()
+    with SimulatedAgent(data) as agent:
+        runs = [run_child(agent.addresses[0], args) for _ in range(args.repeat)]
+
+    results = {
+        column: statistics.median(run[column] for run in runs) for column in COLUMNS
+    }
+    results["pysnmp_loaded_by_import"] = any(
+        run["pysnmp_loaded_by_import"] for run in runs
+    )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        width = max(map(len, results))
+        for name, value in results.items():
+            value = f"{value:10.2f}" if isinstance(value, float) else str(value)
+            print(f"{name:{width}}  {value:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """napalm.mimosa package."""
 from napalm_mimosa.mimosa import MimosaDriver
+from napalm_mimosa.aio import AsyncMimosaDriver
 
 
-__all__ = ["MimosaDriver"]
+__all__ = ["MimosaDriver", "AsyncMimosaDriver"]
@@ -0,0 +1,384 @@
+"""
+Asyncio variant of the Mimosa driver.
+
+``AsyncMimosaDriver`` runs the same request plans as ``MimosaDriver`` over
+pysnmp's asyncio hlapi, so the independent requests of a getter are in flight
+at the same time and a single event loop can poll many radios at once.
+
+pysnmp 4.4's asyncio hlapi relies on asyncio APIs that Python 3.10 and 3.11
+removed. On those interpreters the driver sends its requests with the
+blocking hlapi instead, from a pool of threads that each have their own SNMP
+engine, so the getters still run concurrently. ``asyncio_supported()`` tells
+which of the two is used.
+
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import os
+import sys
+import threading
+import time
+
+from pysnmp.proto.errind import RequestTimedOut, requestTimedOut
+
+from napalm_mimosa import mimosa
+from napalm_mimosa.errors import SnmpError, indication_error
+from napalm_mimosa.mimosa import (
+    MimosaDriver,
+    _import_snmp,
+    resolved_var_binds,
+    use_shared_mib_view,
+)
+from napalm_mimosa.stats import getter_label, getter_name, observe_engine
+from napalm_mimosa.usm import observe_usm, prime_engine
+
+# Process-wide asyncio SNMP engine used by drivers opened with ``shared_engine``.
+_shared_snmp_engine = None
+
+# Threads sending the requests of every driver without the asyncio hlapi
+BLOCKING_THREADS = 32
+_blocking_executor = None
+# Blocking SNMP engine of each of those threads and its transports by radio,
+# as pysnmp engines cannot be used from several threads at once
+_blocking_sessions = threading.local()
+
+
+def asyncio_supported():
+    """
+    :return: whether pysnmp's asyncio hlapi runs on this interpreter
+    """
+    import pysnmp
+
+    version = tuple(int(part) for part in pysnmp.__version__.split(".")[:2])
+    return sys.version_info < (3, 10) or version >= (5, 0)
+
+
+def _import_hlapi():
+    # pysnmp.hlapi.asyncio is only imported once an async driver is opened so
+    # that importing napalm_mimosa does not depend on it. None where it does
+    # not run: drivers then use the blocking hlapi.
+    if not asyncio_supported():
+        return None
+    from pysnmp.hlapi import asyncio as hlapi
+
+    return hlapi
+
+
+def _get_blocking_executor():
+    global _blocking_executor
+    if _blocking_executor is None:
+        _blocking_executor = concurrent.futures.ThreadPoolExecutor(
+            BLOCKING_THREADS, thread_name_prefix="napalm-mimosa-snmp"
+        )
+    return _blocking_executor
+
+
+def _forget_blocking_threads():
+    # The threads and engines of the parent do not exist in a forked child
+    global _blocking_executor, _blocking_sessions
+    _blocking_executor = None
+    _blocking_sessions = threading.local()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_blocking_threads)
+
+
+def _blocking_session(driver):
+    """
+    Return the session of ``driver`` on the blocking engine of this thread.
+    """
+    sessions = _blocking_sessions
+    if not hasattr(sessions, "engine"):
+        sessions.engine = mimosa.SnmpEngine()
+        sessions.transports = {}
+        use_shared_mib_view(sessions.engine)
+    engine = sessions.engine
+    transport = sessions.transports.get((driver.hostname, driver.snmp_port))
+    if transport is None:
+        transport = sessions.transports[(driver.hostname, driver.snmp_port)] = (
+            mimosa.UdpTransportTarget(
+                (driver.hostname, driver.snmp_port),
+                timeout=driver.snmp_timeout,
+                retries=0,
+            )
+        )
+        if driver.snmp_version == "v3":
+            observe_usm(engine)
+            if driver._usm_peer is not None:
+                prime_engine(engine, transport, driver._usm_peer)
+    if driver.stats is not None:
+        observe_engine(engine)
+    return engine, driver._snmp_auth, transport, driver._snmp_context
+
+
+def get_shared_engine():
+    """
+    Return the asyncio SNMP engine shared by every ``AsyncMimosaDriver``
+    created with ``optional_args={"shared_engine": True}``.
+
+    The engine binds to the event loop it is first used on, so share it only
+    between drivers polled from that loop.
+    """
+    global _shared_snmp_engine
+    if _shared_snmp_engine is None:
+        _shared_snmp_engine = _import_hlapi().SnmpEngine()
+    return _shared_snmp_engine
+
+
+class AsyncMimosaDriver(MimosaDriver):
+    """
+    Mimosa driver whose getters are coroutines.
+
+    Accepts the same arguments as ``MimosaDriver``, plus these
+    ``optional_args``:
+        - max_concurrent_requests: SNMP requests this driver keeps in flight
+          at once (default 4)
+        - semaphore: An ``asyncio.Semaphore`` shared between drivers to bound
+          the number of requests in flight across all of them; replaces
+          ``max_concurrent_requests``
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.max_concurrent_requests = self.optional_args.get(
+            "max_concurrent_requests", 4
+        )
+        self._semaphore = self.optional_args.get("semaphore")
+        self._hlapi = None
+        # Whether requests go through the blocking hlapi
+        self._blocking = False
+
+    async def __aenter__(self):
+        self.open()
+        if self.model is None and self.radio_type == "auto":
+            await self._run(self._series_plan())
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def open(self):
+        # Requests cannot be awaited here, so the series of a radio_type="auto"
+        # driver is detected by ``async with`` or by the first getter
+        self._open_session()
+
+    def _open_session(self):
+        _import_snmp()
+        if self.replay is not None:
+            return
+        hlapi = self._hlapi = _import_hlapi()
+        if hlapi is None:
+            # The engines and transports are those of the sending threads
+            self._blocking = True
+            self._snmp_auth = self._auth_data()
+            self._snmp_context = mimosa.ContextData()
+            return
+        if self.optional_args.get("snmp_engine") is not None:
+            self._snmp_engine = self.optional_args["snmp_engine"]
+        elif self.shared_engine:
+            self._snmp_engine = get_shared_engine()
+        else:
+            self._snmp_engine = hlapi.SnmpEngine()
+        self._snmp_auth = self._auth_data()
+        self._snmp_transport = hlapi.UdpTransportTarget(
+            (self.hostname, self.snmp_port), timeout=self.snmp_timeout, retries=0
+        )
+        self._snmp_context = hlapi.ContextData()
+        use_shared_mib_view(self._snmp_engine)
+        if self.snmp_version == "v3":
+            self._open_usm()
+        if self.stats is not None:
+            observe_engine(self._snmp_engine)
+
+    def _snmp_session(self):
+        if self._blocking:
+            return _blocking_session(self)
+        return super()._snmp_session()
+
+    async def _run_getter(self, plan):
+        with self._partial_errors() as errors:
+            try:
+                result = await self._run(plan)
+            except SnmpError as e:
+                if errors is None:
+                    raise
+                result, errors[getter_name(plan)] = None, e
+        return self._getter_result(plan, result, errors)
+
+    async def _run(self, plan):
+        _import_snmp()
+        with getter_label(plan):
+            result, error = None, None
+            while True:
+                try:
+                    if error is not None:
+                        request = plan.throw(error)
+                    else:
+                        request = plan.send(result)
+                except StopIteration as stop:
+                    return stop.value
+
+                result, error = None, None
+                try:
+                    if isinstance(request, list):
+                        result = await asyncio.gather(
+                            *[self._run(sub_plan) for sub_plan in request]
+                        )
+                    else:
+                        kind, args, options = request
+                        result = await self._snmp_request(kind, *args, **options)
+                except Exception as e:
+                    error = e
+
+    async def _snmp_request(self, kind, *var_binds, oids=None, **options):
+        if self.replay is not None:
+            if self.replay.latency:
+                await asyncio.sleep(self.replay.latency)
+            return self._replayed_request(kind, var_binds, oids)
+        if self.recorder is None:
+            return await self._send_request(kind, var_binds, oids, options)
+        try:
+            response = await self._send_request(kind, var_binds, oids, options)
+        except SnmpError as e:
+            self.recorder.record_error(self.radio_address, kind, var_binds, e)
+            raise
+        self.recorder.record(self.radio_address, kind, var_binds, *response)
+        return response
+
+    async def _send_request(self, kind, var_binds, oids, options):
+        if self._snmp_auth is None:
+            self._open_session()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        if self._blocking:
+            return await self._send_blocking_request(kind, var_binds, oids, options)
+
+        session = self._snmp_session()
+        command = {
+            "get": self._hlapi.getCmd,
+            "next": self._hlapi.nextCmd,
+            "bulk": self._hlapi.bulkCmd,
+        }[kind]
+
+        with self._traced_request(kind, var_binds, oids) as trace:
+            var_binds = resolved_var_binds(var_binds)
+            for attempt, timeout in self._request_attempts():
+                async with self._semaphore:
+                    # The command reads the transport before its first await,
+                    # so concurrent requests can each set their own timeout.
+                    session[2].timeout = timeout
+                    sent = time.monotonic()
+                    trace.attempts += 1
+                    try:
+                        errorIndication, errorStatus, errorIndex, varBinds = (
+                            await command(*session, *var_binds, **options)
+                        )
+                    except Exception:
+                        self._request_failed()
+                        raise
+
+                if isinstance(errorIndication, RequestTimedOut):
+                    trace.timeouts += 1
+                    self._request_timed_out()
+                    continue
+                self._request_answered(attempt, time.monotonic() - sent)
+                self._usm_answered(errorIndication)
+                break
+            else:
+                self._request_failed()
+                raise indication_error(requestTimedOut, oids or ())
+
+            if errorIndication:
+                raise indication_error(errorIndication, oids or ())
+            elif errorStatus:
+                if kind == "next" and errorStatus == 2:
+                    # noSuchName is how SNMPv1 agents report the end of the MIB
+                    return 0, []
+                trace.error = errorStatus.prettyPrint()
+                return errorStatus, []
+
+            # GET answers with one row of var-binds, GETNEXT/GETBULK with a table
+            rows = [varBinds] if kind == "get" else varBinds
+            trace.varbinds_received = sum(len(row) for row in rows)
+            return 0, rows
+
+    async def _send_blocking_request(self, kind, var_binds, oids, options):
+        # The request and its retries run in a sending thread, in a copy of
+        # the context that carries the getter and request being traced. The
+        # var-binds are resolved here, as the shared MIB view loads MIBs on
+        # first use and cannot do so from several threads at once.
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        var_binds = resolved_var_binds(var_binds)
+        async with self._semaphore:
+            return await loop.run_in_executor(
+                _get_blocking_executor(),
+                context.run,
+                super()._send_request,
+                kind,
+                var_binds,
+                oids,
+                options,
+            )
+
+    async def get_facts(self):
+        try:
+            return await self._run_getter(self._get_facts_plan())
+        except Exception as e:
+            return self._getter_error(e, "Error getting facts")
+
+    async def get_interfaces_list(self):
+        return await self._run_getter(self._get_interfaces_list_plan())
+
+    async def get_interfaces(self):
+        try:
+            return await self._run_getter(self._get_interfaces_plan())
+        except Exception as e:
+            return self._getter_error(e, "Error getting interfaces")
+
+    async def get_interfaces_counters(self):
+        try:
+            return await self._run_getter(self._get_interfaces_counters_plan())
+        except Exception as e:
+            return self._getter_error(e, "Error getting interfaces counters")
+
+    async def get_snapshot(self):
+        try:
+            return await self._run_getter(self._get_snapshot_plan())
+        except Exception as e:
+            return self._getter_error(e, "Error getting snapshot")
+
+    async def get_interfaces_ip(self):
+        try:
+            return await self._run_getter(self._get_interfaces_ip_plan())
+        except Exception as e:
+            return self._getter_error(e, "Error getting interfaces ip")
+
+    async def get_wireless_settings(self):
+        try:
+            return await self._run_getter(self._get_wireless_settings_plan())
+        except Exception as e:
+            return self._getter_error(e, "Error getting wireless settings")
+
+    async def get_wireless_performance(self, stations=None):
+        try:
+            return await self._run_getter(
+                self._get_wireless_performance_plan(stations)
+            )
+        except Exception as e:
+            return self._getter_error(e, "Error getting wireless performance")
+
+    async def get_dns_servers(self):
+        try:
+            return await self._run_getter(self._get_dns_servers_plan())
+        except Exception as e:
+            return self._getter_error(e, "Error getting DNS servers")
+
+    async def get_services(self):
+        try:
+            return await self._run_getter(self._get_services_plan())
+        except Exception as e:
+            return self._getter_error(e, "Error getting services")
@@ -0,0 +1,70 @@
+"""
+Result cache for slow-changing SNMP values.
+
+``SnmpCache`` is a size-bounded LRU with a TTL per entry. It holds the raw
+SNMP values and walked rows the radio answered, which the getters decode on
+every read.
+A driver opened with ``optional_args={"cache": True}`` gets its own cache;
+passing an ``SnmpCache`` instance instead shares it between drivers.
+
+"""
+
+import time
+from collections import OrderedDict
+
+
+class SnmpCache:
+    """
+    LRU cache of SNMP results keyed by (hostname, OID).
+
+    Every entry carries the cache class of its OID ("static", "config", ...)
+    so entries can be dropped per host and per class.
+    """
+
+    def __init__(self, max_entries=10000, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        :return: tuple of (found, value); expired entries count as misses
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, value, cache_class = entry
+            if expires > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, value
+            self._entries.pop(key, None)
+
+        self.misses += 1
+        return False, None
+
+    def set(self, key, value, ttl, cache_class=None):
+        self._entries[key] = (self.clock() + ttl, value, cache_class)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, hostname=None, cache_class=None):
+        """
+        Drop the entries of ``hostname`` (every host if None), optionally only
+        those of one cache class.
+        """
+        # A TrapReceiver may invalidate entries while a driver reads them
+        for key, entry in list(self._entries.items()):
+            if hostname is not None and key[0] != hostname:
+                continue
+            if cache_class is not None and entry[2] != cache_class:
+                continue
+            self._entries.pop(key, None)
+
+    def stats(self):
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,213 @@
+"""
+Multiprocess collector for Mimosa radios.
+
+``poll_fleet()`` keeps a single core busy decoding BER and running pysnmp
+long before the network is the bottleneck. ``collect_lines()`` shards the
+hosts across worker processes instead, each running ``poll_fleet()`` with its
+own event loop and SNMP engine, and streams every radio's ``FleetResult``
+back as one line of compact JSON as soon as it is done. ``collect()`` decodes
+the lines into ``FleetResult``; ``python -m napalm_mimosa.collector`` writes
+them to standard output.
+
+Where pysnmp's asyncio hlapi does not run, the drivers of each worker send
+their requests from a bounded pool of threads instead, so the collector works
+on every supported Python.
+
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from multiprocessing.connection import wait
+
+from napalm_mimosa.errors import PartialResult
+from napalm_mimosa.fleet import FleetResult, poll_fleet_sync
+
+
+def _json_default(value):
+    # typed_values getters return binary strings as bytes
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _encodable(value):
+    # Partial results become {"result": ..., "errors": {field: error}}
+    if not isinstance(value, PartialResult):
+        return value
+    return {
+        "result": value.result,
+        "errors": {
+            name: {"type": type(e).__name__, "message": str(e), "oids": e.oids}
+            for name, e in value.errors.items()
+        },
+    }
+
+
+def encode_result(result):
+    """
+    Return ``result`` as one line of compact JSON, newline included.
+    """
+    return (
+        json.dumps(
+            {
+                "hostname": result.hostname,
+                "results": {
+                    getter: _encodable(value)
+                    for getter, value in result.results.items()
+                },
+                "error": result.error,
+                "elapsed": round(result.elapsed, 6),
+            },
+            separators=(",", ":"),
+            default=_json_default,
+        ).encode()
+        + b"\n"
+    )
+
+
+def decode_result(line):
+    return FleetResult(**json.loads(line))
+
+
+def _collect_shard(connection, hosts, kwargs):
+    # Runs in the worker process; every result is sent as soon as it is done
+    try:
+        for result in poll_fleet_sync(hosts, **kwargs):
+            connection.send_bytes(encode_result(result))
+    finally:
+        connection.close()
+
+
+def collect_lines(
+    hosts,
+    getters=("get_facts",),
+    workers=None,
+    concurrency=100,
+    deadline=30.0,
+    mp_context=None,
+    **driver_kwargs,
+):
+    """
+    Poll many radios from a pool of worker processes and yield one JSON line
+    (bytes, newline included) per radio as soon as it completes.
+
+    Host ``i`` is polled by worker ``i % workers``. Each worker runs
+    ``poll_fleet()`` on its shard with its own event loop and SNMP engine, so
+    the process-wide caches of the driver (detected models, RTT estimates,
+    SNMPv3 engines) are per worker.
+
+    :param hosts: Iterable of hostnames, or of dicts of ``AsyncMimosaDriver``
+        arguments that override ``driver_kwargs`` for that radio
+    :param getters: Names of the driver getters to run on every radio
+    :param workers: Number of worker processes (default ``os.cpu_count()``)
+    :param concurrency: Number of radios each worker polls at the same time
+    :param deadline: Seconds allowed for all getters of one radio
+    :param mp_context: ``multiprocessing`` start method of the workers, e.g.
+        "spawn"; the platform default if None
+    :param driver_kwargs: Default ``AsyncMimosaDriver`` arguments. They are
+        sent to the workers, so they must be picklable: pass no SNMP engine,
+        semaphore or callable ``stats``.
+    """
+    hosts = list(hosts)
+    if not hosts:
+        return
+    workers = max(1, min(workers or os.cpu_count() or 1, len(hosts)))
+    context = multiprocessing.get_context(mp_context)
+    kwargs = {
+        "getters": tuple(getters),
+        "concurrency": concurrency,
+        "deadline": deadline,
+        **driver_kwargs,
+    }
+
+    processes = {}
+    try:
+        for shard in range(workers):
+            reader, writer = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_collect_shard,
+                args=(writer, hosts[shard::workers], kwargs),
+                daemon=True,
+            )
+            process.start()
+            # Only the worker holds the writing end, so the reader sees EOF
+            # once the worker is done
+            writer.close()
+            processes[reader] = process
+
+        while processes:
+            for reader in wait(list(processes)):
+                try:
+                    yield reader.recv_bytes()
+                except EOFError:
+                    process = processes.pop(reader)
+                    reader.close()
+                    process.join()
+                    if process.exitcode:
+                        raise RuntimeError(
+                            f"Collector worker {process.pid} exited with code "
+                            f"{process.exitcode}"
+                        )
+    finally:
+        for reader, process in processes.items():
+            process.terminate()
+            process.join()
+            reader.close()
+
+
+def collect(hosts, **kwargs):
+    """
+    Like ``collect_lines()``, taking the same arguments, but yield each
+    radio's ``FleetResult``.
+    """
+    for line in collect_lines(hosts, **kwargs):
+        yield decode_result(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Poll Mimosa radios from a pool of worker processes and "
+        "write one JSON line per radio to standard output."
+    )
+    parser.add_argument(
+        "hosts", help="file with one hostname per line, or - for standard input"
+    )
+    parser.add_argument("--community", default="public")
+    parser.add_argument(
+        "--radio-type", choices=["a_series", "b_c_series", "auto"], default="auto"
+    )
+    parser.add_argument(
+        "--getter", action="append", dest="getters", help="may be repeated"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--deadline", type=float, default=30.0)
+    parser.add_argument(
+        "--optional-args", type=json.loads, default={}, help="JSON object"
+    )
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.hosts == "-" else open(args.hosts)
+    with source:
+        hosts = [line.strip() for line in source if line.strip()]
+
+    output = sys.stdout.buffer
+    for line in collect_lines(
+        hosts,
+        getters=args.getters or ["get_facts"],
+        workers=args.workers,
+        concurrency=args.concurrency,
+        deadline=args.deadline,
+        snmp_community=args.community,
+        radio_type=args.radio_type,
+        optional_args=args.optional_args,
+    ):
+        output.write(line)
+        output.flush()
+
+
+if __name__ == "__main__":
+    main()
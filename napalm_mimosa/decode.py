@@ -0,0 +1,72 @@
+"""
+Decoding of SNMP values without going through ``prettyPrint()``.
+
+``typed_value()`` reads the Python value straight out of a pyasn1 value:
+integers of every SMI type (Integer32, Counter32/64, Gauge32, TimeTicks, ...)
+become ``int``, IpAddress a dotted-quad ``str``, printable OctetStrings a
+``str`` and other OctetStrings ``bytes``. ``as_string()`` turns a typed
+value into the text ``prettyPrint()`` would have produced, for the drivers'
+default string output.
+
+"""
+
+# Byte values prettyPrint() shows as text rather than as a hex string
+_PRINTABLE = bytes(range(32, 127))
+
+# Value class -> function decoding its values, filled in as classes are seen
+_decoders = {}
+
+
+def typed_value(value):
+    cls = type(value)
+    try:
+        decode = _decoders[cls]
+    except KeyError:
+        decode = _decoders[cls] = _decoder_for(cls)
+    return decode(value)
+
+
+def _decoder_for(cls):
+    # pyasn1 is not imported until there is a value to decode
+    from pyasn1.type import univ
+    from pysnmp.proto.rfc1902 import IpAddress
+
+    if issubclass(cls, univ.Integer):
+        return int
+    if issubclass(cls, univ.Null):
+        # noSuchObject, noSuchInstance and endOfMibView only have a text form
+        return _pretty_print
+    if issubclass(cls, IpAddress):
+        return _ip_address
+    if issubclass(cls, univ.OctetString):
+        return _octets
+    if issubclass(cls, univ.ObjectIdentifier):
+        return _dotted
+    return _pretty_print
+
+
+def _pretty_print(value):
+    return value.prettyPrint()
+
+
+def _ip_address(value):
+    return ".".join(map(str, value.asOctets()))
+
+
+def _octets(value):
+    octets = value.asOctets()
+    if octets.translate(None, _PRINTABLE):
+        return octets
+    return octets.decode("ascii")
+
+
+def _dotted(value):
+    return ".".join(map(str, value))
+
+
+def as_string(value):
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    if isinstance(value, str):
+        return value
+    return str(value)
@@ -0,0 +1,90 @@
+"""
+Change detection between polls.
+
+A driver opened with ``optional_args={"delta": True}`` remembers the values
+its getters returned and from then on returns only the fields that changed
+since the previous poll of the same radio. Passing a ``DeltaStore`` instance
+instead shares the remembered values between drivers, so a fleet poller that
+creates a new driver per poll still gets diffs.
+
+A changed field is reported at its place in the getter's usual structure as
+``{"old": ..., "new": ..., "timestamp": ...}``; fields that appeared have an
+``old`` of None and fields that disappeared a ``new`` of None. The first poll
+of a radio reports every field as new.
+
+"""
+
+import time
+
+_MISSING = object()
+
+
+class DeltaStore:
+    """
+    Last values of the getter fields of many radios, keyed by
+    (hostname, getter).
+    """
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._values = {}
+
+    def __len__(self):
+        return len(self._values)
+
+    def update(self, hostname, getter, result):
+        """
+        Remember ``result`` as the latest output of ``getter`` for
+        ``hostname``.
+
+        :return: dict with the fields that changed since the previous update,
+            nested like ``result``
+        """
+        timestamp = self.clock()
+        fields = dict(_flatten(result))
+        previous = self._values.get((hostname, getter), {})
+        self._values[(hostname, getter)] = fields
+
+        changes = {}
+        for path in [*fields, *(path for path in previous if path not in fields)]:
+            old = previous.get(path, _MISSING)
+            new = fields.get(path, _MISSING)
+            if old is _MISSING or new is _MISSING or old != new:
+                _insert(
+                    changes,
+                    path,
+                    {
+                        "old": None if old is _MISSING else old,
+                        "new": None if new is _MISSING else new,
+                        "timestamp": timestamp,
+                    },
+                )
+        return changes
+
+    def forget(self, hostname=None, getter=None):
+        """
+        Drop the values of ``hostname`` (every host if None), optionally only
+        those of one getter, so that their next poll reports every field.
+        """
+        for key in list(self._values):
+            if hostname is not None and key[0] != hostname:
+                continue
+            if getter is not None and key[1] != getter:
+                continue
+            del self._values[key]
+
+
+def _flatten(value, path=()):
+    # Dicts are walked down to their leaves, so empty dicts have no fields;
+    # anything else, lists included, is compared as a whole
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, (*path, key))
+    else:
+        yield path, value
+
+
+def _insert(changes, path, change):
+    for key in path[:-1]:
+        changes = changes.setdefault(key, {})
+    changes[path[-1]] = change
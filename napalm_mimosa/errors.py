@@ -0,0 +1,100 @@
+"""
+Errors of the Mimosa drivers' SNMP requests.
+
+Getters return their errors as "Error getting ...: ..." strings by default.
+Drivers created with ``optional_args={"errors": "raise"}`` raise the
+``SnmpError`` subclasses below instead, and with ``"partial"`` their getters
+return a ``PartialResult``: the fields that were read, and the error of each
+field that was not, so only those need to be polled again.
+
+"""
+
+from typing import Dict, NamedTuple
+
+from pysnmp.proto import errind
+
+# Error indications of a radio rejecting the community or SNMPv3 credentials
+_auth_indications = (
+    errind.UnknownCommunityName,
+    errind.UnknownSecurityName,
+    errind.UnknownUserName,
+    errind.UnknownEngineID,
+    errind.UnsupportedSecurityLevel,
+    errind.NotInTimeWindow,
+    errind.WrongDigest,
+    errind.AuthenticationError,
+    errind.AuthenticationFailure,
+    errind.DecryptionError,
+)
+
+# errorStatus values: noSuchName, noAccess and authorizationError
+_NO_SUCH_NAME = 2
+_auth_statuses = (6, 16)
+
+
+class SnmpError(Exception):
+    """
+    An SNMP request failed. ``oids`` are the dotted OIDs it was for, when
+    known.
+    """
+
+    def __init__(self, message, oids=()):
+        super().__init__(message)
+        self.oids = tuple(oids)
+
+
+class SnmpTimeoutError(SnmpError):
+    """The radio answered none of the attempts of a request."""
+
+
+class SnmpAuthError(SnmpError):
+    """The radio rejected the community or the SNMPv3 credentials."""
+
+
+class NoSuchObjectError(SnmpError):
+    """The radio does not implement the requested object."""
+
+
+class SnmpDecodeError(SnmpError):
+    """A value returned by the radio could not be decoded."""
+
+
+class PartialResult(NamedTuple):
+    # The getter's usual result, without the fields that failed
+    result: dict
+    # Name of every failed field or table -> its SnmpError
+    errors: Dict[str, SnmpError]
+
+    @property
+    def missing_oids(self):
+        """
+        The OIDs of the fields that failed.
+        """
+        oids = (oid for error in self.errors.values() for oid in error.oids)
+        return list(dict.fromkeys(oids))
+
+
+def indication_error(errorIndication, oids=()):
+    """
+    Return the ``SnmpError`` of a request that failed with the pysnmp error
+    indication ``errorIndication``.
+    """
+    message = f"SNMP Error: {errorIndication}"
+    if isinstance(errorIndication, errind.RequestTimedOut):
+        return SnmpTimeoutError(message, oids)
+    if isinstance(errorIndication, _auth_indications):
+        return SnmpAuthError(message, oids)
+    return SnmpError(message, oids)
+
+
+def status_error(errorStatus, oids=()):
+    """
+    Return the ``SnmpError`` of a request the radio answered with the error
+    status ``errorStatus``.
+    """
+    message = f"SNMP Error: {errorStatus.prettyPrint()}"
+    if errorStatus == _NO_SUCH_NAME:
+        return NoSuchObjectError(message, oids)
+    if errorStatus in _auth_statuses:
+        return SnmpAuthError(message, oids)
+    return SnmpError(message, oids)
@@ -0,0 +1,143 @@
+"""
+Fleet polling for Mimosa radios.
+
+``poll_fleet()`` runs NAPALM getters against many radios from one event loop
+and one shared SNMP engine, yielding each radio's results as soon as it is
+done. ``poll_fleet_sync()`` wraps it for code without an event loop.
+
+Both work on every supported Python. Where pysnmp's asyncio hlapi does not
+run (pysnmp 4.4 on Python 3.10 and newer), the drivers send their requests
+from the threads of ``napalm_mimosa.aio``, so at most ``BLOCKING_THREADS``
+requests are in flight whatever the ``concurrency``.
+
+"""
+
+import asyncio
+import time
+from typing import NamedTuple, Optional
+
+from napalm_mimosa.aio import AsyncMimosaDriver, _import_hlapi
+
+
+class FleetResult(NamedTuple):
+    hostname: str
+    results: dict
+    error: Optional[str]
+    elapsed: float
+
+
+_DONE = object()
+
+
+async def _poll_host(host, getters, deadline, engine, driver_kwargs):
+    if isinstance(host, str):
+        host = {"hostname": host}
+    kwargs = {**driver_kwargs, **host}
+    kwargs["optional_args"] = {
+        **driver_kwargs.get("optional_args", {}),
+        **host.get("optional_args", {}),
+    }
+    if engine is not None:
+        kwargs["optional_args"]["snmp_engine"] = engine
+    hostname = kwargs.get("hostname")
+    start = time.monotonic()
+
+    async def poll():
+        # Entering the driver detects the series of radio_type="auto" radios
+        # once, before the getters run concurrently
+        async with AsyncMimosaDriver(**kwargs) as driver:
+            return await asyncio.gather(
+                *[getattr(driver, getter)() for getter in getters]
+            )
+
+    try:
+        values = await asyncio.wait_for(poll(), deadline)
+    except asyncio.TimeoutError:
+        return FleetResult(
+            hostname, {}, f"Deadline of {deadline}s exceeded", time.monotonic() - start
+        )
+    except Exception as e:
+        return FleetResult(hostname, {}, str(e), time.monotonic() - start)
+
+    return FleetResult(
+        hostname, dict(zip(getters, values)), None, time.monotonic() - start
+    )
+
+
+async def poll_fleet(
+    hosts, getters=("get_facts",), concurrency=100, deadline=30.0, **driver_kwargs
+):
+    """
+    Poll many radios concurrently and yield a ``FleetResult`` per radio as
+    soon as it completes.
+
+    At most ``concurrency`` radios are polled at once and hosts are pulled
+    from ``hosts`` lazily, so the fleet is never held in memory. All radios
+    share one SNMP engine.
+
+    :param hosts: Iterable of hostnames, or of dicts of ``AsyncMimosaDriver``
+        arguments that override ``driver_kwargs`` for that radio
+    :param getters: Names of the driver getters to run on every radio
+    :param concurrency: Number of radios polled at the same time
+    :param deadline: Seconds allowed for all getters of one radio; a radio
+        that misses it is reported with an error instead of stalling the batch
+    :param driver_kwargs: Default ``AsyncMimosaDriver`` arguments, e.g.
+        ``snmp_community``, ``radio_type`` and ``optional_args``
+    """
+    hosts = iter(hosts)
+    queue = asyncio.Queue(maxsize=concurrency)
+    hlapi = _import_hlapi()
+    # Without asyncio support the drivers send from threads with their own
+    # engines
+    engine = hlapi.SnmpEngine() if hlapi is not None else None
+
+    async def worker():
+        # Workers share the host iterator; next() never awaits, so every
+        # host is handed to exactly one worker.
+        for host in hosts:
+            await queue.put(
+                await _poll_host(host, getters, deadline, engine, driver_kwargs)
+            )
+
+    async def run_workers():
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            await queue.put(_DONE)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    runner = asyncio.ensure_future(run_workers())
+
+    try:
+        while True:
+            result = await queue.get()
+            if result is _DONE:
+                break
+            yield result
+    finally:
+        for task in workers + [runner]:
+            task.cancel()
+        dispatcher = getattr(engine, "transportDispatcher", None)
+        if dispatcher is not None:
+            dispatcher.closeDispatcher()
+
+
+def poll_fleet_sync(hosts, **kwargs):
+    """
+    Blocking generator around ``poll_fleet()`` taking the same arguments.
+    It runs its own event loop and yields each ``FleetResult`` as it arrives.
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    results = poll_fleet(hosts, **kwargs)
+
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(results.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(results.aclose())
+        loop.close()
+        asyncio.set_event_loop(None)
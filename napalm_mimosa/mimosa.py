@@ -7,8 +7,216 @@ Please refer to napalm.readthedocs.org for more information.
 """
 
 from napalm.base.base import NetworkDriver
-from pysnmp.hlapi import *
+import contextvars
+import importlib
+import math
+import os
+import time
+from contextlib import contextmanager
+from pysnmp.proto.errind import RequestTimedOut, requestTimedOut
 from ipaddress import ip_network
+from napalm_mimosa.cache import SnmpCache
+from napalm_mimosa.decode import as_string, typed_value
+from napalm_mimosa.delta import DeltaStore
+from napalm_mimosa.errors import (
+    NoSuchObjectError,
+    PartialResult,
+    SnmpDecodeError,
+    SnmpError,
+    indication_error,
+    status_error,
+)
+from napalm_mimosa.models import detected_model, find_model, remember_model
+from napalm_mimosa.replay import SnmpRecorder, SnmpReplay
+from napalm_mimosa.retry import (
+    CircuitOpenError,
+    attempt_timeouts,
+    get_circuit_breaker,
+    get_rtt_estimator,
+)
+from napalm_mimosa.usm import (
+    auth_protocols,
+    forget_usm_peers,
+    observe_usm,
+    prime_engine,
+    priv_protocols,
+    remember_usm_peer,
+    unprime_engine,
+    usm_peer,
+    user_data,
+)
+from napalm_mimosa.stats import (
+    RequestEvent,
+    RequestTrace,
+    SnmpStats,
+    current_getter,
+    getter_label,
+    getter_name,
+    observe_engine,
+    traced_request,
+)
+
+# pysnmp names used by this module, imported when the first driver sends a
+# request rather than with the module: the hlapi alone takes longer to import
+# than the rest of napalm_mimosa.
+_snmp_names = {
+    "pysnmp.hlapi": (
+        "CommunityData",
+        "ContextData",
+        "ObjectIdentity",
+        "ObjectType",
+        "SnmpEngine",
+        "UdpTransportTarget",
+        "bulkCmd",
+        "getCmd",
+        "nextCmd",
+    ),
+    "pysnmp.proto.rfc1902": ("Counter64", "Null", "ObjectName"),
+    "pysnmp.proto.rfc1905": ("NoSuchInstance", "NoSuchObject"),
+}
+_snmp_imported = False
+
+# Process-wide SNMP engine used by drivers opened with ``shared_engine``.
+_shared_snmp_engine = None
+
+# MIB view that outgoing var-binds are resolved against, and the var-binds
+# resolved so far by OID. pysnmp otherwise resolves every var-bind of every
+# request again.
+_mib_view = None
+_resolved_var_binds = {}
+_max_resolved_var_binds = 10000
+
+# Errors of the fields of the getter being run in partial mode, by field name
+_field_errors = contextvars.ContextVar("field_errors", default=None)
+# Value of a field that failed in partial mode, dropped from the result
+_FAILED = object()
+
+
+def _import_snmp():
+    """
+    Import the pysnmp names in ``_snmp_names`` into this module. Names that
+    are already set, e.g. patched by tests, are kept.
+    """
+    global _snmp_imported
+    if _snmp_imported:
+        return
+    for module_name, names in _snmp_names.items():
+        module = importlib.import_module(module_name)
+        for name in names:
+            globals().setdefault(name, getattr(module, name))
+    _snmp_imported = True
+
+
+def __getattr__(name):
+    # Makes the pysnmp names available to other modules (and mock.patch)
+    # before a driver has imported them
+    if any(name in names for names in _snmp_names.values()):
+        _import_snmp()
+        if name in globals():
+            return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _LazyMibCompiler:
+    # Stands in for pysmi's MIB compiler in the builder of ``_mib_view`` until
+    # a MIB that is not bundled with pysnmp is loaded: numeric OIDs never
+    # need it, and building the compiler's parser is most of the cost of a
+    # first request.
+    def __init__(self, mib_builder):
+        self.mib_builder = mib_builder
+
+    def compile(self, *mib_names, **options):
+        from pysnmp.smi.compiler import addMibCompiler
+
+        addMibCompiler(self.mib_builder, ifAvailable=True)
+        compiler = self.mib_builder.getMibCompiler()
+        if compiler is self:
+            return {}
+        return compiler.compile(*mib_names, **options)
+
+
+def shared_mib_view():
+    """
+    Return the MIB view shared by the engines of every driver in the process.
+    """
+    global _mib_view
+    if _mib_view is None:
+        from pysnmp.smi import builder, compiler, view
+
+        mib_builder = builder.MibBuilder()
+        # Where the MIB compiler keeps the MIBs it compiled
+        mib_builder.setMibCompiler(
+            _LazyMibCompiler(mib_builder), compiler.defaultDest
+        )
+        _mib_view = view.MibViewController(mib_builder)
+    return _mib_view
+
+
+def use_shared_mib_view(engine):
+    # pysnmp gives every engine a MIB view of its own on first use, which
+    # pays again for loading the MIBs and building the MIB compiler
+    if not engine.getUserContext("mibViewController"):
+        engine.setUserContext(mibViewController=shared_mib_view())
+
+
+def resolved_var_binds(var_binds):
+    """
+    Return ``var_binds`` with every (ObjectName, Null) pair replaced by an
+    ``ObjectType`` already resolved against the MIB, which pysnmp sends as
+    is. Other arguments, e.g. the counts of a GETBULK, are kept.
+    """
+    resolved = []
+    for var_bind in var_binds:
+        if isinstance(var_bind, tuple):
+            name = var_bind[0]
+            var_bind = _resolved_var_binds.get(name)
+            if var_bind is None:
+                if len(_resolved_var_binds) >= _max_resolved_var_binds:
+                    _resolved_var_binds.clear()
+                var_bind = ObjectType(ObjectIdentity(name), Null(""))
+                var_bind.resolveWithMib(shared_mib_view())
+                _resolved_var_binds[name] = var_bind
+        resolved.append(var_bind)
+    return resolved
+
+
+def get_shared_engine():
+    """
+    Return the SNMP engine shared by every driver created with
+    ``optional_args={"shared_engine": True}``.
+
+    The engine is created on first use and owns a single transport dispatcher
+    and UDP socket, so many drivers in one process do not each pay for engine
+    bootstrap and MIB loading.
+    """
+    global _shared_snmp_engine
+    if _shared_snmp_engine is None:
+        _import_snmp()
+        _shared_snmp_engine = SnmpEngine()
+    return _shared_snmp_engine
+
+
+def _combined_power(powers):
+    # Total power in dBm of signals received in dBm, e.g. on several chains
+    total = sum(10 ** (power / 10) for power in powers)
+    return round(10 * math.log10(total), 1) if total else None
+
+
+def _mac_address(octets):
+    if isinstance(octets, str):
+        octets = octets.encode("latin-1")
+    return ":".join(f"{octet:02x}" for octet in octets)
+
+
+def _without_failed(result):
+    # Drop the fields that failed in partial mode from a getter's result
+    if not isinstance(result, dict):
+        return result
+    return {
+        name: _without_failed(value)
+        for name, value in result.items()
+        if value is not _FAILED
+    }
 
 
 class MimosaDriver(NetworkDriver):
@@ -34,6 +242,8 @@ class MimosaDriver(NetworkDriver):
         "mgmt_vlan_status": ".1.3.6.1.4.1.43356.2.1.2.8.2.0",
         "mgmt_cloud_status": ".1.3.6.1.4.1.43356.2.1.2.8.3.0",
         "syslog_status": ".1.3.6.1.4.1.43356.2.1.2.8.6.0",
+        "mimosa_chain_table": ".1.3.6.1.4.1.43356.2.1.2.6.1",
+        "mimosa_stream_table": ".1.3.6.1.4.1.43356.2.1.2.6.2",
     }
 
     a_series_OIDs = {
@@ -43,12 +253,121 @@ class MimosaDriver(NetworkDriver):
         "mimosa_local_ip": ".1.3.6.1.4.1.43356.2.1.2.9.7.1.0",
         "mimosa_netmask": ".1.3.6.1.4.1.43356.2.1.2.9.7.2.0",
         "mimosa_ssid_list": ".1.3.6.1.4.1.43356.2.1.2.9.1.1",
+        "mimosa_channel_power_table": ".1.3.6.1.4.1.43356.2.1.2.9.3.3",
         "mimosa_wireless_mode": ".1.3.6.1.4.1.43356.2.1.2.9.2.1.0",
         "mimosa_auto_channel": ".1.3.6.1.4.1.43356.2.1.2.9.3.1.0",
         "primary_dns_server": ".1.3.6.1.4.1.43356.2.1.2.9.7.5.0",
         "secondary_dns_server": ".1.3.6.1.4.1.43356.2.1.2.9.7.6.0",
         "mgmt_vlan_status": ".1.3.6.1.4.1.43356.2.1.2.9.7.7.0",
         "mgmt_vlan_passthrough": ".1.3.6.1.4.1.43356.2.1.2.9.7.9.0",
+        "mimosa_station_table": ".1.3.6.1.4.1.43356.2.1.2.9.4.1",
+    }
+
+    # Mimosa enterprise subtree walked by get_snapshot()
+    mimosa_OID = ".1.3.6.1.4.1.43356.2.1.2"
+
+    system_OIDs = {
+        # OIDs shared by every series
+        "sys_object_id": ".1.3.6.1.2.1.1.2.0",
+        "uptime": ".1.3.6.1.2.1.1.3.0",
+        "os_version": ".1.3.6.1.4.1.43356.2.1.2.1.3.0",
+        "serial_number": ".1.3.6.1.4.1.43356.2.1.2.1.2.0",
+        "hostname": ".1.3.6.1.4.1.43356.2.1.2.1.1.0",
+    }
+
+    interface_OIDs = {
+        # IF-MIB ifTable columns collected by get_interfaces
+        "ifDescr": "1.3.6.1.2.1.2.2.1.2",
+        "ifOperStatus": "1.3.6.1.2.1.2.2.1.8",
+        "ifAdminStatus": "1.3.6.1.2.1.2.2.1.7",
+        "ifSpeed": "1.3.6.1.2.1.2.2.1.5",
+        "ifMtu": "1.3.6.1.2.1.2.2.1.4",
+        "ifPhysAddress": "1.3.6.1.2.1.2.2.1.6",
+    }
+
+    interface_counter_OIDs = {
+        # IF-MIB ifXTable 64-bit counters collected by get_interfaces_counters
+        "rx_octets": "1.3.6.1.2.1.31.1.1.1.6",
+        "rx_unicast_packets": "1.3.6.1.2.1.31.1.1.1.7",
+        "rx_multicast_packets": "1.3.6.1.2.1.31.1.1.1.8",
+        "rx_broadcast_packets": "1.3.6.1.2.1.31.1.1.1.9",
+        "tx_octets": "1.3.6.1.2.1.31.1.1.1.10",
+        "tx_unicast_packets": "1.3.6.1.2.1.31.1.1.1.11",
+        "tx_multicast_packets": "1.3.6.1.2.1.31.1.1.1.12",
+        "tx_broadcast_packets": "1.3.6.1.2.1.31.1.1.1.13",
+        # ifTable only has 32-bit error and discard counters
+        "rx_discards": "1.3.6.1.2.1.2.2.1.13",
+        "rx_errors": "1.3.6.1.2.1.2.2.1.14",
+        "tx_discards": "1.3.6.1.2.1.2.2.1.19",
+        "tx_errors": "1.3.6.1.2.1.2.2.1.20",
+    }
+
+    interface_counter_v1_OIDs = {
+        # SNMPv1 cannot carry Counter64, so v1 agents are read from the
+        # 32-bit ifTable counters, which have no multicast/broadcast split
+        "rx_octets": "1.3.6.1.2.1.2.2.1.10",
+        "rx_unicast_packets": "1.3.6.1.2.1.2.2.1.11",
+        "tx_octets": "1.3.6.1.2.1.2.2.1.16",
+        "tx_unicast_packets": "1.3.6.1.2.1.2.2.1.17",
+        "rx_discards": "1.3.6.1.2.1.2.2.1.13",
+        "rx_errors": "1.3.6.1.2.1.2.2.1.14",
+        "tx_discards": "1.3.6.1.2.1.2.2.1.19",
+        "tx_errors": "1.3.6.1.2.1.2.2.1.20",
+    }
+
+    # Cache class of the OIDs (and walked subtrees) whose values rarely change;
+    # every other OID is "operational" and is not cached by default.
+    oid_cache_classes = {
+        **dict.fromkeys(
+            [
+                system_OIDs["sys_object_id"],
+                system_OIDs["os_version"],
+                system_OIDs["serial_number"],
+                b_c_series_OIDs["unlock_code"],
+                b_c_series_OIDs["regulatory_domain"],
+                interface_OIDs["ifDescr"],
+            ],
+            "static",
+        ),
+        **dict.fromkeys(
+            [
+                system_OIDs["hostname"],
+                b_c_series_OIDs["wan_ssid"],
+                b_c_series_OIDs["wireless_mode"],
+                b_c_series_OIDs["tdma_mode"],
+                b_c_series_OIDs["tdma_window"],
+                b_c_series_OIDs["traffic_split"],
+                b_c_series_OIDs["network_mode"],
+                b_c_series_OIDs["recovery_ssid"],
+                b_c_series_OIDs["local_ssid"],
+                b_c_series_OIDs["local_channel"],
+                b_c_series_OIDs["mimosa_local_ip"],
+                b_c_series_OIDs["mimosa_netmask"],
+                b_c_series_OIDs["primary_dns_server"],
+                b_c_series_OIDs["secondary_dns_server"],
+                b_c_series_OIDs["https_status"],
+                b_c_series_OIDs["mgmt_vlan_status"],
+                b_c_series_OIDs["mgmt_cloud_status"],
+                b_c_series_OIDs["syslog_status"],
+                a_series_OIDs["mimosa_local_ip"],
+                a_series_OIDs["mimosa_netmask"],
+                a_series_OIDs["mimosa_ssid_list"],
+                a_series_OIDs["mimosa_wireless_mode"],
+                a_series_OIDs["mimosa_auto_channel"],
+                a_series_OIDs["primary_dns_server"],
+                a_series_OIDs["secondary_dns_server"],
+                a_series_OIDs["mgmt_vlan_status"],
+                a_series_OIDs["mgmt_vlan_passthrough"],
+            ],
+            "config",
+        ),
+    }
+
+    # Seconds a cached value of each cache class stays valid
+    default_cache_ttl = {
+        "static": 3600,
+        "config": 300,
+        "operational": 0,
     }
 
     interface_name_mapping = {
@@ -115,6 +434,68 @@ class MimosaDriver(NetworkDriver):
 
     ptmp_on_off_mapping = {"1": "on", "0": "off"}
 
+    # Columns of the A series PtMP tables, by sub-id under the table entry:
+    # (field name, mapping of the value or None). Column 1 is the row index.
+    ptmp_ssid_columns = {
+        2: ("mimosaPtmpSsidName", None),
+        3: ("mimosaPtmpSsidType", ptmp_ssid_type_mapping),
+        4: ("mimosaPtmpSsidEnabled", ptmp_true_false_mapping),
+        5: ("mimosaPtmpSsidBroadcastEnabled", ptmp_true_false_mapping),
+        6: ("mimosaPtmpSsidIsolationEnabled", ptmp_true_false_mapping),
+    }
+
+    ptmp_channel_power_columns = {
+        2: ("mimosaPtmpChPwrRadioName", None),
+        3: ("mimosaPtmpChPwrCntrFreqCfg", None),
+        4: ("mimosaPtmpChPwrPrimChannelCfg", None),
+        5: ("mimosaPtmpChPwrChWidthCfg", None),
+        6: ("mimosaPtmpChPwrTxPowerCfg", None),
+        7: ("mimosaPtmpChPwrCntrFreqCur", None),
+        8: ("mimosaPtmpChPwrPrimChannelCur", None),
+        9: ("mimosaPtmpChPwrChWidthCur", None),
+        10: ("mimosaPtmpChPwrTxPowerCur", None),
+        11: ("mimosaPtmpChPwrAgcMode", ptmp_on_off_mapping),
+        12: ("mimosaPtmpChPwrMinRxPower", None),
+    }
+
+    # Columns of the tables read by get_wireless_performance(), by sub-id
+    # under the table entry: (field name, divisor or None for non-numbers).
+    # Power, noise, SNR and EVM are reported in tenths of dBm or dB, PHY
+    # rates in Mbps.
+    rf_chain_columns = {
+        2: ("tx_power", 10),
+        3: ("rx_power", 10),
+        4: ("noise", 10),
+        5: ("snr", 10),
+    }
+
+    rf_stream_columns = {
+        2: ("tx_phy_rate", 1),
+        3: ("tx_mcs", 1),
+        5: ("rx_phy_rate", 1),
+        6: ("rx_mcs", 1),
+        8: ("rx_evm", 10),
+    }
+
+    ptmp_radio_performance_columns = {
+        2: ("name", None),
+        7: ("center_frequency", 1),
+        9: ("channel_width", 1),
+        10: ("tx_power", 1),
+    }
+
+    ptmp_station_columns = {
+        2: ("mac_address", None),
+        3: ("rssi", 10),
+        4: ("snr", 10),
+        5: ("tx_mcs", 1),
+        6: ("rx_mcs", 1),
+        7: ("tx_phy_rate", 1),
+        8: ("rx_phy_rate", 1),
+        9: ("tx_bytes", 1),
+        10: ("rx_bytes", 1),
+    }
+
     def __init__(
         self,
         snmp_community,
@@ -127,11 +508,73 @@ class MimosaDriver(NetworkDriver):
     ) -> None:
         """
         :param snmp_community: SNMP community string
-        :param radio_type: Type of radio, either "a_series" or "b_c_series"
+        :param radio_type: Type of radio, either "a_series" or "b_c_series", or
+            "auto" to detect it from the radio's sysObjectID
         :param hostname: IP or FQDN of the device you want to connect to.
         :param username: No username required for SNMP
         :param password: No password required for SNMP
         :param optional_args: Pass additional arguments to underlying driver
+            - snmp_port: UDP port of the radio's SNMP agent (default 161)
+            - snmp_timeout: Seconds to wait for the answer to one attempt of
+              a request (default 1)
+            - snmp_retries: Attempts made after the first one timed out
+              (default 5)
+            - adaptive_timeout: True to derive the attempt timeout from the
+              radio's measured round-trip times, starting at snmp_timeout,
+              or an ``RttEstimator`` instance to use
+            - circuit_breaker: True to fail requests fast once the radio has
+              stopped answering, or a ``CircuitBreaker`` instance to use
+            - shared_engine: Reuse the process-wide SNMP engine returned by
+              ``get_shared_engine()`` instead of creating one per driver
+            - snmp_engine: An existing SNMP engine to use; it is left open on
+              close()
+            - max_oids_per_request: Maximum number of OIDs packed into one
+              GetRequest PDU (default 20)
+            - snmp_version: "v2c" (default), "v1" for agents without SNMPv2c
+              or "v3"
+            - snmp_user: SNMPv3 user name
+            - snmp_auth_key: SNMPv3 authentication pass phrase; None for
+              noAuthNoPriv
+            - snmp_priv_key: SNMPv3 privacy pass phrase; None for authNoPriv
+            - snmp_auth_protocol: One of ``auth_protocols`` (default "sha")
+            - snmp_priv_protocol: One of ``priv_protocols`` (default "aes")
+            - max_repetitions: Rows requested per GETBULK PDU when walking
+              tables over SNMPv2c (default 25, 0 disables GETBULK)
+            - cache: True to cache slow-changing values in a per-driver
+              ``SnmpCache``, or an ``SnmpCache`` instance to share
+            - cache_size: Maximum entries of the per-driver cache (default 10000)
+            - cache_ttl: Overrides of ``default_cache_ttl``, e.g.
+              {"config": 60}
+            - counter_rates: True to have get_interfaces_counters return
+              per-second rates since the previous call instead of counters;
+              rates of counters reset in between, e.g. by a reboot, are None
+            - delta: True to have the getters return only the fields that
+              changed since their previous call, in a per-driver
+              ``DeltaStore``, or a ``DeltaStore`` instance to share
+            - typed_values: True to have the getters return numbers as int and
+              binary strings as bytes instead of the text of every value
+            - snapshot: True to serve every Mimosa OID from one walk of the
+              enterprise subtree, taken by get_snapshot() or by the first
+              getter that needs it and kept until close()
+            - stats: True to collect request metrics in a per-driver
+              ``SnmpStats``, or a callable (e.g. a shared ``SnmpStats``) that
+              is called with a ``RequestEvent`` for every SNMP request
+            - wireless_stations: True to have get_wireless_performance()
+              include the per-station table of A series access points
+            - record: Path of a capture file to append the response to every
+              SNMP request to, or an ``SnmpRecorder`` to share
+            - replay: Path (or list of paths) of captures to answer the SNMP
+              requests from instead of the radio, or an ``SnmpReplay`` to
+              share
+            - replay_latency: Seconds each replayed request is delayed by
+              (default 0)
+            - errors: How getters report errors: "string" (default) returns
+              "Error getting ...: ..." strings, "raise" raises the
+              ``SnmpError`` subclasses of ``napalm_mimosa.errors``, and
+              "partial" returns a ``PartialResult`` of the fields read and
+              the errors of the others
+        :param timeout: Upper bound in seconds on the time spent on one SNMP
+            request, retries included
         :return:
         """
         self.hostname = hostname
@@ -140,395 +583,1376 @@ class MimosaDriver(NetworkDriver):
         self.timeout = timeout
         self.snmp_community = snmp_community
         self.radio_type = radio_type
-        self.OIDs = (
-            self.b_c_series_OIDs
-            if self.radio_type == "b_c_series"
-            else self.a_series_OIDs
+        self.optional_args = optional_args or {}
+        self.snmp_port = self.optional_args.get("snmp_port", 161)
+        # The process-wide state kept per radio (detected model, RTTs, SNMPv3
+        # engine, cached values, ...) is keyed by this, so radios NAT'd behind
+        # one address are told apart by their port
+        self.radio_address = (
+            hostname if self.snmp_port == 161 else f"{hostname}:{self.snmp_port}"
         )
+        self.shared_engine = self.optional_args.get("shared_engine", False)
+        self.max_oids_per_request = self.optional_args.get("max_oids_per_request", 20)
+        self._max_oids_per_request = self.max_oids_per_request
+        self.snmp_version = self.optional_args.get("snmp_version", "v2c")
+        self.snmp_user = self.optional_args.get("snmp_user")
+        self.snmp_auth_key = self.optional_args.get("snmp_auth_key")
+        self.snmp_priv_key = self.optional_args.get("snmp_priv_key")
+        self.snmp_auth_protocol = self.optional_args.get("snmp_auth_protocol", "sha")
+        self.snmp_priv_protocol = self.optional_args.get("snmp_priv_protocol", "aes")
+        self._usm_peer = None
+        self.max_repetitions = self.optional_args.get("max_repetitions", 25)
+        self.use_bulk = self.snmp_version != "v1" and self.max_repetitions > 0
+        self.cache = self.optional_args.get("cache")
+        if self.cache is True:
+            self.cache = SnmpCache(self.optional_args.get("cache_size", 10000))
+        elif self.cache is False:
+            self.cache = None
+        self.cache_ttl = {
+            **self.default_cache_ttl,
+            **self.optional_args.get("cache_ttl", {}),
+        }
+        self.snmp_timeout = self.optional_args.get("snmp_timeout", 1)
+        self.snmp_retries = self.optional_args.get("snmp_retries", 5)
+        self.rtt_estimator = self.optional_args.get("adaptive_timeout")
+        if self.rtt_estimator is True:
+            self.rtt_estimator = get_rtt_estimator(
+                self.radio_address, self.snmp_timeout
+            )
+        elif not self.rtt_estimator:
+            self.rtt_estimator = None
+        self.circuit_breaker = self.optional_args.get("circuit_breaker")
+        if self.circuit_breaker is True:
+            self.circuit_breaker = get_circuit_breaker(self.radio_address)
+        elif not self.circuit_breaker:
+            self.circuit_breaker = None
+        self._snmp_engine = None
+        self._snmp_auth = None
+        self._snmp_transport = None
+        self._snmp_context = None
+        self.use_snapshot = self.optional_args.get("snapshot", False)
+        self._snapshot = None
+        self.counter_rates = self.optional_args.get("counter_rates", False)
+        self.wireless_stations = self.optional_args.get("wireless_stations", False)
+        self.typed_values = self.optional_args.get("typed_values", False)
+        self._counter_sample = None
+        self.delta = self.optional_args.get("delta")
+        if self.delta is True:
+            self.delta = DeltaStore()
+        elif self.delta is False:
+            self.delta = None
+        self.stats = self.optional_args.get("stats")
+        if self.stats is True:
+            self.stats = SnmpStats()
+        elif not self.stats:
+            self.stats = None
+        self.recorder = self.optional_args.get("record")
+        if isinstance(self.recorder, (str, os.PathLike)):
+            self.recorder = SnmpRecorder(self.recorder)
+            self._owns_recorder = True
+        else:
+            self._owns_recorder = False
+        self.replay = self.optional_args.get("replay")
+        if self.replay is not None and not isinstance(self.replay, SnmpReplay):
+            self.replay = SnmpReplay(
+                self.replay, self.optional_args.get("replay_latency", 0.0)
+            )
+        self.errors = self.optional_args.get("errors", "string")
         self.validate_series()
+        self.validate_snmp_version()
+        self.validate_errors()
+        # Known once the radio's sysObjectID has been read, by this driver or
+        # by an earlier one for the same host
+        self.model = None
+        self.OIDs = None
+        model = detected_model(self.radio_address)
+        if model is not None:
+            self._use_model(model)
+        if self.radio_type != "auto":
+            self.OIDs = self._series_OIDs()
 
     def validate_series(self):
-        radio_type = ["a_series", "b_c_series"]
+        radio_type = ["a_series", "b_c_series", "auto"]
         if self.radio_type not in radio_type:
             raise ValueError(f"Invalid series. Series should be one of {radio_type}")
 
+    def validate_snmp_version(self):
+        snmp_versions = ["v1", "v2c", "v3"]
+        if self.snmp_version not in snmp_versions:
+            raise ValueError(
+                f"Invalid SNMP version. Version should be one of {snmp_versions}"
+            )
+        if self.snmp_version != "v3":
+            return
+        if not self.snmp_user:
+            raise ValueError("SNMPv3 requires an snmp_user")
+        if self.snmp_priv_key is not None and self.snmp_auth_key is None:
+            raise ValueError("SNMPv3 privacy requires an snmp_auth_key")
+        if self.snmp_auth_protocol not in auth_protocols:
+            raise ValueError(
+                f"Invalid SNMPv3 authentication protocol. Protocol should be one "
+                f"of {list(auth_protocols)}"
+            )
+        if self.snmp_priv_protocol not in priv_protocols:
+            raise ValueError(
+                f"Invalid SNMPv3 privacy protocol. Protocol should be one of "
+                f"{list(priv_protocols)}"
+            )
+
+    def validate_errors(self):
+        modes = ["string", "raise", "partial"]
+        if self.errors not in modes:
+            raise ValueError(f"Invalid errors. Errors should be one of {modes}")
+        if self.errors == "partial" and self.delta is not None:
+            raise ValueError("Partial results cannot be returned in delta mode")
+
     def open(self):
-        pass  # we don't need to open a connection for SNMP
+        self._open_session()
+        if self.model is None and self.radio_type == "auto":
+            self._run(self._series_plan())
+
+    def _open_session(self):
+        # SNMP is connectionless; build the engine, transport and auth context
+        # once here and reuse them for every request until close().
+        _import_snmp()
+        if self.replay is not None:
+            # Replayed requests need no engine
+            return
+        if self.optional_args.get("snmp_engine") is not None:
+            self._snmp_engine = self.optional_args["snmp_engine"]
+        elif self.shared_engine:
+            self._snmp_engine = get_shared_engine()
+        else:
+            self._snmp_engine = SnmpEngine()
+        self._snmp_auth = self._auth_data()
+        # Retries are made by _snmp_request() so each attempt can be timed
+        self._snmp_transport = UdpTransportTarget(
+            (self.hostname, self.snmp_port), timeout=self.snmp_timeout, retries=0
+        )
+        self._snmp_context = ContextData()
+        use_shared_mib_view(self._snmp_engine)
+        if self.snmp_version == "v3":
+            self._open_usm()
+        if self.stats is not None:
+            observe_engine(self._snmp_engine)
+
+    def _auth_data(self):
+        if self.snmp_version != "v3":
+            return CommunityData(
+                self.snmp_community, mpModel=0 if self.snmp_version == "v1" else 1
+            )
+        self._usm_peer = usm_peer(self.radio_address, self.snmp_user)
+        return user_data(
+            self.snmp_user,
+            self.snmp_auth_key,
+            self.snmp_priv_key,
+            self.snmp_auth_protocol,
+            self.snmp_priv_protocol,
+            self._usm_peer,
+        )
+
+    def _open_usm(self):
+        # A radio polled before is not discovered again by this engine
+        observe_usm(self._snmp_engine)
+        if self._usm_peer is not None:
+            prime_engine(self._snmp_engine, self._snmp_transport, self._usm_peer)
+
+    def _usm_answered(self, errorIndication):
+        """
+        After an SNMPv3 request was answered, remember what the engine knows
+        about the radio for the next drivers polling it, or, if the radio
+        rejected the request, have it discovered again.
+        """
+        if self.snmp_version != "v3":
+            return
+        engine, _, transport, _ = self._snmp_session()
+        if not errorIndication:
+            remember_usm_peer(self.radio_address, self.snmp_user, engine, transport)
+            return
+        forget_usm_peers(self.radio_address)
+        if self._usm_peer is not None:
+            unprime_engine(engine, transport)
+            self._snmp_auth = self._auth_data()
 
     def close(self):
-        pass  # likewise, no connection to close
+        engine = self._snmp_engine
+        if engine is not None and not self._shares_engine():
+            dispatcher = getattr(engine, "transportDispatcher", None)
+            if dispatcher is not None:
+                dispatcher.closeDispatcher()
+        self._snmp_engine = None
+        self._snmp_auth = None
+        self._snmp_transport = None
+        self._snmp_context = None
+        self._snapshot = None
+        if self._owns_recorder:
+            self.recorder.close()
+
+    def invalidate_cache(self, cache_class=None):
+        """
+        Forget the cached values of this radio, or only those of one cache
+        class ("static", "config" or "operational").
+        """
+        self._snapshot = None
+        if self.cache is not None:
+            self.cache.invalidate(self.radio_address, cache_class)
+
+    def _cache_ttl(self, oid):
+        return self.cache_ttl.get(self.oid_cache_classes.get(oid, "operational"), 0)
+
+    def _cache_get(self, oid):
+        if self.cache is None or self._cache_ttl(oid) <= 0:
+            return False, None
+        return self.cache.get((self.radio_address, oid))
+
+    def _cache_set(self, oid, value):
+        ttl = self._cache_ttl(oid)
+        if self.cache is not None and ttl > 0:
+            cache_class = self.oid_cache_classes.get(oid, "operational")
+            self.cache.set((self.radio_address, oid), value, ttl, cache_class)
+
+    def _shares_engine(self):
+        return self.shared_engine or self.optional_args.get("snmp_engine") is not None
+
+    def _snmp_session(self):
+        # Getters may be used without an explicit open(), so open lazily.
+        if self._snmp_engine is None:
+            self._open_session()
+        return (
+            self._snmp_engine,
+            self._snmp_auth,
+            self._snmp_transport,
+            self._snmp_context,
+        )
+
+    def _request_attempts(self):
+        """
+        Return the (attempt, timeout) pairs of one request, failing fast if
+        the radio's circuit is open.
+        """
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+            raise CircuitOpenError(
+                f"SNMP Error: {self.radio_address} is not responding, request not sent"
+            )
+        return attempt_timeouts(
+            self.snmp_retries,
+            self.snmp_timeout,
+            time.monotonic() + self.timeout,
+            self.rtt_estimator,
+        )
+
+    def _request_answered(self, attempt, rtt):
+        if self.rtt_estimator is not None and attempt == 0:
+            # Karn's algorithm: the answer to a retried request may belong to
+            # any of its attempts, so only first attempts are sampled.
+            self.rtt_estimator.update(rtt)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_success()
+
+    def _request_timed_out(self):
+        if self.rtt_estimator is not None:
+            self.rtt_estimator.backoff()
+
+    def _request_failed(self):
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_failure()
+
+    @contextmanager
+    def _traced_request(self, kind, var_binds, oids):
+        """
+        Report the request made in the body to ``stats`` as a ``RequestEvent``.
+        """
+        if self.stats is None:
+            yield RequestTrace()
+            return
+
+        started = time.monotonic()
+        with traced_request() as trace:
+            try:
+                yield trace
+            except Exception as e:
+                trace.error = str(e)
+                raise
+            finally:
+                if kind == "bulk":
+                    # Skip non-repeaters and max-repetitions
+                    var_binds = var_binds[2:]
+                if oids is None:
+                    oids = [str(var_bind[0]) for var_bind in var_binds]
+                self.stats(
+                    RequestEvent(
+                        self.radio_address,
+                        current_getter(),
+                        kind,
+                        tuple(oids),
+                        len(var_binds),
+                        trace.varbinds_received,
+                        trace.bytes_sent,
+                        trace.bytes_received,
+                        trace.attempts,
+                        trace.timeouts,
+                        time.monotonic() - started,
+                        trace.error,
+                    )
+                )
+
+    def _run_getter(self, plan):
+        with self._partial_errors() as errors:
+            try:
+                result = self._run(plan)
+            except SnmpError as e:
+                if errors is None:
+                    raise
+                # Nothing the getter returns could be read
+                result, errors[getter_name(plan)] = None, e
+        return self._getter_result(plan, result, errors)
+
+    @contextmanager
+    def _partial_errors(self):
+        """
+        In partial mode, collect the errors of the fields read in the body
+        into the dict it yields; otherwise yield None.
+        """
+        if self.errors != "partial":
+            yield None
+            return
+        errors = {}
+        token = _field_errors.set(errors)
+        try:
+            yield errors
+        finally:
+            _field_errors.reset(token)
+
+    def _getter_result(self, plan, result, errors):
+        if errors is None:
+            return self._changes(plan, result)
+        return PartialResult(_without_failed(result), errors)
+
+    def _getter_error(self, error, message):
+        """
+        Return the error of a getter as a string, or raise it unless errors
+        are reported as strings.
+        """
+        if self.errors != "string":
+            raise error
+        return f"{message}: {error}"
+
+    def _changes(self, plan, result):
+        """
+        In delta mode, reduce the result of a getter to the fields that
+        changed since its previous call.
+        """
+        if self.delta is None or not isinstance(result, dict):
+            return result
+        return self.delta.update(self.radio_address, getter_name(plan), result)
+
+    def _run(self, plan):
+        """
+        Drive a request plan to completion with blocking SNMP requests.
+
+        Plans are generators that yield either a single request, a tuple of
+        (kind, args, options) handed to ``_snmp_request()``, or a list of
+        independent sub-plans, and are sent back the matching result. Errors
+        are thrown back into the plan. ``AsyncMimosaDriver`` runs the same
+        plans with the independent sub-plans in flight concurrently.
+        """
+        _import_snmp()
+        with getter_label(plan):
+            result, error = None, None
+            while True:
+                try:
+                    if error is not None:
+                        request = plan.throw(error)
+                    else:
+                        request = plan.send(result)
+                except StopIteration as stop:
+                    return stop.value
+
+                result, error = None, None
+                try:
+                    if isinstance(request, list):
+                        result = [self._run(sub_plan) for sub_plan in request]
+                    else:
+                        kind, args, options = request
+                        result = self._snmp_request(kind, *args, **options)
+                except Exception as e:
+                    error = e
+
+    def _snmp_request(self, kind, *var_binds, oids=None, **options):
+        """
+        Send a single request PDU through the driver's SNMP session.
+
+        ``kind`` selects the pysnmp hlapi command: "get", "next" or "bulk".
+        GETNEXT and GETBULK are limited to one PDU with ``maxCalls=1`` so
+        walks control their own paging. Unanswered attempts are retried up to
+        ``snmp_retries`` times within ``timeout`` seconds.
+
+        ``oids`` names the request in ``stats`` events and defaults to the
+        names of the var-binds.
+
+        With ``replay``, the response recorded for the request is returned
+        instead, and with ``record`` every response is saved.
+
+        :return: tuple of (errorStatus, rows), each row being a list of var-binds
+        """
+        if self.replay is not None:
+            if self.replay.latency:
+                time.sleep(self.replay.latency)
+            return self._replayed_request(kind, var_binds, oids)
+        if self.recorder is None:
+            return self._send_request(kind, var_binds, oids, options)
+        try:
+            response = self._send_request(kind, var_binds, oids, options)
+        except SnmpError as e:
+            self.recorder.record_error(self.radio_address, kind, var_binds, e)
+            raise
+        self.recorder.record(self.radio_address, kind, var_binds, *response)
+        return response
+
+    def _replayed_request(self, kind, var_binds, oids):
+        with self._traced_request(kind, var_binds, oids) as trace:
+            trace.attempts += 1
+            errorStatus, rows = self.replay.response(
+                self.radio_address, kind, var_binds
+            )
+            trace.varbinds_received = sum(len(row) for row in rows)
+            return errorStatus, rows
+
+    def _send_request(self, kind, var_binds, oids, options):
+        command = {"get": getCmd, "next": nextCmd, "bulk": bulkCmd}[kind]
+        if kind != "get":
+            options["maxCalls"] = 1
+
+        with self._traced_request(kind, var_binds, oids) as trace:
+            var_binds = resolved_var_binds(var_binds)
+            for attempt, timeout in self._request_attempts():
+                session = self._snmp_session()
+                session[2].timeout = timeout
+                sent = time.monotonic()
+                trace.attempts += 1
+                try:
+                    errorIndication, errorStatus, rows = self._snmp_send(
+                        command, session, var_binds, options
+                    )
+                except Exception:
+                    self._request_failed()
+                    raise
+
+                if isinstance(errorIndication, RequestTimedOut):
+                    trace.timeouts += 1
+                    self._request_timed_out()
+                    continue
+                self._request_answered(attempt, time.monotonic() - sent)
+                self._usm_answered(errorIndication)
+
+                if errorIndication:
+                    raise indication_error(errorIndication, oids or ())
+                trace.varbinds_received = sum(len(row) for row in rows)
+                if errorStatus:
+                    trace.error = errorStatus.prettyPrint()
+                return errorStatus, rows
+
+            self._request_failed()
+            raise indication_error(requestTimedOut, oids or ())
+
+    @staticmethod
+    def _snmp_send(command, session, var_binds, options):
+        rows = []
+        for errorIndication, errorStatus, errorIndex, varBinds in command(
+            *session, *var_binds, **options
+        ):
+            if errorIndication or errorStatus:
+                return errorIndication, errorStatus, rows
+
+            rows.append(varBinds)
+
+        return None, 0, rows
 
     def _snmp_get(self, mib, oid=None):
         if mib.startswith("."):
             # OID provided, not MIB
-            object_id = ObjectType(ObjectIdentity(mib))
-        else:
-            # MIB and OID provided
-            object_id = ObjectType(ObjectIdentity(mib, oid, 0))
-
-        errorIndication, errorStatus, errorIndex, varBinds = next(
-            getCmd(
-                SnmpEngine(),
-                CommunityData(self.snmp_community),
-                UdpTransportTarget((self.hostname, 161)),
-                ContextData(),
-                object_id,
+            return self._snmp_get_many([mib])[mib]
+
+        # MIB and OID provided
+        _import_snmp()
+        object_id = ObjectType(ObjectIdentity(mib, oid, 0))
+
+        errorStatus, rows = self._snmp_request(
+            "get", object_id, oids=[f"{mib}::{oid}.0"]
+        )
+
+        if errorStatus:
+            raise status_error(errorStatus, [f"{mib}::{oid}.0"])
+
+        return self._decode_value(rows[0][0][1])
+
+    def _snmp_get_many(self, oids):
+        """
+        Fetch several scalar OIDs, packing as many of them as possible into
+        each GetRequest PDU.
+
+        Requests are split into chunks of ``max_oids_per_request`` OIDs. When
+        the agent answers a chunk with ``tooBig`` the chunk is halved and
+        retried, and the smaller size is kept for the rest of the session.
+
+        :param oids: Iterable of dotted OIDs, e.g. ".1.3.6.1.2.1.1.3.0"
+        :return: dict mapping every requested OID to its decoded value
+        """
+        return self._run(self._get_many_plan(oids))
+
+    def _get_many_plan(self, oids, errors=None):
+        # With an ``errors`` dict, OIDs that fail are left out of the result
+        # and their SnmpError is added to it instead of being raised
+        oids = list(dict.fromkeys(oids))
+        results = {}
+        missing = []
+        snapshot = None
+        if self.use_snapshot and any(map(self._in_snapshot, oids)):
+            snapshot = yield from self._snapshot_plan()
+
+        for oid in oids:
+            if snapshot is not None and self._in_snapshot(oid):
+                _, results[oid] = snapshot.get(oid, (None, NoSuchObject()))
+                continue
+            found, value = self._cache_get(oid)
+            if found:
+                results[oid] = value
+            else:
+                missing.append(oid)
+
+        # Only OIDs that are not cached go on the wire
+        size = self._max_oids_per_request
+        chunks = [missing[i : i + size] for i in range(0, len(missing), size)]
+        fetched = []
+        if len(chunks) == 1:
+            fetched.append((yield from self._get_chunk_plan(chunks[0], errors)))
+        elif chunks:
+            fetched = yield [self._get_chunk_plan(chunk, errors) for chunk in chunks]
+
+        for values in fetched:
+            for oid, value in values.items():
+                self._cache_set(oid, value)
+            results.update(values)
+
+        if errors is None:
+            return {oid: self._decode_value(results[oid]) for oid in oids}
+
+        values = {}
+        for oid in oids:
+            if oid in errors:
+                continue
+            value = results[oid]
+            if isinstance(value, (NoSuchObject, NoSuchInstance)):
+                errors[oid] = NoSuchObjectError(
+                    f"SNMP Error: {value.prettyPrint()}", [oid]
+                )
+                continue
+            try:
+                values[oid] = self._decode_value(value)
+            except SnmpDecodeError as e:
+                e.oids = (oid,)
+                errors[oid] = e
+        return values
+
+    def _get_chunk_plan(self, oids, errors=None):
+        try:
+            errorStatus, rows = yield (
+                "get",
+                [(ObjectName(oid.lstrip(".")), Null("")) for oid in oids],
+                {"lookupMib": False, "oids": oids},
             )
+        except SnmpError as e:
+            if errors is None:
+                raise
+            errors.update(dict.fromkeys(oids, e))
+            return {}
+
+        if errorStatus:
+            if errorStatus == 1 and len(oids) > 1:  # tooBig
+                half = len(oids) // 2
+                self._max_oids_per_request = min(self._max_oids_per_request, half)
+                first, second = yield [
+                    self._get_chunk_plan(oids[:half], errors),
+                    self._get_chunk_plan(oids[half:], errors),
+                ]
+                return {**first, **second}
+            if errorStatus == 2 and self.snmp_version == "v1":  # noSuchName
+                # SNMPv1 fails the whole request for one missing object;
+                # read the others and report it as noSuchObject like SNMPv2c
+                if len(oids) == 1:
+                    return {oids[0]: NoSuchObject()}
+                half = len(oids) // 2
+                first, second = yield [
+                    self._get_chunk_plan(oids[:half], errors),
+                    self._get_chunk_plan(oids[half:], errors),
+                ]
+                return {**first, **second}
+            error = status_error(errorStatus, oids)
+            if errors is None:
+                raise error
+            if len(oids) > 1:
+                # Narrow the error down to the OIDs at fault, so the others
+                # are still read
+                half = len(oids) // 2
+                first, second = yield [
+                    self._get_chunk_plan(oids[:half], errors),
+                    self._get_chunk_plan(oids[half:], errors),
+                ]
+                return {**first, **second}
+            errors[oids[0]] = error
+            return {}
+
+        return {oid: varBind[1] for oid, varBind in zip(oids, rows[0])}
+
+    def _get_fields_plan(self, names, oids=None):
+        """
+        Fetch the named scalars of ``oids`` (the series OIDs by default) with
+        batched GetRequests and return them keyed by name.
+        """
+        if oids is None:
+            yield from self._series_plan()
+            oids = self.OIDs
+        # Fields the model lacks are reported as noSuchObject without asking
+        unsupported = self.model.unsupported if self.model is not None else ()
+        errors = _field_errors.get()
+        oid_errors = None if errors is None else {}
+        values = yield from self._get_many_plan(
+            [oids[name] for name in names if name not in unsupported], oid_errors
         )
+        if errors is None:
+            return {
+                name: self._decode_value(NoSuchObject())
+                if name in unsupported
+                else values[oids[name]]
+                for name in names
+            }
 
-        if errorIndication:
-            raise Exception(f"SNMP Error: {errorIndication}")
-        elif errorStatus:
-            raise Exception(f"SNMP Error: {errorStatus.prettyPrint()}")
+        # Partial mode: failed fields are reported in ``errors`` instead
+        fields = {}
+        for name in names:
+            if name in unsupported:
+                errors[name] = NoSuchObjectError(
+                    f"SNMP Error: {self.model.name} does not implement {name}"
+                )
+                fields[name] = _FAILED
+            elif oids[name] in oid_errors:
+                errors[name] = oid_errors[oids[name]]
+                fields[name] = _FAILED
+            else:
+                fields[name] = values[oids[name]]
+        return fields
+
+    def _field_plan(self, name, plan):
+        """
+        Run ``plan``, which reads the field or table ``name``; in partial
+        mode, an SNMP error of the plan fails only that field.
+        """
+        errors = _field_errors.get()
+        try:
+            return (yield from plan)
+        except SnmpError as e:
+            if errors is None:
+                raise
+            errors[name] = e
+            return _FAILED
+
+    def _get_table_plan(self, name, columns):
+        # Tables the model lacks are reported empty without walking them
+        if not self._supports(name):
+            return {}
+        return (
+            yield from self._field_plan(
+                name, self._walk_columns_plan(self.OIDs[name], columns)
+            )
+        )
 
-        result = varBinds[0][1]
-        result = result.prettyPrint()
+    def _series_OIDs(self):
+        if self.radio_type == "b_c_series":
+            return self.b_c_series_OIDs
+        return self.a_series_OIDs
 
-        if result.startswith("0x"):  # Check if result is a hexadecimal string
-            hex_string = result[2:]  # Remove '0x' at the start
-            bytes_object = bytes.fromhex(hex_string)
-            ascii_string = bytes_object.decode("ASCII")
-            return ascii_string.strip()
+    def _use_model(self, model):
+        self.model = model
+        remember_model(self.radio_address, model)
+        if self.radio_type == "auto":
+            self.radio_type = model.series
+            self.OIDs = self._series_OIDs()
 
-        return result
+    def _supports(self, name):
+        return self.model is None or name not in self.model.unsupported
 
-    def _snmp_get_multiple(self, oid):
-        object_id = ObjectType(ObjectIdentity(oid))
+    def _series_plan(self):
+        """
+        Detect the model, and with it the series, of a radio_type="auto"
+        driver from sysObjectID.
+        """
+        if self.model is None and self.radio_type == "auto":
+            values = yield from self._get_fields_plan(
+                ["sys_object_id"], oids=self.system_OIDs
+            )
+            if values["sys_object_id"] is _FAILED:
+                # Every other field depends on the series
+                raise _field_errors.get().pop("sys_object_id")
+            model = find_model(values["sys_object_id"])
+            if model is None:
+                raise ValueError(
+                    f"Unknown Mimosa model with sysObjectID {values['sys_object_id']}"
+                )
+            self._use_model(model)
+        return self.model
 
-        result = []
+    def _decode_value(self, value):
+        """
+        Decode a scalar for the getters' output.
+        """
+        result = typed_value(value)
+        if isinstance(result, bytes):
+            # Mimosa pads some text scalars with control characters
+            try:
+                return result.decode("ASCII").strip()
+            except UnicodeDecodeError as e:
+                if self.typed_values:
+                    return result
+                raise SnmpDecodeError(str(e)) from e
+        return result if self.typed_values else as_string(result)
+
+    def _decode_column(self, value):
+        """
+        Decode a walked value for the getters' output; binary strings are
+        kept as bytes, or shown in hex like prettyPrint() does.
+        """
+        result = typed_value(value)
+        return result if self.typed_values else as_string(result)
 
-        for errorIndication, errorStatus, errorIndex, varBinds in nextCmd(
-            SnmpEngine(),
-            CommunityData(self.snmp_community),
-            UdpTransportTarget((self.hostname, 161)),
-            ContextData(),
-            object_id,
-            lexicographicMode=False,
-        ):
-            if errorIndication:
-                raise Exception(f"SNMP Error: {errorIndication}")
-            elif errorStatus:
-                raise Exception(f"SNMP Error: {errorStatus.prettyPrint()}")
+    @staticmethod
+    def _mapped(mapping, value, default="unknown"):
+        # Mappings are keyed by the text of the value, in both output modes
+        if value is _FAILED:
+            return value
+        return mapping.get(as_string(value), default)
 
-            result.extend([varBind[-1].prettyPrint() for varBind in varBinds])
+    def _snmp_walk(self, *oids):
+        """
+        Walk one or more subtrees side by side.
 
-        return result
+        Every request carries one var-bind per subtree that has not been
+        exhausted yet. On SNMPv2c agents the walk uses GETBULK with
+        ``max_repetitions`` rows per PDU; SNMPv1 agents (or
+        ``max_repetitions=0``) fall back to one GETNEXT per row.
 
-    def _snmp_get_multiple_with_index(self, oid):
-        object_id = ObjectType(ObjectIdentity(oid))
+        :param oids: Dotted OIDs of the subtrees to walk
+        :return: list of (position in ``oids``, ObjectName, value)
+        """
+        return self._run(self._walk_plan(*oids))
+
+    def _walk_plan(self, *oids):
+        roots = [ObjectName(oid.lstrip(".")) for oid in oids]
+        if self.use_snapshot and all(map(self._in_snapshot, oids)):
+            snapshot = yield from self._snapshot_plan()
+            return [
+                (column, name, value)
+                for column, root in enumerate(roots)
+                for name, value in snapshot.values()
+                if root.isPrefixOf(name)
+            ]
+
+        # A single-subtree walk of a cached class is cached as a whole
+        cache_key = oids[0] if len(oids) == 1 else None
+        if cache_key is not None:
+            found, results = self._cache_get(cache_key)
+            if found:
+                return results
+
+        names = list(roots)
+        active = list(range(len(roots)))
+        results = []
+
+        while active:
+            var_binds = [(names[column], Null("")) for column in active]
+            options = {"lookupMib": False, "oids": [oids[column] for column in active]}
+            if self.use_bulk:
+                request = ("bulk", (0, self.max_repetitions, *var_binds), options)
+            else:
+                request = ("next", var_binds, options)
+            errorStatus, rows = yield request
+
+            if errorStatus:
+                raise status_error(errorStatus, options["oids"])
+
+            finished = set()
+            for row in rows:
+                for column, (name, value) in zip(active, row):
+                    if column in finished:
+                        continue
+                    # endOfMibView/noSuchName, leaving the subtree or an agent
+                    # that does not move forward all end this column
+                    if (
+                        isinstance(value, Null)
+                        or not roots[column].isPrefixOf(name)
+                        or name <= names[column]
+                    ):
+                        finished.add(column)
+                        continue
+                    names[column] = name
+                    results.append((column, name, value))
 
-        result = []
+            if not rows:
+                break
+            active = [column for column in active if column not in finished]
 
-        for errorIndication, errorStatus, errorIndex, varBinds in nextCmd(
-            SnmpEngine(),
-            CommunityData(self.snmp_community),
-            UdpTransportTarget((self.hostname, 161)),
-            ContextData(),
-            object_id,
-            lexicographicMode=False,
-        ):
-            if errorIndication:
-                raise Exception(f"SNMP Error: {errorIndication}")
-            elif errorStatus:
-                raise Exception(f"SNMP Error: {errorStatus.prettyPrint()}")
+        if cache_key is not None:
+            self._cache_set(cache_key, results)
+        return results
 
-            result.extend(
-                [
-                    (str(varBind[0]).split(".")[-1], varBind[-1].prettyPrint())
-                    for varBind in varBinds
-                ]
+    def _walk_table_plan(self, columns, raw=False):
+        """
+        Walk the columns of a conceptual table together, the way ``snmptable``
+        does, so each PDU returns a cell of every column for the next rows.
+
+        :param columns: dict mapping column names to column OIDs
+        :return: dict mapping each row index to a dict of column name -> value
+        """
+        names = list(columns)
+        oids = [columns[name] for name in names]
+        prefix_lengths = [len(ObjectName(oid.lstrip("."))) for oid in oids]
+
+        results = yield from self._walk_plan(*oids)
+
+        rows = {}
+        for column, name, value in results:
+            index = ".".join(str(sub_id) for sub_id in name[prefix_lengths[column] :])
+            rows.setdefault(index, {})[names[column]] = (
+                value if raw else self._decode_column(value)
             )
 
+        return rows
+
+    def _walk_columns_plan(self, oid, columns):
+        """
+        Walk the table ``oid`` and decode it in one pass into rows keyed by
+        index, using ``columns`` to name and map the value of every column.
+
+        :param columns: dict mapping the sub-id of a column under the table
+            entry to a tuple of (field name, value mapping or None); other
+            columns are skipped
+        """
+        # name = table . entry . column . index
+        column_position = len(ObjectName(oid.lstrip("."))) + 1
+
+        results = yield from self._walk_plan(oid)
+
+        rows = {}
+        for _, name, value in results:
+            column = columns.get(name[column_position])
+            if column is None:
+                continue
+            field, mapping = column
+            value = typed_value(value)
+            if mapping is not None:
+                value = mapping.get(as_string(value), value)
+            if not self.typed_values:
+                value = as_string(value)
+            index = ".".join(str(sub_id) for sub_id in name[column_position + 1 :])
+            row = rows.get(index)
+            if row is None:
+                row = rows[index] = {}
+            row[field] = value
+
+        return rows
+
+    def _walk_metrics_plan(self, tables):
+        """
+        Walk the columns of several tables side by side, so a single walk
+        reads all of them, and decode them into rows of numbers.
+
+        In partial mode, a failed walk fails every table of it.
+
+        :param tables: dict mapping result keys to tuples of (table name in
+            ``OIDs``, columns by sub-id as in ``rf_chain_columns``); tables
+            the model lacks are returned empty without walking them
+        :return: dict mapping the keys of ``tables`` to rows keyed by index
+        """
+        columns = [
+            (key, f"{self.OIDs[name]}.1.{sub_id}", field, divisor)
+            for key, (name, table_columns) in tables.items()
+            if self._supports(name)
+            for sub_id, (field, divisor) in table_columns.items()
+        ]
+        result = {key: {} for key in tables}
+        if not columns:
+            return result
+
+        errors = _field_errors.get()
+        try:
+            walked = yield from self._walk_plan(*[column[1] for column in columns])
+        except SnmpError as e:
+            if errors is None:
+                raise
+            for key, (name, _) in tables.items():
+                errors[name] = e
+                result[key] = _FAILED
+            return result
+
+        prefix_lengths = [len(ObjectName(column[1].lstrip("."))) for column in columns]
+        for position, name, value in walked:
+            key, _, field, divisor = columns[position]
+            index = ".".join(str(sub_id) for sub_id in name[prefix_lengths[position] :])
+            value = typed_value(value)
+            if divisor is not None and isinstance(value, int) and divisor != 1:
+                value = value / divisor
+            result[key].setdefault(index, {})[field] = value
         return result
 
+    def _interface_descriptions_plan(self):
+        # The ifDescr walk is cached like any static walk, so get_facts,
+        # get_interfaces_list and get_interfaces share it within its TTL
+        descriptions = yield from self._walk_with_index_plan(
+            self.interface_OIDs["ifDescr"]
+        )
+        return dict(descriptions)
+
+    def _cache_interface_descriptions(self, interfaces):
+        """
+        Cache the ifDescr column of an interface table walk as if ifDescr
+        had been walked on its own.
+
+        :param interfaces: raw rows of ``_walk_table_plan()``
+        """
+        oid = self.interface_OIDs["ifDescr"]
+        root = ObjectName(oid.lstrip("."))
+        self._cache_set(
+            oid,
+            [
+                (0, root + (int(interface_index),), interface["ifDescr"])
+                for interface_index, interface in interfaces.items()
+                if "ifDescr" in interface
+            ],
+        )
+
+    def _in_snapshot(self, oid):
+        return ("." + oid.lstrip(".")).startswith(self.mimosa_OID + ".")
+
+    def _snapshot_plan(self):
+        # The subtree is walked once per session in snapshot mode
+        if self._snapshot is None:
+            results = yield from self._walk_plan(self.mimosa_OID)
+            self._snapshot = {f".{name}": (name, value) for _, name, value in results}
+        return self._snapshot
+
+    def _snmp_get_multiple(self, oid):
+        return [self._decode_column(value) for _, _, value in self._snmp_walk(oid)]
+
+    def _snmp_get_multiple_with_index(self, oid):
+        return self._run(self._walk_with_index_plan(oid))
+
+    def _walk_with_index_plan(self, oid):
+        results = yield from self._walk_plan(oid)
+        return [
+            (str(name[-1]), self._decode_column(value)) for _, name, value in results
+        ]
+
     def get_facts(self):
         try:
-            # map sysObjectID values to model names
-            model_map = {
-                "SNMPv2-SMI::enterprises.43356.1.1.1": "mimosaB5",
-                "SNMPv2-SMI::enterprises.43356.1.1.2": "mimosaB5Lite",
-                "SNMPv2-SMI::enterprises.43356.1.1.3": "mimosaA5",
-                "SNMPv2-SMI::enterprises.43356.1.1.4": "mimosaC5",
-            }
-
-            sysObjectID = self._snmp_get(".1.3.6.1.2.1.1.2.0")
-
-            facts = {
-                "uptime": self._snmp_get(".1.3.6.1.2.1.1.3.0"),
-                "vendor": "Mimosa",
-                "os_version": self._snmp_get(".1.3.6.1.4.1.43356.2.1.2.1.3.0"),
-                "serial_number": self._snmp_get(".1.3.6.1.4.1.43356.2.1.2.1.2.0"),
-                "model": model_map.get(
-                    sysObjectID, "Unknown"
-                ),  # map the sysObjectID to a model
-                "hostname": self._snmp_get(".1.3.6.1.4.1.43356.2.1.2.1.1.0"),
-                "fqdn": self._snmp_get(".1.3.6.1.4.1.43356.2.1.2.1.1.0"),
-                "interface_list": self.get_interfaces_list(),
-            }
-            return facts
+            return self._run_getter(self._get_facts_plan())
         except Exception as e:
-            return f"Error getting facts: {e}"
+            return self._getter_error(e, "Error getting facts")
+
+    def _get_facts_plan(self):
+        # The system scalars and the interface list do not depend on each other
+        system, interface_list = yield [
+            self._get_fields_plan(
+                ["sys_object_id", "uptime", "os_version", "serial_number", "hostname"],
+                oids=self.system_OIDs,
+            ),
+            self._field_plan("interface_list", self._get_interfaces_list_plan()),
+        ]
+        # map the sysObjectID to a model
+        model_name = system["sys_object_id"]
+        if model_name is not _FAILED:
+            model = find_model(model_name)
+            if model is not None:
+                self._use_model(model)
+            model_name = model.name if model is not None else "Unknown"
+
+        facts = {
+            "uptime": system["uptime"],
+            "vendor": "Mimosa",
+            "os_version": system["os_version"],
+            "serial_number": system["serial_number"],
+            "model": model_name,
+            "hostname": system["hostname"],
+            "fqdn": system["hostname"],
+            "interface_list": interface_list,
+        }
+        return facts
 
     def get_interfaces_list(self):
+        return self._run_getter(self._get_interfaces_list_plan())
+
+    def _get_interfaces_list_plan(self):
         try:
             interface_list = []
-            interfaces = self._snmp_get_multiple("1.3.6.1.2.1.2.2.1.2")
+            descriptions = yield from self._interface_descriptions_plan()
+            interfaces = descriptions.values()
             for intf in interfaces:
                 intf = self.interface_name_mapping.get(intf, intf)
                 interface_list.append(intf)
 
             return interface_list if interfaces is not None else []
         except Exception as e:
-            return f"Error getting interface list: {e}"
+            return self._getter_error(e, "Error getting interface list")
 
     def get_interfaces(self):
         try:
-            interfaces = {}
-
-            # OIDs for the different interface data we want to collect
-            oids = {
-                "ifDescr": "1.3.6.1.2.1.2.2.1.2",
-                "ifOperStatus": "1.3.6.1.2.1.2.2.1.8",
-                "ifAdminStatus": "1.3.6.1.2.1.2.2.1.7",
-                "ifSpeed": "1.3.6.1.2.1.2.2.1.5",
-                "ifMtu": "1.3.6.1.2.1.2.2.1.4",
-                "ifPhysAddress": "1.3.6.1.2.1.2.2.1.6",
+            return self._run_getter(self._get_interfaces_plan())
+        except Exception as e:
+            return self._getter_error(e, "Error getting interfaces")
+
+    def _get_interfaces_plan(self):
+        # Get every interface column in a single table walk
+        interfaces = yield from self._walk_table_plan(self.interface_OIDs, raw=True)
+        self._cache_interface_descriptions(interfaces)
+
+        # Post-process the interface data
+        processed_interfaces = {}
+        for interface_index, columns in interfaces.items():
+            if "ifDescr" not in columns:
+                continue
+            interface_name = as_string(typed_value(columns["ifDescr"]))
+            speed = typed_value(columns["ifSpeed"]) if "ifSpeed" in columns else 0
+            mtu = typed_value(columns["ifMtu"]) if "ifMtu" in columns else 0
+            # The MAC address is formatted straight from the raw octets
+            phys_address = (
+                columns["ifPhysAddress"].asOctets()
+                if "ifPhysAddress" in columns
+                else b""
+            )
+            interface = {
+                "is_up": typed_value(columns["ifOperStatus"]) == 1,
+                "is_enabled": typed_value(columns["ifAdminStatus"]) == 1,
+                "description": interface_name,
+                "last_flapped": -1.0,  # SNMP doesn't provide this data
+                "speed": float(speed) / 1000000.0,  # Convert speed from bps to Mbps
+                "mtu": int(mtu),
+                "mac_address": ":".join(f"{octet:02x}" for octet in phys_address),
             }
 
-            # Get interface data
-            for oid_name, oid in oids.items():
-                results = self._snmp_get_multiple_with_index(oid)
-                if results is None:
-                    return {}
-
-                for interface_index, interface_value in results:
-                    if interface_index not in interfaces:
-                        interfaces[interface_index] = {}
-                    interfaces[interface_index][oid_name] = interface_value
-
-            # Post-process the interface data
-            processed_interfaces = {}
-            for interface_index, interface in interfaces.items():
-                interface["is_up"] = interface.pop("ifOperStatus") == "1"
-                interface["is_enabled"] = interface.pop("ifAdminStatus") == "1"
-                interface["description"] = interface.pop("ifDescr")
-                interface["last_flapped"] = -1.0  # SNMP doesn't provide this data
-                interface["speed"] = (
-                    float(interface.pop("ifSpeed", 0)) / 1000000.0
-                )  # Convert speed from bps to Mbps
-                interface["mtu"] = int(interface.pop("ifMtu", 0))
-
-                if "ifPhysAddress" in interface:
-                    phys_addr = interface.pop("ifPhysAddress")
-                    # Ensure the MAC address has correct length and format
-                    if phys_addr.startswith("0x"):
-                        # Convert hexadecimal string to proper MAC format
-                        formatted_mac = ":".join(
-                            [phys_addr[i : i + 2] for i in range(2, len(phys_addr), 2)]
-                        )
-                        interface["mac_address"] = formatted_mac
-                    else:
-                        interface["mac_address"] = ""
-                else:
-                    interface["mac_address"] = ""
-
-                interface_name = interface["description"]
-                interface_name = self.interface_name_mapping.get(
-                    interface_name, interface_name
-                )
+            interface_name = self.interface_name_mapping.get(
+                interface_name, interface_name
+            )
 
-                processed_interfaces[interface_name] = interface
+            processed_interfaces[interface_name] = interface
 
-            return processed_interfaces
-        except Exception as e:
-            return f"Error getting interfaces: {e}"
+        return processed_interfaces
 
-    def get_interfaces_ip(self):
+    def get_interfaces_counters(self):
         try:
-            interfaces_ip = {}
-
-            # Retrieve the IP address and netmask from the device
-            ip_address = self._snmp_get(self.OIDs["mimosa_local_ip"])
-            netmask = self._snmp_get(self.OIDs["mimosa_netmask"])
-
-            # Convert the netmask to a prefix length
-            network = ip_network(f"{ip_address}/{netmask}", strict=False)
-            prefix_length = network.prefixlen
-
-            # Structure the returned data to match the example
-            interfaces_ip["br_local"] = {}
-            interfaces_ip["br_local"]["ipv4"] = {}
-            interfaces_ip["br_local"]["ipv4"][ip_address] = {
-                "prefix_length": prefix_length
-            }
-
-            return interfaces_ip
+            return self._run_getter(self._get_interfaces_counters_plan())
         except Exception as e:
-            return f"Error getting interfaces ip: {e}"
+            return self._getter_error(e, "Error getting interfaces counters")
 
-    def get_wireless_settings(self):
-        try:
-            if self.radio_type == "b_c_series":
-                ptp_wireless_settings = {
-                    "unlock_code": self._snmp_get(self.OIDs["unlock_code"]),
-                    "regulatory_domain": self._snmp_get(self.OIDs["regulatory_domain"]),
-                    "wan_ssid": self._snmp_get(self.OIDs["wan_ssid"]),
-                    "wan_status": self.wan_status_mapping.get(
-                        self._snmp_get(self.OIDs["wan_status"]), "unknown"
-                    ),
-                    "wireless_mode": self.wireless_mode_mapping.get(
-                        self._snmp_get(self.OIDs["wireless_mode"]), "unknown"
-                    ),
-                    "tdma_mode": self.tdma_mode_mapping.get(
-                        self._snmp_get(self.OIDs["tdma_mode"]), "unknown"
-                    ),
-                    "tdma_window": self._snmp_get(self.OIDs["tdma_window"]),
-                    "traffic_split": self.traffic_split_mapping.get(
-                        self._snmp_get(self.OIDs["traffic_split"]), "unknown"
-                    ),
-                    "network_mode": self.network_mode_mapping.get(
-                        self._snmp_get(self.OIDs["network_mode"]), "unknown"
-                    ),
-                    "recovery_ssid": self._snmp_get(self.OIDs["recovery_ssid"]),
-                    "local_ssid": self._snmp_get(self.OIDs["local_ssid"]),
-                    "local_channel": self._snmp_get(self.OIDs["local_channel"]),
+    def _get_interfaces_counters_plan(self):
+        counter_OIDs = (
+            self.interface_counter_v1_OIDs
+            if self.snmp_version == "v1"
+            else self.interface_counter_OIDs
+        )
+        # Get every counter column in a single table walk, along with ifDescr
+        # so that added and removed interfaces show up at once
+        columns = {**counter_OIDs, "ifDescr": self.interface_OIDs["ifDescr"]}
+        interfaces = yield from self._walk_table_plan(columns, raw=True)
+        sampled_at = time.monotonic()
+        self._cache_interface_descriptions(interfaces)
+
+        sample = {}
+        for interface in interfaces.values():
+            if "ifDescr" not in interface:
+                continue
+            description = as_string(typed_value(interface["ifDescr"]))
+            interface_name = self.interface_name_mapping.get(description, description)
+            sample[interface_name] = interface
+
+        if not self.counter_rates:
+            return {
+                interface_name: {
+                    field: int(counters[field]) if field in counters else -1
+                    for field in self.interface_counter_OIDs
                 }
-                return ptp_wireless_settings
+                for interface_name, counters in sample.items()
+            }
 
-            elif self.radio_type == "a_series":
-                ssid_list = self._snmp_get_multiple_with_index(
-                    oid=".1.3.6.1.4.1.43356.2.1.2.9.1.1"
+        previous, self._counter_sample = self._counter_sample, (sampled_at, sample)
+        if previous is None:
+            # Rates need two samples; the first call only records one
+            return {}
+
+        elapsed = sampled_at - previous[0]
+        rates = {}
+        for interface_name, counters in sample.items():
+            previous_counters = previous[1].get(interface_name, {})
+            rates[interface_name] = {
+                field: (
+                    self._counter_rate(
+                        previous_counters[field], counters[field], elapsed
+                    )
+                    if field in counters and field in previous_counters
+                    else -1.0
                 )
+                for field in self.interface_counter_OIDs
+            }
+        return rates
+
+    @classmethod
+    def _counter_rate(cls, old, new, elapsed):
+        # None when there is no rate to report: both samples were taken at
+        # once, or the counter was reset in between
+        delta = cls._counter_delta(old, new)
+        if delta is None or elapsed <= 0:
+            return None
+        return delta / elapsed
+
+    @staticmethod
+    def _counter_delta(old, new):
+        delta = int(new) - int(old)
+        if delta < 0:
+            # The counter wrapped around since the previous sample, unless
+            # that would take more than half its range: a radio that
+            # rebooted restarts its counters from zero
+            size = 2**64 if isinstance(new, Counter64) else 2**32
+            delta += size
+            if delta > size // 2:
+                return None
+        return delta
+
+    def get_snapshot(self):
+        """
+        Walk the whole Mimosa enterprise subtree with GETBULK and return every
+        value in it, keyed by OID. In snapshot mode the getters are then
+        served from this walk.
+        """
+        try:
+            return self._run_getter(self._get_snapshot_plan())
+        except Exception as e:
+            return self._getter_error(e, "Error getting snapshot")
 
-                processed_ssid_list = {}
+    def _get_snapshot_plan(self):
+        self._snapshot = None
+        snapshot = yield from self._snapshot_plan()
+        return {oid: self._decode_column(value) for oid, (_, value) in snapshot.items()}
 
-                property_names = [
-                    "mimosaPtmpSsidName",
-                    "mimosaPtmpSsidType",
-                    "mimosaPtmpSsidEnabled",
-                    "mimosaPtmpSsidBroadcastEnabled",
-                    "mimosaPtmpSsidIsolationEnabled",
-                ]
+    def get_interfaces_ip(self):
+        try:
+            return self._run_getter(self._get_interfaces_ip_plan())
+        except Exception as e:
+            return self._getter_error(e, "Error getting interfaces ip")
 
-                for index, value in ssid_list:
-                    if index not in processed_ssid_list:
-                        processed_ssid_list[index] = {}
-                        continue
+    def _get_interfaces_ip_plan(self):
+        interfaces_ip = {}
 
-                    if len(processed_ssid_list[index]) == 1:
-                        value = self.ptmp_ssid_type_mapping.get(value, value)
+        # Retrieve the IP address and netmask from the device
+        values = yield from self._get_fields_plan(["mimosa_local_ip", "mimosa_netmask"])
+        ip_address = values["mimosa_local_ip"]
+        netmask = values["mimosa_netmask"]
+        if ip_address is _FAILED or netmask is _FAILED:
+            return interfaces_ip
 
-                    else:
-                        value = self.ptmp_true_false_mapping.get(value, value)
+        # Convert the netmask to a prefix length
+        network = ip_network(f"{ip_address}/{netmask}", strict=False)
+        prefix_length = network.prefixlen
 
-                    property_name = property_names[len(processed_ssid_list[index])]
+        # Structure the returned data to match the example
+        interfaces_ip["br_local"] = {}
+        interfaces_ip["br_local"]["ipv4"] = {}
+        interfaces_ip["br_local"]["ipv4"][ip_address] = {"prefix_length": prefix_length}
 
-                    processed_ssid_list[index][property_name] = value
+        return interfaces_ip
 
-                channel_power_table = self._snmp_get_multiple_with_index(
-                    oid=".1.3.6.1.4.1.43356.2.1.2.9.3.3"
-                )
+    def get_wireless_settings(self):
+        try:
+            return self._run_getter(self._get_wireless_settings_plan())
+        except Exception as e:
+            return self._getter_error(e, "Error getting wireless settings")
 
-                processed_channel_power_table = {}
-
-                channel_power_property_names = [
-                    "mimosaPtmpChPwrRadioName",
-                    "mimosaPtmpChPwrCntrFreqCfg",
-                    "mimosaPtmpChPwrPrimChannelCfg",
-                    "mimosaPtmpChPwrChWidthCfg",
-                    "mimosaPtmpChPwrTxPowerCfg",
-                    "mimosaPtmpChPwrCntrFreqCur",
-                    "mimosaPtmpChPwrPrimChannelCur",
-                    "mimosaPtmpChPwrChWidthCur",
-                    "mimosaPtmpChPwrTxPowerCur",
-                    "mimosaPtmpChPwrAgcMode",
-                    "mimosaPtmpChPwrMinRxPower",
+    def _get_wireless_settings_plan(self):
+        yield from self._series_plan()
+        if self.radio_type == "b_c_series":
+            values = yield from self._get_fields_plan(
+                [
+                    "unlock_code",
+                    "regulatory_domain",
+                    "wan_ssid",
+                    "wan_status",
+                    "wireless_mode",
+                    "tdma_mode",
+                    "tdma_window",
+                    "traffic_split",
+                    "network_mode",
+                    "recovery_ssid",
+                    "local_ssid",
+                    "local_channel",
                 ]
-
-                for index, value in channel_power_table:
-                    if index not in processed_channel_power_table:
-                        processed_channel_power_table[index] = {}
-                        continue
-
-                    if len(processed_channel_power_table[index]) == 9:
-                        value = self.ptmp_on_off_mapping.get(value, value)
-
-                    property_name = channel_power_property_names[
-                        len(processed_channel_power_table[index])
+            )
+            ptp_wireless_settings = {
+                "unlock_code": values["unlock_code"],
+                "regulatory_domain": values["regulatory_domain"],
+                "wan_ssid": values["wan_ssid"],
+                "wan_status": self._mapped(
+                    self.wan_status_mapping, values["wan_status"]
+                ),
+                "wireless_mode": self._mapped(
+                    self.wireless_mode_mapping, values["wireless_mode"]
+                ),
+                "tdma_mode": self._mapped(self.tdma_mode_mapping, values["tdma_mode"]),
+                "tdma_window": values["tdma_window"],
+                "traffic_split": self._mapped(
+                    self.traffic_split_mapping, values["traffic_split"]
+                ),
+                "network_mode": self._mapped(
+                    self.network_mode_mapping, values["network_mode"]
+                ),
+                "recovery_ssid": values["recovery_ssid"],
+                "local_ssid": values["local_ssid"],
+                "local_channel": values["local_channel"],
+            }
+            return ptp_wireless_settings
+
+        elif self.radio_type == "a_series":
+            # The scalars and both PtMP tables are independent requests
+            values, ssid_list, channel_power_table = yield [
+                self._get_fields_plan(
+                    [
+                        "unlock_code",
+                        "regulatory_domain",
+                        "mimosa_wireless_mode",
+                        "mimosa_auto_channel",
                     ]
+                ),
+                self._get_table_plan("mimosa_ssid_list", self.ptmp_ssid_columns),
+                self._get_table_plan(
+                    "mimosa_channel_power_table", self.ptmp_channel_power_columns
+                ),
+            ]
+
+            ptmp_wireless_settings = {
+                "unlock_code": values["unlock_code"],
+                "regulatory_domain": values["regulatory_domain"],
+                "mimosa_wireless_mode": self._mapped(
+                    self.ptmp_wireless_mode_mapping, values["mimosa_wireless_mode"]
+                ),
+                "mimosa_auto_channel": self._mapped(
+                    self.ptmp_true_false_mapping, values["mimosa_auto_channel"]
+                ),
+                "ssid_table": ssid_list,
+                "channel_power_table": channel_power_table,
+            }
 
-                    processed_channel_power_table[index][property_name] = value
-
-                ptmp_wireless_settings = {
-                    "unlock_code": self._snmp_get(self.OIDs["unlock_code"]),
-                    "regulatory_domain": self._snmp_get(self.OIDs["regulatory_domain"]),
-                    "mimosa_wireless_mode": self.ptmp_wireless_mode_mapping.get(
-                        self._snmp_get(self.OIDs["mimosa_wireless_mode"]), "unknown"
-                    ),
-                    "mimosa_auto_channel": self.ptmp_true_false_mapping.get(
-                        self._snmp_get(self.OIDs["mimosa_auto_channel"]), "unknown"
-                    ),
-                    "ssid_table": processed_ssid_list,
-                    "channel_power_table": processed_channel_power_table,
-                }
+            return ptmp_wireless_settings
 
-                return ptmp_wireless_settings
+    def get_wireless_performance(self, stations=None):
+        """
+        Return the live RF metrics of the radio's wireless link(s).
+
+        B and C series radios report their signal per receive chain (TX and
+        RX power, noise and SNR, in dBm and dB) and their PHY rates and MCS
+        per spatial stream, along with the combined RSSI and total PHY rates
+        of the link. A series access points report the frequency, width and
+        TX power of each radio and, with ``stations`` (by default the
+        ``wireless_stations`` optional argument), the signal, MCS, PHY rates
+        and traffic of every associated station keyed by MAC address.
+
+        The tables are read in one walk, so a poll costs one or two
+        round trips unless the station table is large.
+        """
+        try:
+            return self._run_getter(self._get_wireless_performance_plan(stations))
         except Exception as e:
-            return f"Error getting wireless settings: {e}"
+            return self._getter_error(e, "Error getting wireless performance")
+
+    def _get_wireless_performance_plan(self, stations=None):
+        yield from self._series_plan()
+        if self.radio_type == "b_c_series":
+            tables = yield from self._walk_metrics_plan(
+                {
+                    "chains": ("mimosa_chain_table", self.rf_chain_columns),
+                    "streams": ("mimosa_stream_table", self.rf_stream_columns),
+                }
+            )
+            chains, streams = tables["chains"], tables["streams"]
+            performance = {}
+            if chains is not _FAILED:
+                performance["rssi"] = _combined_power(
+                    chain["rx_power"]
+                    for chain in chains.values()
+                    if "rx_power" in chain
+                )
+            if streams is not _FAILED:
+                for field in ("tx_phy_rate", "rx_phy_rate"):
+                    performance[field] = sum(
+                        stream.get(field, 0) for stream in streams.values()
+                    )
+            performance["chains"] = chains
+            performance["streams"] = streams
+            return performance
+
+        tables = {
+            "radios": (
+                "mimosa_channel_power_table",
+                self.ptmp_radio_performance_columns,
+            )
+        }
+        if self.wireless_stations if stations is None else stations:
+            tables["stations"] = ("mimosa_station_table", self.ptmp_station_columns)
+        performance = yield from self._walk_metrics_plan(tables)
+        if performance.get("stations") not in (None, _FAILED):
+            performance["stations"] = {
+                _mac_address(station.pop("mac_address", b"")) or index: station
+                for index, station in performance["stations"].items()
+            }
+        return performance
 
     def get_dns_servers(self):
         try:
-            if self.radio_type == "b_c_series":
-                dns_servers = {
-                    "primary_dns_server": self._snmp_get(
-                        self.OIDs["primary_dns_server"]
-                    ),
-                    "secondary_dns_server": self._snmp_get(
-                        self.OIDs["secondary_dns_server"]
-                    ),
-                }
-            elif self.radio_type == "a_series":
-                dns_servers = {
-                    "primary_dns_server": self._snmp_get(
-                        self.OIDs["primary_dns_server"]
-                    ),
-                    "secondary_dns_server": self._snmp_get(
-                        self.OIDs["secondary_dns_server"]
-                    ),
-                }
-
-            return dns_servers
+            return self._run_getter(self._get_dns_servers_plan())
         except Exception as e:
-            return f"Error getting DNS servers: {e}"
+            return self._getter_error(e, "Error getting DNS servers")
+
+    def _get_dns_servers_plan(self):
+        # Both series expose the DNS servers as scalars, only the OIDs differ
+        dns_servers = yield from self._get_fields_plan(
+            ["primary_dns_server", "secondary_dns_server"]
+        )
+
+        return dns_servers
 
     def get_services(self):
         try:
-            if self.radio_type == "b_c_series":
-                services = {
-                    "https_status": self.enabled_disabled_mapping_backup.get(
-                        self._snmp_get(self.OIDs["https_status"]), "unknown"
-                    ),
-                    "mgmt_vlan_status": self.enabled_disabled_mapping_backup.get(
-                        self._snmp_get(self.OIDs["mgmt_vlan_status"]), "unknown"
-                    ),
-                    "mgmt_cloud_status": self.enabled_disabled_mapping_backup.get(
-                        self._snmp_get(self.OIDs["mgmt_cloud_status"]), "unknown"
-                    ),
-                    "syslog_status": self.enabled_disabled_mapping_backup.get(
-                        self._snmp_get(self.OIDs["syslog_status"]), "unknown"
-                    ),
-                }
+            return self._run_getter(self._get_services_plan())
+        except Exception as e:
+            return self._getter_error(e, "Error getting services")
 
-            elif self.radio_type == "a_series":
-                services = {
-                    "mgmt_vlan_status": self.enabled_disabled_mapping.get(
-                        self._snmp_get(self.OIDs["mgmt_vlan_status"]), "unknown"
-                    ),
-                    "mgmt_vlan_passthrough": self.enabled_disabled_mapping.get(
-                        self._snmp_get(self.OIDs["mgmt_vlan_passthrough"]), "unknown"
-                    ),
-                }
+    def _get_services_plan(self):
+        yield from self._series_plan()
+        if self.radio_type == "b_c_series":
+            values = yield from self._get_fields_plan(
+                [
+                    "https_status",
+                    "mgmt_vlan_status",
+                    "mgmt_cloud_status",
+                    "syslog_status",
+                ]
+            )
+            services = {
+                name: self._mapped(self.enabled_disabled_mapping_backup, value)
+                for name, value in values.items()
+            }
 
-            return services
-        except Exception as e:
-            return f"Error getting services: {e}"
+        elif self.radio_type == "a_series":
+            values = yield from self._get_fields_plan(
+                ["mgmt_vlan_status", "mgmt_vlan_passthrough"]
+            )
+            services = {
+                name: self._mapped(self.enabled_disabled_mapping, value)
+                for name, value in values.items()
+            }
+
+        return services
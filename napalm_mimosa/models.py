@@ -0,0 +1,74 @@
+"""
+Registry of the Mimosa radio models the driver knows about.
+
+Every model is registered under its sysObjectID with the series whose OIDs
+it implements and the fields of that series it lacks. Drivers created with
+``radio_type="auto"`` look their radio up here on open(), and getters skip
+the fields the model does not have instead of asking for them.
+
+The built-in models list the gaps known so far, e.g. A5 firmware that has no
+unlock code or regulatory domain scalars; ``register_model()`` declares the
+gaps of other models or firmware, or replaces a built-in entry.
+
+The model found for a host is remembered for the life of the process, so
+drivers created for every poll only read sysObjectID once per radio.
+
+"""
+
+from typing import FrozenSet, NamedTuple
+
+
+class RadioModel(NamedTuple):
+    # Model name reported by get_facts, e.g. "mimosaB5"
+    name: str
+    # "a_series" or "b_c_series"
+    series: str
+    # Names of series fields (scalars or tables) the model does not implement
+    unsupported: FrozenSet[str] = frozenset()
+
+
+# sysObjectID -> model
+models = {
+    "1.3.6.1.4.1.43356.1.1.1": RadioModel("mimosaB5", "b_c_series"),
+    "1.3.6.1.4.1.43356.1.1.2": RadioModel("mimosaB5Lite", "b_c_series"),
+    "1.3.6.1.4.1.43356.1.1.3": RadioModel(
+        "mimosaA5", "a_series", frozenset({"unlock_code", "regulatory_domain"})
+    ),
+    "1.3.6.1.4.1.43356.1.1.4": RadioModel("mimosaC5", "b_c_series"),
+}
+
+# Process-wide hostname -> model of the radios seen so far
+_detected_models = {}
+
+
+def register_model(sys_object_id, model):
+    """
+    Add or replace the model registered under ``sys_object_id``.
+    """
+    models[sys_object_id.lstrip(".")] = model
+
+
+def find_model(sys_object_id):
+    """
+    :return: the ``RadioModel`` registered under ``sys_object_id``, or None
+    """
+    return models.get(sys_object_id.lstrip("."))
+
+
+def detected_model(hostname):
+    return _detected_models.get(hostname)
+
+
+def remember_model(hostname, model):
+    _detected_models[hostname] = model
+
+
+def forget_models(hostname=None):
+    """
+    Forget the model found for ``hostname`` (every host if None), e.g.
+    after a radio was swapped for another model at the same address.
+    """
+    if hostname is None:
+        _detected_models.clear()
+    else:
+        _detected_models.pop(hostname, None)
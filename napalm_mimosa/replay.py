@@ -0,0 +1,336 @@
+"""
+Recording of SNMP responses and replay of getters from the recordings.
+
+A driver opened with ``optional_args={"record": path}`` saves the response
+to every SNMP request it sends, and one opened with ``{"replay": path}``
+answers its requests from such captures instead of asking the radio, so the
+getters and their decoding can be run without a device, e.g. to
+regression-test them against captures of many radios or to benchmark them
+without network time.
+
+A capture is a file of compact JSON lines, gzip-compressed when its name
+ends in ".gz". Each line is the exchange of one request:
+
+    {"h": radio, "q": request, "s": error status, "r": rows}
+    {"h": radio, "q": request, "e": [error type, message, oids]}
+
+``radio`` is the ``radio_address`` of the driver, ``request`` the command
+and the names of the var-binds requested, and every row a list of
+``[OID, SNMP type, value]`` var-binds. Requests that failed record their
+``SnmpError`` instead, which the replay raises again.
+
+"""
+
+import bisect
+import gzip
+import json
+import os
+import threading
+
+from napalm_mimosa import errors
+
+# Values that only report that there is no value
+_exceptions = ("NoSuchObject", "NoSuchInstance", "EndOfMibView", "Null")
+
+# Number of the GETBULK counts that precede the var-binds of a request
+_BULK_COUNTS = 2
+
+
+def _open(path, mode):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def request_key(kind, var_binds):
+    """
+    Return the text naming the request of ``kind`` for ``var_binds``, e.g.
+    "bulk 0 25 1.3.6.1.2.1.2.2.1.2".
+    """
+    return " ".join(
+        [kind]
+        + [
+            str(var_bind if isinstance(var_bind, int) else var_bind[0])
+            for var_bind in var_binds
+        ]
+    )
+
+
+# SNMP value class name -> (class, encoder of its values); filled in lazily
+_value_types = {}
+
+
+def _types():
+    if not _value_types:
+        from pyasn1.type import univ
+        from pysnmp.proto import rfc1902, rfc1905
+
+        for cls in (
+            rfc1902.Integer32,
+            rfc1902.Counter32,
+            rfc1902.Gauge32,
+            rfc1902.Unsigned32,
+            rfc1902.TimeTicks,
+            rfc1902.Counter64,
+            rfc1902.Integer,
+        ):
+            _value_types[cls.__name__] = (cls, int)
+        _value_types["IpAddress"] = (rfc1902.IpAddress, lambda v: v.prettyPrint())
+        for cls in (rfc1902.Opaque, rfc1902.Bits, rfc1902.OctetString):
+            _value_types[cls.__name__] = (cls, lambda v: v.asOctets().hex())
+        _value_types["ObjectIdentifier"] = (
+            rfc1902.ObjectIdentifier,
+            lambda v: ".".join(map(str, v)),
+        )
+        for cls in (
+            rfc1905.NoSuchObject,
+            rfc1905.NoSuchInstance,
+            rfc1905.EndOfMibView,
+            univ.Null,
+        ):
+            _value_types[cls.__name__] = (cls, lambda v: "")
+    return _value_types
+
+
+def encode_value(value):
+    """
+    :return: tuple of the SNMP type name of ``value`` and its JSON value
+    """
+    types = _types()
+    # Values resolved against a MIB are subclasses of the SNMP types
+    for cls in type(value).__mro__:
+        entry = types.get(cls.__name__)
+        if entry is not None:
+            return cls.__name__, entry[1](value)
+    raise TypeError(f"Cannot record SNMP values of type {type(value).__name__}")
+
+
+def decode_value(type_name, value):
+    cls, _ = _types()[type_name]
+    if value == "":
+        return cls("")
+    if isinstance(value, int) or type_name in ("IpAddress", "ObjectIdentifier"):
+        return cls(value)
+    return cls(hexValue=value)
+
+
+class SnmpRecorder:
+    """
+    Append the exchanges of the drivers recording into it to the capture at
+    ``path``. One recorder can be shared between drivers.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # Opened by the first exchange recorded after a close()
+        self._file = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def record(self, radio, kind, var_binds, errorStatus, rows):
+        """
+        Record the response of ``radio`` to a request.
+        """
+        self._write(
+            {
+                "h": radio,
+                "q": request_key(kind, var_binds),
+                "s": int(errorStatus),
+                "r": [
+                    [[str(name), *encode_value(value)] for name, value in row]
+                    for row in rows
+                ],
+            }
+        )
+
+    def record_error(self, radio, kind, var_binds, error):
+        """
+        Record that a request to ``radio`` failed with the ``SnmpError``
+        ``error``.
+        """
+        self._write(
+            {
+                "h": radio,
+                "q": request_key(kind, var_binds),
+                "e": [_error_type(error), str(error), list(error.oids)],
+            }
+        )
+
+    def _write(self, exchange):
+        line = json.dumps(exchange, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = _open(self.path, "a")
+            self._file.write(line)
+            self._file.flush()
+
+
+class SnmpReplay:
+    """
+    Serve the requests of drivers from the captures at ``paths``.
+
+    A request is answered with the response recorded for the same request
+    to the same radio. Requests made several times, e.g. to poll counters,
+    get their responses in the order they were recorded, the last one being
+    repeated. Requests that were never recorded, e.g. because a driver option
+    changes how OIDs are packed into PDUs, are answered from all the
+    var-binds recorded for the radio, the way its agent would. Radios
+    without captures time out.
+
+    :param paths: Path of a capture, or list of paths
+    :param latency: Seconds each request is delayed by, to simulate the
+        network
+    """
+
+    def __init__(self, paths, latency=0.0):
+        self.latency = latency
+        # radio -> request -> [responses]
+        self._exchanges = {}
+        # radio -> {OID tuple: value} recorded for that radio
+        self._values = {}
+        # radio -> sorted OID tuples of _values, built on first use
+        self._names = {}
+        self._lock = threading.Lock()
+        for path in [paths] if isinstance(paths, (str, os.PathLike)) else paths:
+            self.load(path)
+
+    def load(self, path):
+        """
+        Add the exchanges recorded in the capture at ``path``.
+        """
+        with _open(path, "r") as capture:
+            for line in capture:
+                if line.strip():
+                    self._add(json.loads(line))
+
+    def radios(self):
+        """
+        :return: the ``radio_address`` of every radio captured
+        """
+        return list(self._exchanges)
+
+    def _add(self, exchange):
+        radio = exchange["h"]
+        requests = self._exchanges.setdefault(radio, {})
+        requests.setdefault(exchange["q"], []).append(exchange)
+        values = self._values.setdefault(radio, {})
+        for row in exchange.get("r", ()):
+            for name, type_name, value in row:
+                if type_name not in _exceptions:
+                    values[tuple(map(int, name.split(".")))] = (type_name, value)
+        self._names.pop(radio, None)
+
+    def response(self, radio, kind, var_binds):
+        """
+        Return the (errorStatus, rows) ``radio`` answered to a request, as
+        ``MimosaDriver._snmp_request()`` does, or raise the ``SnmpError`` it
+        failed with.
+        """
+        from pysnmp.proto.rfc1905 import errorStatus
+
+        key = request_key(kind, var_binds)
+        if radio not in self._exchanges:
+            raise errors.SnmpTimeoutError(
+                f"SNMP Error: No SNMP response received before timeout "
+                f"(no capture of {radio})",
+                _requested_oids(kind, var_binds),
+            )
+        with self._lock:
+            responses = self._exchanges[radio].get(key)
+            exchange = None
+            if responses:
+                exchange = responses.pop(0) if len(responses) > 1 else responses[0]
+        if exchange is None:
+            return 0, self._agent_response(radio, kind, var_binds)
+
+        if "e" in exchange:
+            error_type, message, oids = exchange["e"]
+            raise getattr(errors, error_type, errors.SnmpError)(message, oids)
+        rows = [
+            [
+                (_object_name(name), decode_value(type_name, value))
+                for name, type_name, value in row
+            ]
+            for row in exchange["r"]
+        ]
+        status = exchange["s"]
+        return (errorStatus.clone(status) if status else 0), rows
+
+    def _agent_response(self, radio, kind, var_binds):
+        from pysnmp.proto import rfc1905
+
+        values = self._values[radio]
+        if radio not in self._names:
+            self._names[radio] = sorted(values)
+        names = self._names[radio]
+
+        if kind == "get":
+            row = []
+            for var_bind in var_binds:
+                name = tuple(_object_name(str(var_bind[0])))
+                if name in values:
+                    value = decode_value(*values[name])
+                elif _has_object(names, name[:-1]):
+                    value = rfc1905.noSuchInstance
+                else:
+                    value = rfc1905.noSuchObject
+                row.append((_object_name(name), value))
+            return [row]
+
+        repetitions = 1
+        if kind == "bulk":
+            repetitions = max(1, int(var_binds[1]))
+            var_binds = var_binds[_BULK_COUNTS:]
+        current = [tuple(_object_name(str(var_bind[0]))) for var_bind in var_binds]
+        rows = []
+        for _ in range(repetitions):
+            row = []
+            for column, name in enumerate(current):
+                position = bisect.bisect_right(names, name)
+                if position == len(names):
+                    row.append((_object_name(name), rfc1905.endOfMibView))
+                    continue
+                name = current[column] = names[position]
+                row.append((_object_name(name), decode_value(*values[name])))
+            rows.append(row)
+            if all(isinstance(value, rfc1905.EndOfMibView) for _, value in row):
+                break
+        return rows
+
+
+def _error_type(error):
+    # The closest class of napalm_mimosa.errors, e.g. SnmpTimeoutError for
+    # the CircuitOpenError of napalm_mimosa.retry
+    for cls in type(error).__mro__:
+        if getattr(errors, cls.__name__, None) is cls:
+            return cls.__name__
+    return "SnmpError"
+
+
+def _has_object(names, prefix):
+    # Whether an instance of the object ``prefix`` was recorded
+    position = bisect.bisect_right(names, prefix)
+    return position < len(names) and names[position][: len(prefix)] == prefix
+
+
+def _object_name(name):
+    from pysnmp.proto.rfc1902 import ObjectName
+
+    return ObjectName(name.lstrip(".") if isinstance(name, str) else name)
+
+
+def _requested_oids(kind, var_binds):
+    if kind == "bulk":
+        var_binds = var_binds[_BULK_COUNTS:]
+    return [str(var_bind[0]) for var_bind in var_binds]
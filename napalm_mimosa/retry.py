@@ -0,0 +1,174 @@
+"""
+Retry timing and fast-fail for SNMP requests over lossy radio links.
+
+``RttEstimator`` derives the per-attempt timeout of a host from its measured
+round-trip times, the way TCP computes its retransmission timeout (RFC 6298).
+``CircuitBreaker`` stops sending requests to a host that has stopped
+answering and lets a single probe through once its reset timeout expires.
+
+Drivers opened with ``adaptive_timeout`` or ``circuit_breaker`` set to True
+use the process-wide per-host instances returned by ``get_rtt_estimator()``
+and ``get_circuit_breaker()``, so what was learned about a radio outlives
+the driver that polled it.
+
+"""
+
+import bisect
+import math
+import time
+
+from napalm_mimosa.errors import SnmpTimeoutError
+
+# Process-wide per-host state, keyed by hostname
+_rtt_estimators = {}
+_circuit_breakers = {}
+
+# Seconds an attempt may wait for its answer. pysnmp configures one target
+# entry per host and distinct timeout in the SNMP engine and never removes
+# it, so adaptive and deadline-clipped timeouts are taken from this fixed set.
+TIMEOUT_STEPS = (
+    0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 30.0, 60.0
+)
+
+
+class CircuitOpenError(SnmpTimeoutError):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+class RttEstimator:
+    """
+    Smoothed round-trip time of one host and the timeout derived from it.
+    """
+
+    def __init__(self, initial_timeout=1.0, min_timeout=0.2, max_timeout=10.0):
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.srtt = None
+        self.rttvar = None
+        self.timeout = initial_timeout
+
+    def update(self, rtt):
+        """
+        Add a round-trip time measured on a request that was not retried.
+        """
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.timeout = min(
+            max(self.srtt + 4 * self.rttvar, self.min_timeout), self.max_timeout
+        )
+
+    def backoff(self):
+        """
+        Double the timeout after an attempt timed out; it stays backed off
+        until the next ``update()``.
+        """
+        self.timeout = min(self.timeout * 2, self.max_timeout)
+
+
+class CircuitBreaker:
+    """
+    Fails requests to a host fast after ``failure_threshold`` consecutive
+    requests got no answer.
+
+    Once ``reset_timeout`` seconds have passed a single probe request is let
+    through: an answer closes the circuit again, another failure keeps it
+    open for a further ``reset_timeout``.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=60.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        """
+        :return: True if a request may be sent now
+        """
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+        self._probing = False
+
+
+def get_rtt_estimator(hostname, initial_timeout=1.0):
+    """
+    Return the process-wide ``RttEstimator`` of ``hostname``, creating it
+    with ``initial_timeout`` on first use.
+    """
+    if hostname not in _rtt_estimators:
+        _rtt_estimators[hostname] = RttEstimator(initial_timeout)
+    return _rtt_estimators[hostname]
+
+
+def get_circuit_breaker(hostname):
+    """
+    Return the process-wide ``CircuitBreaker`` of ``hostname``.
+    """
+    if hostname not in _circuit_breakers:
+        _circuit_breakers[hostname] = CircuitBreaker()
+    return _circuit_breakers[hostname]
+
+
+def attempt_timeouts(retries, timeout, deadline, estimator=None):
+    """
+    Yield (attempt, timeout) for every attempt of one request.
+
+    Attempts use ``estimator.timeout``, rounded up to one of
+    ``TIMEOUT_STEPS``, when an estimator is given and ``timeout`` unchanged
+    otherwise. They are cut short to a step so that none runs past
+    ``deadline`` (a ``time.monotonic()`` value), and stop once it has passed.
+    """
+    for attempt in range(retries + 1):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        if estimator is not None:
+            yield attempt, _timeout_step(estimator.timeout, remaining)
+        elif timeout > remaining:
+            yield attempt, _timeout_step(timeout, remaining)
+        else:
+            # A fixed timeout adds a single target entry per host
+            yield attempt, timeout
+
+
+def _timeout_step(timeout, remaining):
+    # The smallest step of at least ``timeout``, or the largest one that
+    # fits in ``remaining``; longer timeouts are rounded up to whole seconds
+    position = bisect.bisect_left(TIMEOUT_STEPS, timeout)
+    if position == len(TIMEOUT_STEPS):
+        step = float(math.ceil(timeout))
+    else:
+        step = TIMEOUT_STEPS[position]
+    if step > remaining:
+        position = bisect.bisect_right(TIMEOUT_STEPS, remaining)
+        step = TIMEOUT_STEPS[max(position - 1, 0)]
+    return step
@@ -0,0 +1,245 @@
+"""
+Instrumentation of the SNMP requests made by the drivers.
+
+A driver opened with ``optional_args={"stats": ...}`` reports every request
+PDU it sends, retries included, as a ``RequestEvent`` to a sink: any callable
+taking the event. ``SnmpStats`` is the bundled sink, aggregating events into
+counters and latency histograms per OID, getter and host that can be read as
+a dict or exported to a metrics system.
+
+Message sizes are taken from pysnmp's engine observer and matched to requests
+by request-id, so they are exact for concurrent asyncio requests too.
+
+"""
+
+import bisect
+import contextvars
+import weakref
+from contextlib import contextmanager
+from typing import NamedTuple, Optional, Tuple
+
+
+class RequestEvent(NamedTuple):
+    hostname: str
+    # Getter the request was made for, e.g. "get_facts"
+    getter: Optional[str]
+    # "get", "next" or "bulk"
+    kind: str
+    # Requested OIDs; walks report the roots of the subtrees they page through
+    oids: Tuple[str, ...]
+    varbinds_sent: int
+    varbinds_received: int
+    bytes_sent: int
+    bytes_received: int
+    # PDUs sent for the request; every attempt after the first is a retry
+    attempts: int
+    timeouts: int
+    # Seconds from the first attempt until the answer, or until giving up
+    latency: float
+    error: Optional[str]
+
+
+class Histogram:
+    """
+    Cumulative histogram in the style of a Prometheus histogram.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def as_dict(self):
+        cumulative, buckets = 0, {}
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"buckets": buckets, "sum": self.sum, "count": self.count}
+
+
+class SnmpStats:
+    """
+    Sink aggregating ``RequestEvent``s into counters and latency histograms.
+
+    One instance can be shared between drivers to aggregate a whole fleet;
+    histograms are kept per OID, per getter and per host.
+    """
+
+    default_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    counter_names = (
+        "requests",
+        "pdus_sent",
+        "retries",
+        "timeouts",
+        "errors",
+        "varbinds_sent",
+        "varbinds_received",
+        "bytes_sent",
+        "bytes_received",
+    )
+
+    def __init__(self, buckets=default_buckets):
+        self.buckets = buckets
+        self.reset()
+
+    def reset(self):
+        self.counters = dict.fromkeys(self.counter_names, 0)
+        # Number of var-binds in a request PDU -> requests of that size
+        self.varbinds_per_pdu = {}
+        self.latency_by_oid = {}
+        self.latency_by_getter = {}
+        self.latency_by_host = {}
+
+    def __call__(self, event):
+        counters = self.counters
+        counters["requests"] += 1
+        counters["pdus_sent"] += event.attempts
+        counters["retries"] += max(event.attempts - 1, 0)
+        counters["timeouts"] += event.timeouts
+        counters["errors"] += event.error is not None
+        counters["varbinds_sent"] += event.varbinds_sent * event.attempts
+        counters["varbinds_received"] += event.varbinds_received
+        counters["bytes_sent"] += event.bytes_sent
+        counters["bytes_received"] += event.bytes_received
+        self.varbinds_per_pdu[event.varbinds_sent] = (
+            self.varbinds_per_pdu.get(event.varbinds_sent, 0) + 1
+        )
+
+        if event.error is not None:
+            return
+        for oid in event.oids:
+            self._observe(self.latency_by_oid, oid, event.latency)
+        if event.getter is not None:
+            self._observe(self.latency_by_getter, event.getter, event.latency)
+        self._observe(self.latency_by_host, event.hostname, event.latency)
+
+    def _observe(self, histograms, key, latency):
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(self.buckets)
+        histogram.observe(latency)
+
+    def as_dict(self):
+        return {
+            "counters": dict(self.counters),
+            "varbinds_per_pdu": dict(self.varbinds_per_pdu),
+            "latency_by_oid": _histograms(self.latency_by_oid),
+            "latency_by_getter": _histograms(self.latency_by_getter),
+            "latency_by_host": _histograms(self.latency_by_host),
+        }
+
+
+def _histograms(histograms):
+    return {key: histogram.as_dict() for key, histogram in histograms.items()}
+
+
+class RequestTrace:
+    """
+    Measurements of one request while it is in flight.
+    """
+
+    __slots__ = (
+        "attempts",
+        "timeouts",
+        "varbinds_received",
+        "bytes_sent",
+        "bytes_received",
+        "error",
+        "request_ids",
+    )
+
+    def __init__(self):
+        self.attempts = 0
+        self.timeouts = 0
+        self.varbinds_received = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.error = None
+        self.request_ids = []
+
+
+# Getter and request being served in the current thread or asyncio task
+_current_getter = contextvars.ContextVar("current_getter", default=None)
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+
+# Traces waiting for a response, by request-id
+_pending = {}
+_observed_engines = weakref.WeakSet()
+
+
+def observe_engine(engine):
+    """
+    Count the bytes of the messages ``engine`` exchanges for traced requests.
+    """
+    if engine not in _observed_engines:
+        engine.observer.registerObserver(
+            _observe_message, "rfc3412.sendPdu", "rfc3412.receiveMessage:response"
+        )
+        _observed_engines.add(engine)
+
+
+def _observe_message(engine, execpoint, variables, context):
+    request_id = int(variables["pdu"]["request-id"])
+    if execpoint == "rfc3412.sendPdu":
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.bytes_sent += len(variables["outgoingMessage"])
+            trace.request_ids.append(request_id)
+            _pending[request_id] = trace
+    else:
+        trace = _pending.pop(request_id, None)
+        if trace is not None:
+            trace.bytes_received += len(variables["wholeMsg"])
+
+
+@contextmanager
+def traced_request():
+    """
+    Make the current request's messages count towards a new ``RequestTrace``.
+    """
+    trace = RequestTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        for request_id in trace.request_ids:
+            _pending.pop(request_id, None)
+
+
+@contextmanager
+def getter_label(plan):
+    """
+    Attribute the requests of ``plan`` to the getter it implements, unless
+    they are already attributed to an enclosing getter.
+    """
+    if _current_getter.get() is not None:
+        yield
+        return
+    token = _current_getter.set(getter_name(plan))
+    try:
+        yield
+    finally:
+        _current_getter.reset(token)
+
+
+def getter_name(plan):
+    """
+    Name of the getter a request plan implements, e.g. "get_facts" for
+    ``_get_facts_plan()``.
+    """
+    name = plan.__name__.strip("_")
+    if name.endswith("_plan"):
+        name = name[: -len("_plan")]
+    return name
+
+
+def current_getter():
+    return _current_getter.get()
@@ -0,0 +1,260 @@
+"""
+Receiver of the SNMP notifications sent by Mimosa radios.
+
+A poller only learns that a radio changed on its next poll. ``TrapReceiver``
+listens for the SNMPv1 and SNMPv2c traps and informs the radios send
+instead, and turns each into a ``TrapEvent``. It drops the values made stale
+by the notification from the ``SnmpCache`` shared with the drivers, calls an
+optional callback, and remembers the radio until ``changed()`` is called, so
+a collector can poll far less often and refresh only the radios that
+reported a change in between.
+
+Informs are acknowledged as soon as they are received. SNMPv3 notifications
+are not supported and are dropped.
+
+"""
+
+import socket
+import threading
+import time
+from typing import NamedTuple, Tuple
+
+from napalm_mimosa.decode import typed_value
+from napalm_mimosa.models import forget_models
+from napalm_mimosa.usm import forget_usm_peers
+
+# Notification OID -> (event, cache class it makes stale, None for all)
+notification_events = {
+    "1.3.6.1.6.3.1.1.5.1": ("restart", None),  # coldStart
+    "1.3.6.1.6.3.1.1.5.2": ("restart", None),  # warmStart
+    "1.3.6.1.6.3.1.1.5.3": ("link_down", "operational"),
+    "1.3.6.1.6.3.1.1.5.4": ("link_up", "operational"),
+}
+
+# The other notifications of the Mimosa enterprise subtree report a change
+# of the radio's configuration or wireless state
+_MIMOSA_NOTIFICATION = "1.3.6.1.4.1.43356."
+_mimosa_event = ("config", "config")
+
+# snmpTrapOID.0, the second var-bind of every SNMPv2c notification
+_SNMP_TRAP_OID = "1.3.6.1.6.3.1.1.4.1.0"
+# snmpTraps, the prefix of the notifications of SNMPv1 generic traps
+_SNMP_TRAPS = "1.3.6.1.6.3.1.1.5"
+_ENTERPRISE_SPECIFIC = 6
+
+
+class TrapEvent(NamedTuple):
+    # Radio the notification came from, as its drivers' ``radio_address``
+    hostname: str
+    # (IP address, port) the notification was sent from
+    address: Tuple[str, int]
+    # "restart", "link_down", "link_up", "config" or "other"
+    event: str
+    # Notification OID, dotted
+    notification: str
+    # (OID, value) of the var-binds of the notification, values decoded as
+    # with ``typed_values``
+    var_binds: tuple
+    # Unix time the notification was received
+    received_at: float
+
+
+def notification_event(notification):
+    """
+    :return: tuple of the event of the notification OID ``notification`` and
+        the cache class it makes stale (None for every class)
+    """
+    if notification in notification_events:
+        return notification_events[notification]
+    if notification.startswith(_MIMOSA_NOTIFICATION):
+        return _mimosa_event
+    return "other", None
+
+
+class TrapReceiver:
+    """
+    Listen for notifications on ``address`` and turn them into
+    ``TrapEvent``.
+
+    :param address: (IP address, UDP port) to listen on; port 0 picks a free
+        one, read back from ``address`` once started
+    :param communities: Community strings accepted; None accepts any
+    :param cache: ``SnmpCache`` shared with the drivers, whose values made
+        stale by a notification are dropped
+    :param callback: Called with every ``TrapEvent``, from the receiver's
+        thread
+    :param hostnames: Source IP address -> ``radio_address`` of the drivers
+        polling that radio, when they do not poll it by that address
+    """
+
+    def __init__(
+        self,
+        address=("0.0.0.0", 162),
+        communities=None,
+        cache=None,
+        callback=None,
+        hostnames=None,
+    ):
+        self.address = address
+        self.communities = None if communities is None else set(communities)
+        self.cache = cache
+        self.callback = callback
+        self.hostnames = hostnames or {}
+        # Messages that were not notifications, not accepted or not decodable
+        self.dropped = 0
+        self._changed = set()
+        self._lock = threading.Lock()
+        self._socket = None
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.stop()
+
+    def start(self):
+        """
+        Bind ``address`` and receive notifications in a daemon thread.
+        """
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind(self.address)
+        # Wake up regularly to notice stop()
+        self._socket.settimeout(0.2)
+        self.address = self._socket.getsockname()
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._serve, name="mimosa-traps", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def changed(self):
+        """
+        Return the radios that sent a notification since the previous call.
+        """
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        return changed
+
+    def _serve(self):
+        while not self._stopping.is_set():
+            try:
+                data, address = self._socket.recvfrom(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            response = self.handle_message(data, address)
+            if response is not None:
+                try:
+                    self._socket.sendto(response, address)
+                except OSError:
+                    pass
+
+    def handle_message(self, data, address):
+        """
+        Handle the SNMP message ``data`` received from ``address``, e.g. when
+        reading the socket from an event loop of your own.
+
+        :return: the bytes of the response to send back for an inform, or
+            None
+        """
+        try:
+            event, response = self._decode(data, address)
+        except Exception:
+            event = None
+        if event is None:
+            self.dropped += 1
+            return None
+
+        self._apply(event)
+        return response
+
+    def _decode(self, data, address):
+        from pyasn1.codec.ber import decoder, encoder
+        from pysnmp.proto import api
+
+        version = int(api.decodeMessageVersion(data))
+        if version not in (api.protoVersion1, api.protoVersion2c):
+            return None, None
+        p_mod = api.protoModules[version]
+        message, _ = decoder.decode(data, asn1Spec=p_mod.Message())
+        community = str(p_mod.apiMessage.getCommunity(message))
+        if self.communities is not None and community not in self.communities:
+            return None, None
+
+        pdu = p_mod.apiMessage.getPDU(message)
+        response = None
+        if version == api.protoVersion1:
+            if not pdu.isSameTypeWith(p_mod.TrapPDU()):
+                return None, None
+            var_binds = p_mod.apiTrapPDU.getVarBinds(pdu)
+            notification = _v1_notification(p_mod.apiTrapPDU, pdu)
+        else:
+            if pdu.isSameTypeWith(p_mod.InformRequestPDU()):
+                response_message = p_mod.apiMessage.getResponse(message)
+                p_mod.apiPDU.setVarBinds(
+                    p_mod.apiMessage.getPDU(response_message),
+                    p_mod.apiPDU.getVarBinds(pdu),
+                )
+                response = encoder.encode(response_message)
+            elif not pdu.isSameTypeWith(p_mod.SNMPv2TrapPDU()):
+                return None, None
+            var_binds = p_mod.apiPDU.getVarBinds(pdu)
+            notification = next(
+                (
+                    ".".join(map(str, value))
+                    for oid, value in var_binds
+                    if str(oid) == _SNMP_TRAP_OID
+                ),
+                None,
+            )
+            if notification is None:
+                return None, None
+
+        event, _ = notification_event(notification)
+        return (
+            TrapEvent(
+                self.hostnames.get(address[0], address[0]),
+                tuple(address),
+                event,
+                notification,
+                tuple((str(oid), typed_value(value)) for oid, value in var_binds),
+                time.time(),
+            ),
+            response,
+        )
+
+    def _apply(self, event):
+        _, cache_class = notification_event(event.notification)
+        if event.event == "restart":
+            # The radio may have been replaced, and its SNMPv3 engine boots
+            # have changed
+            forget_models(event.hostname)
+            forget_usm_peers(event.hostname)
+        if self.cache is not None and event.event != "other":
+            self.cache.invalidate(event.hostname, cache_class)
+        with self._lock:
+            self._changed.add(event.hostname)
+        if self.callback is not None:
+            self.callback(event)
+
+
+def _v1_notification(trap_api, pdu):
+    # The SNMPv2 notification OID of an SNMPv1 trap (RFC 3584, 3.1)
+    generic = int(trap_api.getGenericTrap(pdu))
+    if generic != _ENTERPRISE_SPECIFIC:
+        return f"{_SNMP_TRAPS}.{generic + 1}"
+    enterprise = ".".join(map(str, trap_api.getEnterprise(pdu)))
+    return f"{enterprise}.0.{int(trap_api.getSpecificTrap(pdu))}"
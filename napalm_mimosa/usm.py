@@ -0,0 +1,186 @@
+"""
+SNMPv3 User-based Security Model (USM) state shared between drivers.
+
+Before its first authenticated request to a radio, a pysnmp engine has to
+discover the radio's snmpEngineID and then its snmpEngineBoots and
+snmpEngineTime, which costs up to two extra round trips, and to localize the
+user's keys to that engine ID, which hashes a megabyte per key. Engines
+forget all of it when they are closed, so a driver created for every poll
+would pay again each time.
+
+Drivers opened with ``snmp_version="v3"`` therefore remember what their
+engine learned about a radio in a process-wide ``UsmPeer``, keyed by
+hostname and user, and prime the engine of the next driver polling the
+radio with it. After the first contact, v3 polls take as many round trips as
+v2c ones. A radio that rejects a primed request is forgotten, and its next
+poll discovers it again.
+
+"""
+
+import time
+import weakref
+from typing import NamedTuple, Optional
+
+# optional_args names of the protocols -> pysnmp.hlapi names
+auth_protocols = {
+    "md5": "usmHMACMD5AuthProtocol",
+    "sha": "usmHMACSHAAuthProtocol",
+    "sha224": "usmHMAC128SHA224AuthProtocol",
+    "sha256": "usmHMAC192SHA256AuthProtocol",
+    "sha384": "usmHMAC256SHA384AuthProtocol",
+    "sha512": "usmHMAC384SHA512AuthProtocol",
+}
+priv_protocols = {
+    "des": "usmDESPrivProtocol",
+    "3des": "usm3DESEDEPrivProtocol",
+    "aes": "usmAesCfb128Protocol",
+    "aes192": "usmAesCfb192Protocol",
+    "aes256": "usmAesCfb256Protocol",
+}
+
+
+class UsmPeer(NamedTuple):
+    engine_id: bytes
+    boots: int
+    # snmpEngineTime of the radio at ``received_at``
+    time: int
+    # time.monotonic() when boots and time were received
+    received_at: float
+    # Keys of the user localized to ``engine_id``, None without auth/priv
+    auth_key: Optional[bytes]
+    priv_key: Optional[bytes]
+
+
+# Process-wide (hostname, user) -> UsmPeer of the radios contacted so far
+_peers = {}
+
+# SNMP engine -> {(engine ID, user): UsmPeer} seen in the messages it received
+_observed = weakref.WeakKeyDictionary()
+
+
+def usm_peer(hostname, user):
+    return _peers.get((hostname, user))
+
+
+def forget_usm_peers(hostname=None):
+    """
+    Forget the USM state of ``hostname`` (every host if None).
+    """
+    for key in list(_peers):
+        if hostname is None or key[0] == hostname:
+            del _peers[key]
+
+
+def user_data(user, auth_key, priv_key, auth_protocol, priv_protocol, peer=None):
+    """
+    Return the pysnmp ``UsmUserData`` of ``user``, with the keys of ``peer``
+    when the radio is already known so that they are not localized again.
+    """
+    from pysnmp import hlapi
+
+    options = {}
+    if auth_key is not None:
+        options["authProtocol"] = getattr(hlapi, auth_protocols[auth_protocol])
+    if priv_key is not None:
+        options["privProtocol"] = getattr(hlapi, priv_protocols[priv_protocol])
+    if peer is not None and auth_key is not None:
+        auth_key, priv_key = peer.auth_key, peer.priv_key
+        options.update(
+            securityEngineId=hlapi.OctetString(peer.engine_id),
+            authKeyType=hlapi.usmKeyTypeLocalized,
+            privKeyType=hlapi.usmKeyTypeLocalized,
+        )
+    return hlapi.UsmUserData(user, auth_key, priv_key, **options)
+
+
+def observe_usm(engine):
+    """
+    Record the engine ID, boots, time and localized keys of the radios
+    ``engine`` hears from.
+    """
+    if engine not in _observed:
+        _observed[engine] = {}
+        engine.observer.registerObserver(
+            _observe_message, "rfc3414.processIncomingMsg"
+        )
+
+
+def _observe_message(engine, execpoint, variables, context):
+    # Also called for messages that fail authentication, so what is seen
+    # here is only remembered once a request succeeded
+    engine_id = variables["securityEngineId"]
+    if not engine_id or not variables["userName"]:
+        return
+    _observed[engine][(bytes(engine_id), bytes(variables["userName"]))] = UsmPeer(
+        bytes(engine_id),
+        int(variables["snmpEngineBoots"]),
+        int(variables["snmpEngineTime"]),
+        time.monotonic(),
+        # Users without auth or priv have empty keys
+        bytes(variables["authKey"] or b"") or None,
+        bytes(variables["privKey"] or b"") or None,
+    )
+
+
+def remember_usm_peer(hostname, user, engine, transport):
+    """
+    Remember what ``engine`` learned about the radio it reaches through
+    ``transport`` after a request to it succeeded.
+    """
+    mp_model = engine.messageProcessingSubsystems[3]
+    engine_id, _, _ = mp_model.getPeerEngineInfo(
+        transport.transportDomain, transport.transportAddr
+    )
+    if engine_id is None:
+        return
+    peer = _observed.get(engine, {}).get((bytes(engine_id), user.encode()))
+    if peer is not None:
+        _peers[(hostname, user)] = peer
+
+
+def prime_engine(engine, transport, peer):
+    """
+    Make ``engine`` send its first request through ``transport`` as if it had
+    already discovered ``peer``.
+
+    pysnmp has no API to set what it discovered, so this fills in the private
+    caches of its SNMPv3 message processing and USM; with a pysnmp that
+    lacks them, the engine discovers the radio as usual.
+    """
+    engine_ids = _engine_id_cache(engine)
+    timeline = getattr(
+        engine.securityModels[3], "_SnmpUSMSecurityModel__timeline", None
+    )
+    if engine_ids is None or timeline is None:
+        return
+    engine_ids[(transport.transportDomain, transport.transportAddr)] = {
+        "securityEngineId": peer.engine_id,
+        "contextEngineId": peer.engine_id,
+        "contextName": b"",
+    }
+    # The radio's clock kept running since it was read
+    engine_time = peer.time + int(time.monotonic() - peer.received_at)
+    timeline[peer.engine_id] = (
+        peer.boots,
+        engine_time,
+        engine_time,
+        int(time.time()),
+    )
+
+
+def unprime_engine(engine, transport):
+    """
+    Drop the engine ID ``engine`` knows for ``transport``, so that its next
+    request discovers the radio again.
+    """
+    engine_ids = _engine_id_cache(engine)
+    if engine_ids is not None:
+        engine_ids.pop((transport.transportDomain, transport.transportAddr), None)
+
+
+def _engine_id_cache(engine):
+    return getattr(
+        engine.messageProcessingSubsystems[3],
+        "_SnmpV3MessageProcessingModel__engineIdCache",
+        None,
+    )
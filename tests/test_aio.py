@@ -0,0 +1,153 @@
+import asyncio
+import unittest
+from benchmarks.agent import SimulatedAgent, b_c_series_data
+from napalm_mimosa import AsyncMimosaDriver
+from pysnmp.hlapi import EndOfMibView, Integer, OctetString
+from pysnmp.proto.rfc1902 import ObjectName
+from unittest import mock
+
+
+class MockAsyncAgent:
+    """Answers driver requests from an OID table and tracks concurrency."""
+
+    def __init__(self, table):
+        self.table = sorted(
+            (ObjectName(oid.lstrip(".")), value) for oid, value in table.items()
+        )
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _next(self, name):
+        for oid, value in self.table:
+            if oid > name:
+                return oid, value
+        return name, EndOfMibView()
+
+    async def request(self, kind, *var_binds, **options):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        if kind == "get":
+            values = dict(self.table)
+            return 0, [[(name, values[name]) for name, _ in var_binds]]
+
+        if kind == "bulk":
+            var_binds = var_binds[2:]
+        names = [name for name, _ in var_binds]
+        rows = []
+        for _ in range(10):
+            rows.append([self._next(name) for name in names])
+            names = [name for name, _ in rows[-1]]
+        return 0, rows
+
+
+class TestAsyncMimosaDriver(unittest.TestCase):
+    def test_get_wireless_settings_concurrent(self):
+        table = {
+            ".1.3.6.1.4.1.43356.2.1.2.1.6.0": OctetString("unlock"),
+            ".1.3.6.1.4.1.43356.2.1.2.1.9.0": OctetString("United States"),
+            ".1.3.6.1.4.1.43356.2.1.2.9.2.1.0": Integer(2),
+            ".1.3.6.1.4.1.43356.2.1.2.9.3.1.0": Integer(2),
+            ".1.3.6.1.4.1.43356.2.1.2.9.1.1.1.1.1": Integer(1),
+            ".1.3.6.1.4.1.43356.2.1.2.9.1.1.1.2.1": OctetString("ssid1"),
+            ".1.3.6.1.4.1.43356.2.1.2.9.1.1.1.3.1": Integer(0),
+            ".1.3.6.1.4.1.43356.2.1.2.9.3.3.1.1.1": Integer(1),
+            ".1.3.6.1.4.1.43356.2.1.2.9.3.3.1.2.1": OctetString("MIMOSA-5Ghz-1"),
+        }
+        agent = MockAsyncAgent(table)
+        driver = AsyncMimosaDriver("community", "a_series", "hostname")
+
+        with mock.patch.object(driver, "_snmp_request", agent.request):
+            result = asyncio.run(driver.get_wireless_settings())
+
+        self.assertEqual(agent.max_in_flight, 3)
+        self.assertEqual(result["mimosa_wireless_mode"], "wifiinterop")
+        self.assertEqual(
+            result["ssid_table"],
+            {"1": {"mimosaPtmpSsidName": "ssid1", "mimosaPtmpSsidType": "hotspot"}},
+        )
+        self.assertEqual(
+            result["channel_power_table"],
+            {"1": {"mimosaPtmpChPwrRadioName": "MIMOSA-5Ghz-1"}},
+        )
+
+    def test_get_services_error_string(self):
+        async def request(kind, *var_binds, **options):
+            raise Exception("SNMP Error: No SNMP response received before timeout")
+
+        driver = AsyncMimosaDriver("community", "b_c_series", "hostname")
+
+        with mock.patch.object(driver, "_snmp_request", request):
+            result = asyncio.run(driver.get_services())
+
+        self.assertEqual(
+            result,
+            "Error getting services: "
+            "SNMP Error: No SNMP response received before timeout",
+        )
+
+    def test_open_uses_asyncio_hlapi(self):
+        hlapi = mock.Mock()
+        driver = AsyncMimosaDriver("community", "b_c_series", "hostname")
+
+        with mock.patch("napalm_mimosa.aio._import_hlapi", return_value=hlapi):
+            driver.open()
+
+        hlapi.SnmpEngine.assert_called_once()
+        hlapi.UdpTransportTarget.assert_called_once_with(
+            ("hostname", 161), timeout=1, retries=0
+        )
+        self.assertIs(driver._snmp_engine, hlapi.SnmpEngine.return_value)
+
+    def test_request_over_udp(self):
+        # Over the asyncio hlapi where it runs, the blocking one elsewhere
+        with SimulatedAgent(b_c_series_data()) as agent:
+            hostname, port = agent.addresses[0]
+
+            async def poll():
+                async with AsyncMimosaDriver(
+                    "public", "b_c_series", hostname, optional_args={"snmp_port": port}
+                ) as driver:
+                    return await driver.get_facts()
+
+            facts = asyncio.run(poll())
+            requests = agent.requests
+
+        self.assertEqual(facts["serial_number"], "1021234567")
+        self.assertEqual(
+            facts["interface_list"], ["Ethernet0", "Fiber_SFP", "Wireless0"]
+        )
+        self.assertEqual(requests, 2)
+
+    @mock.patch("napalm_mimosa.aio._import_hlapi", return_value=None)
+    def test_blocking_requests_over_udp(self, mock_import_hlapi):
+        events = []
+        with SimulatedAgent(b_c_series_data()) as agent:
+            hostname, port = agent.addresses[0]
+
+            async def poll():
+                async with AsyncMimosaDriver(
+                    "public",
+                    "b_c_series",
+                    hostname,
+                    optional_args={"snmp_port": port, "stats": events.append},
+                ) as driver:
+                    return await asyncio.gather(
+                        driver.get_facts(), driver.get_dns_servers()
+                    )
+
+            facts, dns_servers = asyncio.run(poll())
+
+        self.assertEqual(facts["serial_number"], "1021234567")
+        self.assertEqual(dns_servers["primary_dns_server"], "8.8.8.8")
+        # Requests sent from the threads are traced for the getter that made them
+        self.assertEqual(
+            sorted(event.getter for event in events),
+            ["get_dns_servers", "get_facts", "get_facts"],
+        )
+        self.assertTrue(all(event.bytes_received for event in events))
+
+if __name__ == "__main__":
+    unittest.main()
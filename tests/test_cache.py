@@ -0,0 +1,55 @@
+import unittest
+from napalm_mimosa.cache import SnmpCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSnmpCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = SnmpCache(max_entries=2, clock=self.clock)
+
+    def test_ttl_expiry(self):
+        self.cache.set(("host", "1.3.6.1"), "value", 10)
+
+        self.assertEqual(self.cache.get(("host", "1.3.6.1")), (True, "value"))
+        self.clock.now = 10
+        self.assertEqual(self.cache.get(("host", "1.3.6.1")), (False, None))
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.stats(), {"entries": 0, "hits": 1, "misses": 1})
+
+    def test_lru_eviction(self):
+        self.cache.set(("host", "1"), "a", 10)
+        self.cache.set(("host", "2"), "b", 10)
+        self.cache.get(("host", "1"))
+        self.cache.set(("host", "3"), "c", 10)
+
+        self.assertEqual(self.cache.get(("host", "1")), (True, "a"))
+        self.assertEqual(self.cache.get(("host", "2")), (False, None))
+
+    def test_invalidate(self):
+        cache = SnmpCache(clock=self.clock)
+        cache.set(("host1", "1"), "a", 10, "static")
+        cache.set(("host1", "2"), "b", 10, "config")
+        cache.set(("host2", "1"), "c", 10, "config")
+
+        cache.invalidate("host1", "config")
+        self.assertEqual(cache.get(("host1", "1")), (True, "a"))
+        self.assertEqual(cache.get(("host1", "2")), (False, None))
+
+        cache.invalidate("host1")
+        self.assertEqual(cache.get(("host1", "1")), (False, None))
+        self.assertEqual(cache.get(("host2", "1")), (True, "c"))
+
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import json
+import os
+import unittest
+from benchmarks.agent import SimulatedAgent, b_c_series_data
+from napalm_mimosa.aio import AsyncMimosaDriver
+from napalm_mimosa.collector import collect, collect_lines, encode_result
+from napalm_mimosa.errors import PartialResult, SnmpTimeoutError
+from napalm_mimosa.fleet import FleetResult
+from unittest import mock
+
+
+async def fake_get_facts(self):
+    if self.hostname == "dead":
+        raise Exception("SNMP Error: No SNMP response received before timeout")
+    return {"hostname": self.hostname, "pid": os.getpid(), "serial": b"\x01\xff"}
+
+
+# Forked workers inherit the patches
+@mock.patch.object(AsyncMimosaDriver, "get_facts", fake_get_facts)
+@mock.patch("napalm_mimosa.aio._import_hlapi")
+@mock.patch("napalm_mimosa.fleet._import_hlapi")
+class TestCollector(unittest.TestCase):
+    def test_hosts_sharded_across_workers(self, fleet_hlapi, driver_hlapi):
+        hosts = [f"radio-{n}" for n in range(6)] + ["dead"]
+        results = list(
+            collect(
+                hosts,
+                workers=3,
+                concurrency=2,
+                mp_context="fork",
+                snmp_community="community",
+                radio_type="b_c_series",
+            )
+        )
+
+        self.assertEqual(sorted(r.hostname for r in results), sorted(hosts))
+        by_host = {r.hostname: r for r in results}
+        self.assertEqual(
+            by_host["dead"].error,
+            "SNMP Error: No SNMP response received before timeout",
+        )
+        facts = by_host["radio-0"].results["get_facts"]
+        self.assertEqual(facts["serial"], "01ff")
+        # host i is polled by worker i % 3, each in its own process
+        pids = {
+            r.hostname: r.results["get_facts"]["pid"] for r in results if not r.error
+        }
+        self.assertEqual(pids["radio-0"], pids["radio-3"])
+        self.assertEqual(len(set(pids.values()) | {os.getpid()}), 4)
+
+    def test_lines_are_compact_json(self, fleet_hlapi, driver_hlapi):
+        lines = list(
+            collect_lines(
+                ["radio-0"],
+                workers=4,
+                mp_context="fork",
+                snmp_community="community",
+                radio_type="a_series",
+            )
+        )
+
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].endswith(b"\n"))
+        self.assertNotIn(b" ", lines[0])
+        self.assertEqual(json.loads(lines[0])["hostname"], "radio-0")
+
+
+class TestCollectorOverUdp(unittest.TestCase):
+    def test_radios_polled_by_workers(self):
+        with SimulatedAgent(b_c_series_data(), ports=4) as agent:
+            hosts = [
+                {"hostname": hostname, "optional_args": {"snmp_port": port}}
+                for hostname, port in agent.addresses
+            ]
+            results = list(
+                collect(
+                    hosts,
+                    workers=2,
+                    mp_context="fork",
+                    snmp_community="public",
+                    radio_type="b_c_series",
+                )
+            )
+            requests = agent.requests
+
+        self.assertEqual(len(results), 4)
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertEqual(
+                result.results["get_facts"]["serial_number"], "1021234567"
+            )
+        self.assertEqual(requests, 8)
+
+
+class TestEncodeResult(unittest.TestCase):
+    def test_round_trip(self):
+        line = encode_result(FleetResult("radio", {"get_facts": {}}, None, 0.25))
+        self.assertEqual(
+            line, b'{"hostname":"radio","results":{"get_facts":{}},'
+            b'"error":null,"elapsed":0.25}\n'
+        )
+
+    def test_partial_result(self):
+        partial = PartialResult(
+            {"uptime": "1"}, {"hostname": SnmpTimeoutError("SNMP Error", [".1"])}
+        )
+        line = encode_result(FleetResult("radio", {"get_facts": partial}, None, 0))
+        self.assertEqual(
+            json.loads(line)["results"]["get_facts"],
+            {
+                "result": {"uptime": "1"},
+                "errors": {
+                    "hostname": {
+                        "type": "SnmpTimeoutError",
+                        "message": "SNMP Error",
+                        "oids": [".1"],
+                    }
+                },
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
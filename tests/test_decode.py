@@ -0,0 +1,37 @@
+import unittest
+from napalm_mimosa.decode import as_string, typed_value
+from pysnmp.proto import rfc1902, rfc1905
+
+
+class TestDecode(unittest.TestCase):
+    def test_typed_value(self):
+        self.assertEqual(typed_value(rfc1902.Integer(-3)), -3)
+        self.assertEqual(typed_value(rfc1902.Counter64(2**40)), 2**40)
+        self.assertEqual(typed_value(rfc1902.TimeTicks(53614393)), 53614393)
+        self.assertEqual(typed_value(rfc1902.IpAddress("10.1.2.3")), "10.1.2.3")
+        self.assertEqual(typed_value(rfc1902.OctetString("mimosa")), "mimosa")
+        self.assertEqual(
+            typed_value(rfc1902.OctetString(hexValue="0011223344ff")),
+            b"\x00\x11\x22\x33\x44\xff",
+        )
+        self.assertEqual(
+            typed_value(rfc1902.ObjectIdentifier("1.3.6.1.4.1.43356.1.1.3")),
+            "1.3.6.1.4.1.43356.1.1.3",
+        )
+
+    def test_matches_pretty_print(self):
+        for value in (
+            rfc1902.Integer(7),
+            rfc1902.Gauge32(1000000000),
+            rfc1902.IpAddress("255.255.255.0"),
+            rfc1902.OctetString("United States"),
+            rfc1902.OctetString(hexValue="001122334401"),
+            rfc1902.OctetString(""),
+            rfc1905.NoSuchObject(),
+            rfc1905.EndOfMibView(),
+        ):
+            self.assertEqual(as_string(typed_value(value)), value.prettyPrint())
+
+
+if __name__ == "__main__":
+    unittest.main()
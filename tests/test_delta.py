@@ -0,0 +1,77 @@
+import unittest
+from napalm_mimosa.delta import DeltaStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDeltaStore(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.store = DeltaStore(clock=self.clock)
+
+    def test_first_update_reports_every_field(self):
+        changes = self.store.update("host", "get_services", {"https_status": "enabled"})
+
+        self.assertEqual(
+            changes,
+            {"https_status": {"old": None, "new": "enabled", "timestamp": 0.0}},
+        )
+
+    def test_only_changed_fields(self):
+        self.store.update(
+            "host",
+            "get_wireless_settings",
+            {"wan_ssid": "mimosa", "ssid_table": {"1": {"name": "a", "band": 5}}},
+        )
+        self.clock.now = 60.0
+
+        self.assertEqual(
+            self.store.update(
+                "host",
+                "get_wireless_settings",
+                {"wan_ssid": "mimosa", "ssid_table": {"1": {"name": "b", "band": 5}}},
+            ),
+            {"ssid_table": {"1": {"name": {"old": "a", "new": "b", "timestamp": 60.0}}}},
+        )
+        self.assertEqual(
+            self.store.update(
+                "host",
+                "get_wireless_settings",
+                {"wan_ssid": "mimosa", "ssid_table": {"1": {"name": "b", "band": 5}}},
+            ),
+            {},
+        )
+
+    def test_removed_fields(self):
+        self.store.update("host", "get_services", {"a": 1, "b": [1, 2]})
+
+        self.assertEqual(
+            self.store.update("host", "get_services", {"b": [1, 3]}),
+            {
+                "b": {"old": [1, 2], "new": [1, 3], "timestamp": 0.0},
+                "a": {"old": 1, "new": None, "timestamp": 0.0},
+            },
+        )
+
+    def test_forget(self):
+        self.store.update("host1", "get_services", {"a": 1})
+        self.store.update("host1", "get_facts", {"a": 1})
+        self.store.update("host2", "get_services", {"a": 1})
+
+        self.store.forget("host1", "get_services")
+        self.assertEqual(len(self.store), 2)
+        self.assertTrue(self.store.update("host1", "get_services", {"a": 1}))
+        self.assertFalse(self.store.update("host2", "get_services", {"a": 1}))
+
+        self.store.forget()
+        self.assertEqual(len(self.store), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from napalm_mimosa.errors import (
+    NoSuchObjectError,
+    PartialResult,
+    SnmpAuthError,
+    SnmpError,
+    SnmpTimeoutError,
+    indication_error,
+    status_error,
+)
+from napalm_mimosa.retry import CircuitOpenError
+from pysnmp.proto import errind
+from pysnmp.proto.rfc1905 import errorStatus as ErrorStatus
+
+
+class TestErrors(unittest.TestCase):
+    def test_indication_error(self):
+        error = indication_error(errind.requestTimedOut, [".1.3.6.1.2.1.1.3.0"])
+        self.assertIsInstance(error, SnmpTimeoutError)
+        self.assertEqual(str(error), f"SNMP Error: {errind.requestTimedOut}")
+        self.assertEqual(error.oids, (".1.3.6.1.2.1.1.3.0",))
+
+        self.assertIsInstance(indication_error(errind.wrongDigest), SnmpAuthError)
+        self.assertIsInstance(indication_error(errind.unknownUserName), SnmpAuthError)
+        error = indication_error(errind.emptyResponse)
+        self.assertIs(type(error), SnmpError)
+        self.assertIsInstance(CircuitOpenError("SNMP Error"), SnmpTimeoutError)
+
+    def test_status_error(self):
+        error = status_error(ErrorStatus.clone(2), [".1.3.6.1.2.1.1.3.0"])
+        self.assertIsInstance(error, NoSuchObjectError)
+        self.assertEqual(str(error), "SNMP Error: noSuchName")
+        self.assertIsInstance(status_error(ErrorStatus.clone(16)), SnmpAuthError)
+        self.assertIs(type(status_error(ErrorStatus.clone(5))), SnmpError)
+
+    def test_missing_oids(self):
+        result = PartialResult(
+            {"uptime": "1"},
+            {
+                "hostname": SnmpTimeoutError("", [".1", ".2"]),
+                "serial_number": SnmpTimeoutError("", [".1", ".2"]),
+                "os_version": NoSuchObjectError("", [".3"]),
+            },
+        )
+        self.assertEqual(result.missing_oids, [".1", ".2", ".3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
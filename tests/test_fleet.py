@@ -0,0 +1,85 @@
+import asyncio
+import unittest
+from benchmarks.agent import SimulatedAgent, b_c_series_data
+from napalm_mimosa.aio import AsyncMimosaDriver
+from napalm_mimosa.fleet import poll_fleet, poll_fleet_sync
+from unittest import mock
+
+DELAYS = {"fast": 0.01, "slow": 0.05, "dead": 10}
+
+
+async def fake_get_facts(self):
+    await asyncio.sleep(DELAYS[self.hostname])
+    return {"hostname": self.hostname, "engine": self.optional_args["snmp_engine"]}
+
+
+@mock.patch.object(AsyncMimosaDriver, "get_facts", fake_get_facts)
+@mock.patch("napalm_mimosa.aio._import_hlapi")
+@mock.patch("napalm_mimosa.fleet._import_hlapi")
+class TestPollFleet(unittest.TestCase):
+    def test_results_stream_in_completion_order(self, fleet_hlapi, driver_hlapi):
+        results = list(
+            poll_fleet_sync(
+                ["slow", "dead", "fast"],
+                concurrency=3,
+                deadline=0.2,
+                snmp_community="community",
+                radio_type="b_c_series",
+            )
+        )
+
+        self.assertEqual([r.hostname for r in results], ["fast", "slow", "dead"])
+        self.assertIsNone(results[0].error)
+        self.assertEqual(results[2].error, "Deadline of 0.2s exceeded")
+        self.assertEqual(results[2].results, {})
+
+        engine = fleet_hlapi.return_value.SnmpEngine.return_value
+        for result in results[:2]:
+            self.assertIs(result.results["get_facts"]["engine"], engine)
+        engine.transportDispatcher.closeDispatcher.assert_called_once()
+
+    def test_concurrency_bounds_hosts_in_flight(self, fleet_hlapi, driver_hlapi):
+        async def collect():
+            return [
+                result
+                async for result in poll_fleet(
+                    [{"hostname": "slow"}, {"hostname": "fast"}],
+                    concurrency=1,
+                    snmp_community="community",
+                    radio_type="a_series",
+                )
+            ]
+
+        results = asyncio.run(collect())
+
+        # with a single worker the hosts complete in input order
+        self.assertEqual([r.hostname for r in results], ["slow", "fast"])
+
+
+class TestPollFleetOverUdp(unittest.TestCase):
+    def test_radios_polled(self):
+        with SimulatedAgent(b_c_series_data(), ports=3) as agent:
+            hosts = [
+                {"hostname": hostname, "optional_args": {"snmp_port": port}}
+                for hostname, port in agent.addresses
+            ]
+            results = list(
+                poll_fleet_sync(
+                    hosts,
+                    getters=("get_facts", "get_dns_servers"),
+                    snmp_community="public",
+                    radio_type="b_c_series",
+                )
+            )
+
+        self.assertEqual(len(results), 3)
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertEqual(result.results["get_facts"]["serial_number"], "1021234567")
+            self.assertEqual(
+                result.results["get_dns_servers"]["primary_dns_server"], "8.8.8.8"
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
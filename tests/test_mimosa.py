@@ -1,11 +1,72 @@
 import unittest
+from benchmarks.agent import SimulatedAgent, a_series_data, b_c_series_data
 from napalm_mimosa import MimosaDriver
+from pysnmp.hlapi import (
+    Counter32,
+    Counter64,
+    EndOfMibView,
+    Gauge32,
+    Integer,
+    ObjectIdentifier,
+    OctetString,
+    usmKeyTypeLocalized,
+    usmKeyTypePassphrase,
+)
+from pysnmp.proto.errind import requestTimedOut
+from pysnmp.proto.rfc1902 import ObjectName
+from pysnmp.proto.rfc1905 import NoSuchObject
+from napalm_mimosa import models, usm
+from napalm_mimosa.delta import DeltaStore
+from napalm_mimosa.errors import (
+    NoSuchObjectError,
+    PartialResult,
+    SnmpDecodeError,
+    SnmpError,
+    SnmpTimeoutError,
+)
+from napalm_mimosa.retry import CircuitBreaker, RttEstimator
 from unittest import mock
 
 
 class MockSnmpResponse:
+    def __init__(self, value="mocked_result"):
+        self.value = value
+
     def prettyPrint(self):
-        return "mocked_result"
+        return self.value
+
+
+class MockErrorStatus(int):
+    def prettyPrint(self):
+        return {1: "tooBig", 2: "noSuchName"}.get(int(self), str(int(self)))
+
+
+class MockAgentTable:
+    """Answers GETNEXT/GETBULK requests from a sorted OID table."""
+
+    def __init__(self, table):
+        self.table = sorted((ObjectName(oid), value) for oid, value in table.items())
+        self.pdus = 0
+
+    def _next(self, name):
+        for oid, value in self.table:
+            if oid > name:
+                return oid, value
+        return name, EndOfMibView()
+
+    def next_cmd(self, engine, auth, transport, context, *var_binds, **kwargs):
+        self.pdus += 1
+        yield None, 0, 0, [self._next(name) for name, _ in var_binds]
+
+    def bulk_cmd(
+        self, engine, auth, transport, context, non_repeaters, max_rep, *var_binds, **kwargs
+    ):
+        self.pdus += 1
+        names = [name for name, _ in var_binds]
+        for _ in range(max_rep):
+            row = [self._next(name) for name in names]
+            names = [name for name, _ in row]
+            yield None, 0, 0, row
 
 
 class TestMimosaDriver(unittest.TestCase):
@@ -23,7 +84,6 @@ class TestMimosaDriver(unittest.TestCase):
     @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
     @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
     def test_snmp_get(self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd):
-        mock_udp_transport_target.return_value = "mocked_transport_target"
         mock_getCmd.return_value = iter(
             [(None, None, None, [("", MockSnmpResponse())])]
         )
@@ -33,10 +93,1054 @@ class TestMimosaDriver(unittest.TestCase):
         result = driver._snmp_get(expected_oid)
 
         self.assertEqual(result, "mocked_result")
-        mock_udp_transport_target.assert_called_once_with(("hostname", 161))
+        mock_udp_transport_target.assert_called_once_with(
+            ("hostname", 161), timeout=1, retries=0
+        )
         mock_getCmd.assert_called_once()
         mock_snmp_engine.assert_called_once()
 
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_snmp_port(self, mock_snmp_engine, mock_udp_transport_target):
+        driver = MimosaDriver(
+            "community", "a_series", "hostname", optional_args={"snmp_port": 16101}
+        )
+        driver.open()
+
+        mock_udp_transport_target.assert_called_once_with(
+            ("hostname", 16101), timeout=1, retries=0
+        )
+        # Radios NAT'd behind one address keep their state apart
+        self.assertEqual(driver.radio_address, "hostname:16101")
+        default = MimosaDriver("community", "a_series", "hostname")
+        self.assertEqual(default.radio_address, "hostname")
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_snmp_session_reused(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        mock_getCmd.side_effect = lambda *args, **kwargs: iter(
+            [(None, None, None, [("", MockSnmpResponse())])]
+        )
+        driver = MimosaDriver("community", "a_series", "hostname")
+        driver.open()
+
+        driver._snmp_get(".1.3.6.1.4.1.43356.2.1.2.1.6.0")
+        driver._snmp_get(".1.3.6.1.4.1.43356.2.1.2.1.9.0")
+
+        self.assertEqual(mock_getCmd.call_count, 2)
+        mock_snmp_engine.assert_called_once()
+        mock_udp_transport_target.assert_called_once_with(
+            ("hostname", 161), timeout=1, retries=0
+        )
+
+        driver.close()
+        self.assertIsNone(driver._snmp_engine)
+        mock_snmp_engine.return_value.transportDispatcher.closeDispatcher.assert_called_once()
+
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_shared_engine(self, mock_snmp_engine, mock_udp_transport_target):
+        mock_snmp_engine.side_effect = lambda: mock.Mock()
+        with mock.patch("napalm_mimosa.mimosa._shared_snmp_engine", None):
+            first = MimosaDriver(
+                "community", "a_series", "host1", optional_args={"shared_engine": True}
+            )
+            second = MimosaDriver(
+                "community", "a_series", "host2", optional_args={"shared_engine": True}
+            )
+            first.open()
+            second.open()
+
+            self.assertIs(first._snmp_engine, second._snmp_engine)
+            mock_snmp_engine.assert_called_once()
+            first.close()
+            second.close()
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_snmp_get_many_single_pdu(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        def get_cmd(engine, auth, transport, context, *object_types, **kwargs):
+            var_binds = [
+                ("", MockSnmpResponse(f"value{i}")) for i in range(len(object_types))
+            ]
+            return iter([(None, 0, 0, var_binds)])
+
+        mock_getCmd.side_effect = get_cmd
+        driver = MimosaDriver("community", "b_c_series", "hostname")
+
+        result = driver.get_wireless_settings()
+
+        mock_getCmd.assert_called_once()
+        self.assertEqual(len(mock_getCmd.call_args[0]), 4 + 12)
+        self.assertEqual(result["unlock_code"], "value0")
+        self.assertEqual(result["local_channel"], "value11")
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_snmp_get_many_splits_too_big(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        def get_cmd(engine, auth, transport, context, *object_types, **kwargs):
+            if len(object_types) > 2:
+                return iter([(None, MockErrorStatus(1), 0, [])])
+            var_binds = [("", MockSnmpResponse("ok")) for _ in object_types]
+            return iter([(None, 0, 0, var_binds)])
+
+        mock_getCmd.side_effect = get_cmd
+        driver = MimosaDriver("community", "b_c_series", "hostname")
+        oids = [f".1.3.6.1.4.1.43356.2.1.2.1.{i}.0" for i in range(1, 6)]
+
+        result = driver._snmp_get_many(oids)
+
+        self.assertEqual(list(result), oids)
+        self.assertEqual(set(result.values()), {"ok"})
+        self.assertLessEqual(driver._max_oids_per_request, 2)
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_cache_skips_slow_changing_oids(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        def get_cmd(engine, auth, transport, context, *object_types, **kwargs):
+            var_binds = [
+                (name, MockSnmpResponse(str(name))) for name, _ in object_types
+            ]
+            return iter([(None, 0, 0, var_binds)])
+
+        mock_getCmd.side_effect = get_cmd
+        driver = MimosaDriver(
+            "community", "b_c_series", "hostname", optional_args={"cache": True}
+        )
+
+        first = driver.get_wireless_settings()
+        second = driver.get_wireless_settings()
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_getCmd.call_count, 2)
+        # Only the operational WAN status is fetched again
+        self.assertEqual(len(mock_getCmd.call_args[0]), 4 + 1)
+
+        driver.invalidate_cache("config")
+        driver.get_wireless_settings()
+        self.assertEqual(len(mock_getCmd.call_args[0]), 4 + 10)
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_invalidate_operational_cache(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        def get_cmd(engine, auth, transport, context, *object_types, **kwargs):
+            var_binds = [
+                (name, MockSnmpResponse(str(name))) for name, _ in object_types
+            ]
+            return iter([(None, 0, 0, var_binds)])
+
+        mock_getCmd.side_effect = get_cmd
+        driver = MimosaDriver(
+            "community",
+            "b_c_series",
+            "hostname",
+            optional_args={"cache": True, "cache_ttl": {"operational": 60}},
+        )
+
+        driver.get_wireless_settings()
+        driver.get_wireless_settings()
+        self.assertEqual(mock_getCmd.call_count, 1)
+
+        # Only the operational WAN status is fetched again
+        driver.invalidate_cache("operational")
+        driver.get_wireless_settings()
+        self.assertEqual(mock_getCmd.call_count, 2)
+        self.assertEqual(len(mock_getCmd.call_args[0]), 4 + 1)
+
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_snmp_walk_uses_getbulk(self, mock_snmp_engine, mock_udp_transport_target):
+        agent = MockAgentTable(
+            {
+                f"1.3.6.1.2.1.2.2.1.2.{index}": OctetString(f"eth{index}")
+                for index in range(1, 8)
+            }
+        )
+        driver = MimosaDriver(
+            "community", "a_series", "hostname", optional_args={"max_repetitions": 5}
+        )
+
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd", agent.bulk_cmd):
+            result = driver._snmp_get_multiple_with_index("1.3.6.1.2.1.2.2.1.2")
+
+        self.assertEqual(result, [(str(i), f"eth{i}") for i in range(1, 8)])
+        self.assertEqual(agent.pdus, 2)
+
+    @mock.patch("napalm_mimosa.mimosa.bulkCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_snmp_walk_v1_uses_getnext(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_bulkCmd
+    ):
+        agent = MockAgentTable(
+            {
+                "1.3.6.1.2.1.2.2.1.2.1": OctetString("eth0"),
+                "1.3.6.1.2.1.2.2.1.2.2": OctetString("wifi0"),
+                "1.3.6.1.2.1.2.2.1.3.1": OctetString("outside"),
+            }
+        )
+        driver = MimosaDriver(
+            "community", "a_series", "hostname", optional_args={"snmp_version": "v1"}
+        )
+
+        with mock.patch("napalm_mimosa.mimosa.nextCmd", agent.next_cmd):
+            result = driver._snmp_get_multiple("1.3.6.1.2.1.2.2.1.2")
+
+        self.assertEqual(result, ["eth0", "wifi0"])
+        self.assertEqual(agent.pdus, 3)
+        mock_bulkCmd.assert_not_called()
+
+    def test_snmp_v1_agent(self):
+        with SimulatedAgent(a_series_data()) as agent:
+            hostname, port = agent.addresses[0]
+            results = {}
+            for version in ("v1", "v2c"):
+                driver = MimosaDriver(
+                    "public",
+                    "a_series",
+                    hostname,
+                    optional_args={"snmp_port": port, "snmp_version": version},
+                )
+                results[version] = (
+                    driver.get_wireless_settings(),
+                    driver.get_interfaces_counters(),
+                )
+                driver.close()
+
+        settings, counters = results["v1"]
+        # Objects missing from a v1 GET are read one by one, not failed
+        self.assertEqual(settings, results["v2c"][0])
+        self.assertEqual(
+            settings["unlock_code"], "No Such Object currently exists at this OID"
+        )
+        # SNMPv1 has no Counter64: the 32-bit counters are used instead
+        self.assertEqual(counters["Ethernet0"]["rx_octets"], 1010)
+        self.assertEqual(counters["Ethernet0"]["rx_multicast_packets"], -1)
+
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_get_interfaces_single_walk(
+        self, mock_snmp_engine, mock_udp_transport_target
+    ):
+        table = {}
+        for index, name in ((1, "eth1_emac1"), (2, "wifi0")):
+            table.update(
+                {
+                    f"1.3.6.1.2.1.2.2.1.2.{index}": OctetString(name),
+                    f"1.3.6.1.2.1.2.2.1.4.{index}": Integer(1500),
+                    f"1.3.6.1.2.1.2.2.1.5.{index}": Gauge32(1000000000),
+                    f"1.3.6.1.2.1.2.2.1.6.{index}": OctetString(
+                        hexValue=f"00112233440{index}"
+                    ),
+                    f"1.3.6.1.2.1.2.2.1.7.{index}": Integer(1),
+                    f"1.3.6.1.2.1.2.2.1.8.{index}": Integer(index),
+                }
+            )
+        agent = MockAgentTable(table)
+        driver = MimosaDriver(
+            "community", "b_c_series", "hostname", optional_args={"cache": True}
+        )
+
+        # The interface list is read from the ifDescr column cached by the walk
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd", agent.bulk_cmd):
+            interfaces = driver.get_interfaces()
+            interface_list = driver.get_interfaces_list()
+
+        self.assertEqual(agent.pdus, 1)
+        self.assertEqual(interface_list, ["Ethernet0", "Wireless0"])
+        self.assertEqual(
+            interfaces["Ethernet0"],
+            {
+                "is_up": True,
+                "is_enabled": True,
+                "description": "eth1_emac1",
+                "last_flapped": -1.0,
+                "speed": 1000.0,
+                "mtu": 1500,
+                "mac_address": "00:11:22:33:44:01",
+            },
+        )
+        self.assertFalse(interfaces["Wireless0"]["is_up"])
+
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_interface_list_follows_changes(
+        self, mock_snmp_engine, mock_udp_transport_target
+    ):
+        def descriptions(*names):
+            return MockAgentTable(
+                {
+                    f"1.3.6.1.2.1.2.2.1.2.{index}": OctetString(name)
+                    for index, name in enumerate(names, 1)
+                }
+            )
+
+        driver = MimosaDriver("community", "b_c_series", "hostname")
+        cached = MimosaDriver(
+            "community", "b_c_series", "hostname", optional_args={"cache": True}
+        )
+        with mock.patch(
+            "napalm_mimosa.mimosa.bulkCmd", descriptions("eth1_emac1").bulk_cmd
+        ):
+            driver.get_interfaces_list()
+            cached.get_interfaces_list()
+
+        with mock.patch(
+            "napalm_mimosa.mimosa.bulkCmd",
+            descriptions("eth1_emac1", "wifi0").bulk_cmd,
+        ):
+            self.assertEqual(driver.get_interfaces_list(), ["Ethernet0", "Wireless0"])
+            # Cached interface names last until their TTL or an invalidation
+            self.assertEqual(cached.get_interfaces_list(), ["Ethernet0"])
+            cached.invalidate_cache("static")
+            self.assertEqual(cached.get_interfaces_list(), ["Ethernet0", "Wireless0"])
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_typed_values(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        prefix = "1.3.6.1.4.1.43356.2.1.2."
+        values = {
+            prefix + "3.1.0": OctetString("mimosa064"),
+            prefix + "3.3.0": Integer(1),
+            prefix + "4.4.0": Integer(4),
+            prefix + "5.4.0": Integer(6),
+        }
+
+        def get_cmd(engine, auth, transport, context, *object_types, **kwargs):
+            var_binds = [
+                (name, values.get(str(name), Integer(0))) for name, _ in object_types
+            ]
+            return iter([(None, 0, 0, var_binds)])
+
+        mock_getCmd.side_effect = get_cmd
+
+        typed = MimosaDriver(
+            "community", "b_c_series", "hostname", optional_args={"typed_values": True}
+        ).get_wireless_settings()
+        driver = MimosaDriver("community", "b_c_series", "hostname")
+        text = driver.get_wireless_settings()
+
+        self.assertEqual(mock_getCmd.call_args[1]["lookupMib"], False)
+        self.assertEqual(typed["wan_ssid"], "mimosa064")
+        self.assertEqual(typed["wan_status"], "connected")
+        self.assertEqual(typed["tdma_window"], 4)
+        self.assertEqual(typed["local_channel"], 6)
+        self.assertEqual(text["wan_status"], "connected")
+        self.assertEqual(text["tdma_window"], "4")
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_typed_values_binary_scalar(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        oid = ".1.3.6.1.4.1.43356.2.1.2.1.3.0"
+        mock_getCmd.side_effect = lambda *args, **kwargs: iter(
+            [(None, 0, 0, [(ObjectName(oid[1:]), OctetString(b"\xff\x01"))])]
+        )
+
+        typed = MimosaDriver(
+            "community", "b_c_series", "hostname", optional_args={"typed_values": True}
+        )
+        text = MimosaDriver(
+            "community", "b_c_series", "hostname", optional_args={"errors": "raise"}
+        )
+
+        self.assertEqual(typed._snmp_get(oid), b"\xff\x01")
+        with self.assertRaises(SnmpDecodeError):
+            text._snmp_get(oid)
+
+    @staticmethod
+    def counters_table(octets, errors, interfaces=((1, "eth1_emac1"), (2, "wifi0"))):
+        table = {}
+        for index, name in interfaces:
+            table[f"1.3.6.1.2.1.2.2.1.2.{index}"] = OctetString(name)
+            for column in range(6, 14):
+                table[f"1.3.6.1.2.1.31.1.1.1.{column}.{index}"] = Counter64(
+                    octets + 100 * index + column
+                )
+            for column in (13, 14, 19, 20):
+                table[f"1.3.6.1.2.1.2.2.1.{column}.{index}"] = Counter32(errors)
+        return MockAgentTable(table)
+
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_get_interfaces_counters(self, mock_snmp_engine, mock_udp_transport_target):
+        agent = self.counters_table(2**40, 3)
+        driver = MimosaDriver("community", "b_c_series", "hostname")
+
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd", agent.bulk_cmd):
+            counters = driver.get_interfaces_counters()
+
+        self.assertEqual(agent.pdus, 1)
+        self.assertEqual(list(counters), ["Ethernet0", "Wireless0"])
+        self.assertEqual(counters["Ethernet0"]["rx_octets"], 2**40 + 106)
+        self.assertEqual(counters["Wireless0"]["tx_broadcast_packets"], 2**40 + 213)
+        self.assertEqual(counters["Wireless0"]["tx_errors"], 3)
+
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_counters_follow_interface_changes(
+        self, mock_snmp_engine, mock_udp_transport_target
+    ):
+        driver = MimosaDriver("community", "b_c_series", "hostname")
+
+        agent = self.counters_table(2**40, 3)
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd", agent.bulk_cmd):
+            driver.get_interfaces_counters()
+
+        # The SFP port came up and the wireless interface went away
+        agent = self.counters_table(
+            2**40, 3, interfaces=((1, "eth1_emac1"), (3, "eth1_emac2"))
+        )
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd", agent.bulk_cmd):
+            counters = driver.get_interfaces_counters()
+
+        self.assertEqual(list(counters), ["Ethernet0", "Fiber_SFP"])
+        self.assertEqual(counters["Fiber_SFP"]["rx_octets"], 2**40 + 306)
+        self.assertEqual(agent.pdus, 1)
+
+    @mock.patch("napalm_mimosa.mimosa.time.monotonic")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_get_interfaces_counter_rates(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_monotonic
+    ):
+        driver = MimosaDriver(
+            "community", "b_c_series", "hostname", optional_args={"counter_rates": True}
+        )
+
+        mock_monotonic.return_value = 100.0
+        agent = self.counters_table(2**64 - 1000, 2**32 - 10)
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd", agent.bulk_cmd):
+            self.assertEqual(driver.get_interfaces_counters(), {})
+
+        mock_monotonic.return_value = 110.0
+        agent = self.counters_table(9000, 20)
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd", agent.bulk_cmd):
+            rates = driver.get_interfaces_counters()
+
+        # Both the 64-bit octet and the 32-bit error counters wrapped
+        self.assertEqual(rates["Ethernet0"]["rx_octets"], 1000.0)
+        self.assertEqual(rates["Ethernet0"]["rx_errors"], 3.0)
+        self.assertEqual(agent.pdus, 1)
+
+    @mock.patch("napalm_mimosa.mimosa.time.monotonic")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_counter_rates_after_reset(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_monotonic
+    ):
+        driver = MimosaDriver(
+            "community", "b_c_series", "hostname", optional_args={"counter_rates": True}
+        )
+
+        mock_monotonic.return_value = 100.0
+        agent = self.counters_table(2**40, 2**31)
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd", agent.bulk_cmd):
+            driver.get_interfaces_counters()
+
+        # The radio rebooted: its counters restarted from zero
+        mock_monotonic.return_value = 130.0
+        agent = self.counters_table(5000, 20)
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd", agent.bulk_cmd):
+            rates = driver.get_interfaces_counters()
+        self.assertIsNone(rates["Ethernet0"]["rx_octets"])
+        self.assertIsNone(rates["Ethernet0"]["rx_errors"])
+
+        # The next rates are taken from the new counters
+        mock_monotonic.return_value = 140.0
+        agent = self.counters_table(15000, 30)
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd", agent.bulk_cmd):
+            rates = driver.get_interfaces_counters()
+        self.assertEqual(rates["Ethernet0"]["rx_octets"], 1000.0)
+        self.assertEqual(rates["Ethernet0"]["rx_errors"], 1.0)
+
+    @mock.patch("napalm_mimosa.mimosa.time.monotonic")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_counter_rates_without_elapsed_time(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_monotonic
+    ):
+        driver = MimosaDriver(
+            "community", "b_c_series", "hostname", optional_args={"counter_rates": True}
+        )
+        mock_monotonic.return_value = 100.0
+        agent = self.counters_table(9000, 20)
+
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd", agent.bulk_cmd):
+            driver.get_interfaces_counters()
+            rates = driver.get_interfaces_counters()
+
+        self.assertIsNone(rates["Ethernet0"]["rx_octets"])
+        self.assertIsNone(rates["Wireless0"]["tx_errors"])
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_snmp_request_retries_timeouts(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        timeouts = []
+
+        def get_cmd(engine, auth, transport, context, *object_types, **kwargs):
+            timeouts.append(transport.timeout)
+            if len(timeouts) < 3:
+                return iter([(requestTimedOut, 0, 0, [])])
+            return iter([(None, 0, 0, [("", MockSnmpResponse())])])
+
+        mock_getCmd.side_effect = get_cmd
+        estimator = RttEstimator(initial_timeout=0.5)
+        driver = MimosaDriver(
+            "community",
+            "a_series",
+            "hostname",
+            optional_args={"adaptive_timeout": estimator, "snmp_retries": 2},
+        )
+
+        result = driver._snmp_get(".1.3.6.1.4.1.43356.2.1.2.1.6.0")
+
+        self.assertEqual(result, "mocked_result")
+        self.assertEqual(timeouts, [0.5, 1.0, 2.0])
+        # The answer to a retried request is not used as an RTT sample
+        self.assertIsNone(estimator.srtt)
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_circuit_breaker_fails_fast(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        mock_getCmd.side_effect = lambda *args, **kwargs: iter(
+            [(requestTimedOut, 0, 0, [])]
+        )
+        driver = MimosaDriver(
+            "community",
+            "b_c_series",
+            "hostname",
+            optional_args={
+                "circuit_breaker": CircuitBreaker(failure_threshold=2),
+                "snmp_retries": 1,
+            },
+        )
+
+        for _ in range(2):
+            self.assertIn("timeout", driver.get_dns_servers())
+
+        self.assertEqual(mock_getCmd.call_count, 4)
+        self.assertIn("not responding", driver.get_dns_servers())
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_raise_errors(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        mock_getCmd.side_effect = lambda *args, **kwargs: iter(
+            [(requestTimedOut, 0, 0, [])]
+        )
+        driver = MimosaDriver(
+            "community",
+            "b_c_series",
+            "hostname",
+            optional_args={
+                "errors": "raise",
+                "snmp_retries": 0,
+                "circuit_breaker": CircuitBreaker(failure_threshold=1),
+            },
+        )
+
+        with self.assertRaises(SnmpTimeoutError) as raised:
+            driver.get_dns_servers()
+        self.assertEqual(len(raised.exception.oids), 2)
+        # An open circuit is reported as a timeout too
+        with self.assertRaises(SnmpTimeoutError):
+            driver.get_dns_servers()
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_partial_results(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        wan_ssid = MimosaDriver.b_c_series_OIDs["wan_ssid"]
+        local_channel = MimosaDriver.b_c_series_OIDs["local_channel"]
+        requests = []
+
+        def get_cmd(engine, auth, transport, context, *object_types, **kwargs):
+            names = ["." + str(name) for name, _ in object_types]
+            requests.append(len(names))
+            if wan_ssid in names:
+                return iter([(None, MockErrorStatus(5), 0, [])])  # genErr
+            var_binds = [
+                (name, MockSnmpResponse()) if name != local_channel
+                else (name, NoSuchObject())
+                for name in names
+            ]
+            return iter([(None, 0, 0, var_binds)])
+
+        mock_getCmd.side_effect = get_cmd
+        driver = MimosaDriver(
+            "community", "b_c_series", "hostname", optional_args={"errors": "partial"}
+        )
+
+        result = driver.get_wireless_settings()
+
+        self.assertIsInstance(result, PartialResult)
+        self.assertEqual(set(result.errors), {"wan_ssid", "local_channel"})
+        self.assertIsInstance(result.errors["wan_ssid"], SnmpError)
+        self.assertIsInstance(result.errors["local_channel"], NoSuchObjectError)
+        self.assertEqual(result.missing_oids, [wan_ssid, local_channel])
+        self.assertNotIn("wan_ssid", result.result)
+        self.assertNotIn("local_channel", result.result)
+        self.assertEqual(result.result["unlock_code"], "mocked_result")
+        self.assertEqual(len(result.result), 10)
+        # The failed request is split until the OID at fault is found
+        self.assertEqual(requests[0], 12)
+        self.assertIn(1, requests)
+
+        # A getter that read nothing reports the error under its name
+        mock_getCmd.side_effect = lambda *args, **kwargs: iter(
+            [(requestTimedOut, 0, 0, [])]
+        )
+        driver = MimosaDriver(
+            "community",
+            "auto",
+            "undetected-host",
+            optional_args={"errors": "partial", "snmp_retries": 0},
+        )
+        result = driver.get_wireless_settings()
+        self.assertIsNone(result.result)
+        self.assertEqual(list(result.errors), ["get_wireless_settings"])
+        self.assertIsInstance(
+            result.errors["get_wireless_settings"], SnmpTimeoutError
+        )
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_stats_events(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        answers = iter(
+            [
+                (requestTimedOut, 0, 0, []),
+                (None, 0, 0, [("", MockSnmpResponse()), ("", MockSnmpResponse())]),
+            ]
+        )
+        mock_getCmd.side_effect = lambda *args, **kwargs: iter([next(answers)])
+        events = []
+        driver = MimosaDriver(
+            "community", "b_c_series", "hostname", optional_args={"stats": events.append}
+        )
+
+        driver.get_dns_servers()
+
+        self.assertEqual(len(events), 1)
+        event = events[0]
+        self.assertEqual(event.getter, "get_dns_servers")
+        self.assertEqual(
+            event.oids,
+            (
+                driver.OIDs["primary_dns_server"],
+                driver.OIDs["secondary_dns_server"],
+            ),
+        )
+        self.assertEqual((event.attempts, event.timeouts), (2, 1))
+        self.assertEqual((event.varbinds_sent, event.varbinds_received), (2, 2))
+        self.assertIsNone(event.error)
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_a_series_tables_decoded_by_column(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        ssid_entry = "1.3.6.1.4.1.43356.2.1.2.9.1.1.1."
+        channel_entry = "1.3.6.1.4.1.43356.2.1.2.9.3.3.1."
+        agent = MockAgentTable(
+            {
+                # The second SSID has no type column and a numeric name
+                ssid_entry + "1.1": Integer(1),
+                ssid_entry + "1.2": Integer(2),
+                ssid_entry + "2.1": OctetString("guest"),
+                ssid_entry + "2.2": OctetString("1"),
+                ssid_entry + "3.1": Integer(0),
+                ssid_entry + "4.1": Integer(1),
+                ssid_entry + "4.2": Integer(2),
+                channel_entry + "2.1": OctetString("MIMOSA-5Ghz-1"),
+                channel_entry + "11.1": Integer(1),
+                channel_entry + "12.1": Integer(-80),
+            }
+        )
+        mock_getCmd.return_value = iter(
+            [(None, 0, 0, [("", MockSnmpResponse("1")) for _ in range(4)])]
+        )
+        driver = MimosaDriver("community", "a_series", "hostname")
+
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd", agent.bulk_cmd):
+            settings = driver.get_wireless_settings()
+
+        self.assertEqual(
+            settings["ssid_table"],
+            {
+                "1": {
+                    "mimosaPtmpSsidName": "guest",
+                    "mimosaPtmpSsidType": "hotspot",
+                    "mimosaPtmpSsidEnabled": "true",
+                },
+                "2": {"mimosaPtmpSsidName": "1", "mimosaPtmpSsidEnabled": "false"},
+            },
+        )
+        self.assertEqual(
+            settings["channel_power_table"],
+            {
+                "1": {
+                    "mimosaPtmpChPwrRadioName": "MIMOSA-5Ghz-1",
+                    "mimosaPtmpChPwrAgcMode": "on",
+                    "mimosaPtmpChPwrMinRxPower": "-80",
+                }
+            },
+        )
+
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_wireless_performance(self, mock_snmp_engine, mock_udp_transport_target):
+        chain_entry = "1.3.6.1.4.1.43356.2.1.2.6.1.1."
+        stream_entry = "1.3.6.1.4.1.43356.2.1.2.6.2.1."
+        agent = MockAgentTable(
+            {
+                chain_entry + "3.1": Integer(-550),
+                chain_entry + "3.2": Integer(-550),
+                chain_entry + "5.1": Integer(352),
+                chain_entry + "5.2": Integer(348),
+                stream_entry + "2.1": Integer(433),
+                stream_entry + "2.2": Integer(433),
+                stream_entry + "6.1": Integer(8),
+            }
+        )
+        driver = MimosaDriver("community", "b_c_series", "hostname")
+
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd", agent.bulk_cmd):
+            performance = driver.get_wireless_performance()
+
+        # Both tables are read in a single GETBULK
+        self.assertEqual(agent.pdus, 1)
+        self.assertEqual(
+            performance,
+            {
+                "rssi": -52.0,
+                "tx_phy_rate": 866,
+                "rx_phy_rate": 0,
+                "chains": {
+                    "1": {"rx_power": -55.0, "snr": 35.2},
+                    "2": {"rx_power": -55.0, "snr": 34.8},
+                },
+                "streams": {
+                    "1": {"tx_phy_rate": 433, "rx_mcs": 8},
+                    "2": {"tx_phy_rate": 433},
+                },
+            },
+        )
+
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_wireless_performance_stations(
+        self, mock_snmp_engine, mock_udp_transport_target
+    ):
+        channel_entry = "1.3.6.1.4.1.43356.2.1.2.9.3.3.1."
+        station_entry = "1.3.6.1.4.1.43356.2.1.2.9.4.1.1."
+        agent = MockAgentTable(
+            {
+                channel_entry + "2.1": OctetString("MIMOSA-5Ghz-1"),
+                channel_entry + "10.1": Integer(24),
+                station_entry + "2.1": OctetString(hexValue="00112233445a"),
+                station_entry + "3.1": Integer(-612),
+                station_entry + "9.1": Counter64(2**40),
+            }
+        )
+        driver = MimosaDriver("community", "a_series", "hostname")
+
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd", agent.bulk_cmd):
+            performance = driver.get_wireless_performance()
+            with_stations = driver.get_wireless_performance(stations=True)
+
+        self.assertEqual(
+            performance, {"radios": {"1": {"name": "MIMOSA-5Ghz-1", "tx_power": 24}}}
+        )
+        self.assertEqual(
+            with_stations["stations"],
+            {"00:11:22:33:44:5a": {"rssi": -61.2, "tx_bytes": 2**40}},
+        )
+        self.assertEqual(agent.pdus, 2)
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_snapshot_mode(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        prefix = "1.3.6.1.4.1.43356.2.1.2."
+        agent = MockAgentTable(
+            {
+                prefix + "5.8.0": OctetString("10.10.10.5"),
+                prefix + "5.9.0": OctetString("255.255.255.0"),
+                prefix + "5.12.0": OctetString("8.8.8.8"),
+                prefix + "5.13.0": OctetString("8.8.4.4"),
+                prefix + "8.1.0": Integer(1),
+                prefix + "8.2.0": Integer(2),
+                prefix + "8.3.0": Integer(1),
+                prefix + "8.6.0": Integer(2),
+                "1.3.6.1.6.3.1.1.1.0": Integer(0),
+            }
+        )
+        driver = MimosaDriver(
+            "community", "b_c_series", "hostname", optional_args={"snapshot": True}
+        )
+
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd", agent.bulk_cmd):
+            dns_servers = driver.get_dns_servers()
+            services = driver.get_services()
+            interfaces_ip = driver.get_interfaces_ip()
+            snapshot = driver.get_snapshot()
+
+        mock_getCmd.assert_not_called()
+        self.assertEqual(agent.pdus, 2)
+        self.assertEqual(dns_servers["secondary_dns_server"], "8.8.4.4")
+        self.assertEqual(services["https_status"], "enabled")
+        self.assertEqual(
+            interfaces_ip["br_local"]["ipv4"], {"10.10.10.5": {"prefix_length": 24}}
+        )
+        self.assertEqual(len(snapshot), 8)
+        self.assertEqual(snapshot["." + prefix + "5.12.0"], "8.8.8.8")
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_delta_mode(self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd):
+        statuses = {"1.3.6.1.4.1.43356.2.1.2.8.1.0": "1"}
+
+        def get_cmd(engine, auth, transport, context, *object_types, **kwargs):
+            var_binds = [
+                ("", MockSnmpResponse(statuses.get(str(name), "2")))
+                for name, _ in object_types
+            ]
+            return iter([(None, 0, 0, var_binds)])
+
+        mock_getCmd.side_effect = get_cmd
+        store = DeltaStore()
+        driver = MimosaDriver(
+            "community", "b_c_series", "hostname", optional_args={"delta": store}
+        )
+
+        first = driver.get_services()
+        unchanged = driver.get_services()
+        statuses.clear()
+        changed = MimosaDriver(
+            "community", "b_c_series", "hostname", optional_args={"delta": store}
+        ).get_services()
+
+        self.assertEqual(first["https_status"]["new"], "enabled")
+        self.assertEqual(first["syslog_status"]["new"], "disabled")
+        self.assertEqual(unchanged, {})
+        self.assertEqual(list(changed), ["https_status"])
+        self.assertEqual(changed["https_status"]["old"], "enabled")
+        self.assertEqual(changed["https_status"]["new"], "disabled")
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_auto_series_detection(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        self.addCleanup(models.forget_models)
+        requested = []
+
+        def get_cmd(engine, auth, transport, context, *object_types, **kwargs):
+            requested.extend(str(name) for name, _ in object_types)
+            var_binds = [
+                (name, ObjectIdentifier("1.3.6.1.4.1.43356.1.1.99"))
+                if str(name) == "1.3.6.1.2.1.1.2.0"
+                else (name, Integer(1))
+                for name, _ in object_types
+            ]
+            return iter([(None, 0, 0, var_binds)])
+
+        mock_getCmd.side_effect = get_cmd
+        model = models.RadioModel(
+            "mimosaB99", "b_c_series", frozenset({"syslog_status"})
+        )
+
+        with mock.patch.dict(models.models):
+            models.register_model(".1.3.6.1.4.1.43356.1.1.99", model)
+            driver = MimosaDriver("community", "auto", "auto-host")
+            driver.open()
+            self.assertEqual(requested, ["1.3.6.1.2.1.1.2.0"])
+            self.assertEqual(driver.radio_type, "b_c_series")
+            self.assertIs(driver.model, model)
+
+            # The model is remembered for the host
+            services = MimosaDriver("community", "auto", "auto-host").get_services()
+
+        # The field the model lacks is not requested
+        self.assertEqual(len(requested), 1 + 3)
+        self.assertNotIn("1.3.6.1.4.1.43356.2.1.2.8.6.0", requested)
+        self.assertEqual(services["https_status"], "enabled")
+        self.assertEqual(services["syslog_status"], "unknown")
+
+    def test_unsupported_table_not_walked(self):
+        self.addCleanup(models.forget_models)
+        model = models.RadioModel(
+            "mimosaB5", "b_c_series", frozenset({"mimosa_stream_table"})
+        )
+
+        with SimulatedAgent(b_c_series_data()) as agent, mock.patch.dict(
+            models.models, {"1.3.6.1.4.1.43356.1.1.1": model}
+        ):
+            hostname, port = agent.addresses[0]
+            driver = MimosaDriver(
+                "public", "auto", hostname, optional_args={"snmp_port": port}
+            )
+            with mock.patch.object(driver, "_walk_plan", wraps=driver._walk_plan):
+                performance = driver.get_wireless_performance()
+                (walk,) = driver._walk_plan.call_args_list
+
+        self.assertIs(driver.model, model)
+        self.assertEqual(performance["streams"], {})
+        self.assertEqual(list(performance["chains"]), ["1", "2"])
+        # Only the chain table columns are walked
+        stream_table = MimosaDriver.b_c_series_OIDs["mimosa_stream_table"]
+        self.assertEqual(len(walk.args), 4)
+        self.assertFalse(any(oid.startswith(stream_table) for oid in walk.args))
+
+    def test_builtin_model_gaps_not_requested(self):
+        self.addCleanup(models.forget_models)
+        requested = []
+
+        with SimulatedAgent(a_series_data()) as agent:
+            hostname, port = agent.addresses[0]
+            driver = MimosaDriver(
+                "public", "auto", hostname, optional_args={"snmp_port": port}
+            )
+            send_request = driver._send_request
+
+            def record_request(kind, var_binds, oids, options):
+                requested.extend(oids)
+                return send_request(kind, var_binds, oids, options)
+
+            with mock.patch.object(driver, "_send_request", record_request):
+                settings = driver.get_wireless_settings()
+
+        self.assertEqual(driver.model.name, "mimosaA5")
+        self.assertEqual(settings["mimosa_wireless_mode"], "wifiinterop")
+        for name in ("unlock_code", "regulatory_domain"):
+            self.assertNotIn(MimosaDriver.a_series_OIDs[name], requested)
+            self.assertEqual(
+                settings[name], "No Such Object currently exists at this OID"
+            )
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_auto_series_unknown_model(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        mock_getCmd.return_value = iter(
+            [(None, 0, 0, [("", ObjectIdentifier("1.3.6.1.4.1.9.1.1"))])]
+        )
+        driver = MimosaDriver("community", "auto", "unknown-host")
+
+        with self.assertRaises(ValueError):
+            driver.open()
+        self.assertIsNone(models.detected_model("unknown-host"))
+
+    def test_validate_errors(self):
+        with self.assertRaises(ValueError):
+            MimosaDriver(
+                "community", "a_series", "hostname", optional_args={"errors": "ignore"}
+            )
+        with self.assertRaises(ValueError):
+            MimosaDriver(
+                "community",
+                "a_series",
+                "hostname",
+                optional_args={"errors": "partial", "delta": True},
+            )
+
+    def test_validate_snmp_version(self):
+        with self.assertRaises(ValueError):
+            MimosaDriver(
+                "community", "a_series", "hostname", optional_args={"snmp_version": "v4"}
+            )
+        with self.assertRaises(ValueError):
+            MimosaDriver(
+                "", "a_series", "hostname", optional_args={"snmp_version": "v3"}
+            )
+        with self.assertRaises(ValueError):
+            MimosaDriver(
+                "",
+                "a_series",
+                "hostname",
+                optional_args={
+                    "snmp_version": "v3",
+                    "snmp_user": "poller",
+                    "snmp_priv_key": "privkey1",
+                },
+            )
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    def test_snmpv3_cached_peer(self, mock_getCmd):
+        self.addCleanup(usm.forget_usm_peers)
+        peer = usm.UsmPeer(b"\x80\x00\x4f\xb8\x05\x01", 1, 10, 0.0, b"a", b"p")
+        usm._peers[("127.0.0.1", "poller")] = peer
+        mock_getCmd.return_value = iter(
+            [(None, None, None, [("", MockSnmpResponse())])]
+        )
+        driver = MimosaDriver(
+            "",
+            "a_series",
+            "127.0.0.1",
+            optional_args={
+                "snmp_version": "v3",
+                "snmp_user": "poller",
+                "snmp_auth_key": "authkey1",
+                "snmp_priv_key": "privkey1",
+            },
+        )
+        driver.open()
+        self.addCleanup(driver.close)
+
+        # The keys localized for the known radio are used as they are
+        self.assertEqual(driver._snmp_auth.authKey, b"a")
+        self.assertEqual(driver._snmp_auth.authKeyType, usmKeyTypeLocalized)
+        self.assertEqual(driver._snmp_get(".1.3.6.1.2.1.1.3.0"), "mocked_result")
+
+        # A radio rejecting the primed request is discovered again
+        mock_getCmd.return_value = iter([("unknownUserName", None, None, [])])
+        with self.assertRaises(Exception):
+            driver._snmp_get(".1.3.6.1.2.1.1.3.0")
+        self.assertIsNone(usm.usm_peer("127.0.0.1", "poller"))
+        self.assertEqual(driver._snmp_auth.authKey, "authkey1")
+        self.assertEqual(driver._snmp_auth.authKeyType, usmKeyTypePassphrase)
+
 
 if __name__ == "__main__":
     unittest.main()
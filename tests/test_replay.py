@@ -0,0 +1,153 @@
+import os
+import tempfile
+import unittest
+from napalm_mimosa import MimosaDriver
+from napalm_mimosa.errors import SnmpTimeoutError
+from napalm_mimosa.replay import SnmpRecorder, SnmpReplay, decode_value, encode_value
+from pysnmp.hlapi import (
+    Counter32,
+    Counter64,
+    EndOfMibView,
+    Gauge32,
+    Integer,
+    IpAddress,
+    ObjectIdentifier,
+    OctetString,
+    TimeTicks,
+)
+from pysnmp.proto.errind import requestTimedOut
+from pysnmp.proto.rfc1902 import ObjectName
+from pysnmp.proto.rfc1905 import NoSuchInstance
+from unittest import mock
+
+CHAIN = "1.3.6.1.4.1.43356.2.1.2.6.1.1."
+
+
+def bulk_cmd(table):
+    # GETBULK over a sorted OID table
+    table = sorted((ObjectName(oid), value) for oid, value in table.items())
+
+    def next_var_bind(name):
+        for oid, value in table:
+            if oid > name:
+                return oid, value
+        return name, EndOfMibView()
+
+    def command(
+        engine, auth, transport, context, non_repeaters, max_rep, *var_binds, **kwargs
+    ):
+        names = [name for name, _ in var_binds]
+        for _ in range(max_rep):
+            row = [next_var_bind(name) for name in names]
+            names = [name for name, _ in row]
+            yield None, 0, 0, row
+
+    return command
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "capture.jsonl.gz")
+
+    def test_value_round_trip(self):
+        for value in (
+            Integer(-550),
+            Counter32(7),
+            Counter64(2**40),
+            Gauge32(1000),
+            TimeTicks(123),
+            IpAddress("10.10.10.28"),
+            OctetString("mimosa"),
+            OctetString(hexValue="00112233445a"),
+            ObjectIdentifier("1.3.6.1.4.1.43356.1.1.3"),
+            ObjectName("1.3.6.1.2.1.1.2.0"),
+            NoSuchInstance(""),
+        ):
+            decoded = decode_value(*encode_value(value))
+            self.assertEqual(decoded, value)
+            self.assertEqual(encode_value(decoded), encode_value(value))
+
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_record_and_replay(self, mock_snmp_engine, mock_udp_transport_target):
+        agent = bulk_cmd(
+            {
+                CHAIN + "3.1": Integer(-550),
+                CHAIN + "3.2": Integer(-550),
+                CHAIN + "5.1": Integer(352),
+            }
+        )
+        driver = MimosaDriver(
+            "community", "b_c_series", "radio", optional_args={"record": self.path}
+        )
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd", agent):
+            recorded = driver.get_wireless_performance()
+        driver.close()
+
+        replay = SnmpReplay(self.path)
+        self.assertEqual(replay.radios(), ["radio"])
+        driver = MimosaDriver(
+            "community", "b_c_series", "radio", optional_args={"replay": replay}
+        )
+        with mock.patch("napalm_mimosa.mimosa.bulkCmd") as mock_bulk_cmd:
+            self.assertEqual(driver.get_wireless_performance(), recorded)
+            # Requests packed differently are answered from the recorded values
+            driver.max_repetitions = 1
+            self.assertEqual(driver.get_wireless_performance(), recorded)
+        mock_bulk_cmd.assert_not_called()
+        mock_snmp_engine.assert_called_once()
+
+        # Radios without captures time out
+        other = MimosaDriver(
+            "community", "b_c_series", "other", optional_args={"replay": replay}
+        )
+        self.assertIn("timeout", other.get_wireless_performance())
+
+    @mock.patch("napalm_mimosa.mimosa.getCmd")
+    @mock.patch("napalm_mimosa.mimosa.UdpTransportTarget")
+    @mock.patch("napalm_mimosa.mimosa.SnmpEngine")
+    def test_replay_in_order(
+        self, mock_snmp_engine, mock_udp_transport_target, mock_getCmd
+    ):
+        oid = ".1.3.6.1.4.1.43356.2.1.2.1.6.0"
+        mock_getCmd.side_effect = [
+            iter([(None, 0, 0, [(ObjectName(oid[1:]), Counter32(1))])]),
+            iter([(None, 0, 0, [(ObjectName(oid[1:]), Counter32(2))])]),
+            iter([(requestTimedOut, 0, 0, [])]),
+        ]
+        with SnmpRecorder(self.path) as recorder:
+            driver = MimosaDriver(
+                "community",
+                "b_c_series",
+                "radio",
+                optional_args={
+                    "record": recorder,
+                    "snmp_retries": 0,
+                    "errors": "raise",
+                },
+            )
+            driver._snmp_get(oid)
+            driver._snmp_get(oid)
+            with self.assertRaises(SnmpTimeoutError):
+                driver._snmp_get(oid)
+
+        driver = MimosaDriver(
+            "community",
+            "b_c_series",
+            "radio",
+            optional_args={"replay": self.path, "errors": "raise"},
+        )
+        self.assertEqual(driver._snmp_get(oid), "1")
+        self.assertEqual(driver._snmp_get(oid), "2")
+        with self.assertRaises(SnmpTimeoutError) as raised:
+            driver._snmp_get(oid)
+        self.assertEqual(raised.exception.oids, (oid,))
+        # The last response is repeated
+        with self.assertRaises(SnmpTimeoutError):
+            driver._snmp_get(oid)
+
+
+if __name__ == "__main__":
+    unittest.main()
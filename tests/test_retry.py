@@ -0,0 +1,136 @@
+import unittest
+from benchmarks.agent import SimulatedAgent, b_c_series_data
+from napalm_mimosa import MimosaDriver
+from napalm_mimosa.retry import (
+    CircuitBreaker,
+    RttEstimator,
+    attempt_timeouts,
+)
+from pysnmp.hlapi import SnmpEngine
+from unittest import mock
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRttEstimator(unittest.TestCase):
+    def test_update_and_backoff(self):
+        estimator = RttEstimator(initial_timeout=1.0, max_timeout=4.0)
+
+        estimator.update(0.1)
+        self.assertAlmostEqual(estimator.srtt, 0.1)
+        self.assertAlmostEqual(estimator.timeout, 0.3)
+
+        estimator.update(0.1)
+        self.assertAlmostEqual(estimator.rttvar, 0.0375)
+        self.assertAlmostEqual(estimator.timeout, 0.25)
+
+        for _ in range(5):
+            estimator.backoff()
+        self.assertEqual(estimator.timeout, 4.0)
+
+    def test_min_timeout(self):
+        estimator = RttEstimator(min_timeout=0.2)
+        estimator.update(0.001)
+        self.assertEqual(estimator.timeout, 0.2)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_and_probes(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.allow())
+
+        clock.now = 10
+        self.assertTrue(breaker.allow())
+        # Only one probe at a time while half-open
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+
+        clock.now = 20
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+        self.assertTrue(breaker.allow())
+
+
+class TestAttemptTimeouts(unittest.TestCase):
+    @mock.patch("napalm_mimosa.retry.time.monotonic", return_value=0.0)
+    def test_timeout_steps(self, mock_monotonic):
+        def timeouts(timeout, deadline=1000.0, retries=0, estimator=None):
+            return [
+                t for _, t in attempt_timeouts(retries, timeout, deadline, estimator)
+            ]
+
+        # A configured timeout is used as is
+        self.assertEqual(timeouts(4.0), [4.0])
+        self.assertEqual(timeouts(12.0, retries=2), [12.0, 12.0, 12.0])
+        # Estimated timeouts are rounded up to a step
+        self.assertEqual(timeouts(1.0, estimator=RttEstimator(0.42)), [0.5])
+        self.assertEqual(timeouts(1.0, estimator=RttEstimator(4.0)), [5.0])
+        self.assertEqual(timeouts(1.0, estimator=RttEstimator(90.2)), [91.0])
+        # An attempt that would run past the deadline is cut short to a step
+        self.assertEqual(timeouts(5.0, deadline=1.2), [1.0])
+        self.assertEqual(timeouts(5.0, deadline=0.05), [0.1])
+        self.assertEqual(timeouts(5.0, deadline=0.0), [])
+
+    def test_engine_targets_are_bounded(self):
+        engine = SnmpEngine()
+        estimator = RttEstimator()
+        with SimulatedAgent(b_c_series_data()) as agent:
+            hostname, port = agent.addresses[0]
+            driver = MimosaDriver(
+                "public",
+                "b_c_series",
+                hostname,
+                optional_args={
+                    "snmp_port": port,
+                    "snmp_engine": engine,
+                    "adaptive_timeout": estimator,
+                },
+            )
+            for n in range(40):
+                estimator.timeout = 0.2 + n * 0.05
+                driver.get_dns_servers()
+            driver.close()
+
+        targets = engine.getUserContext("CommandGeneratorLcdConfigurator")["addr"]
+        timeouts = {timeout for (_, _, _, timeout, *_) in targets}
+        # 40 timeouts from 0.2 to 2.15 s map to 8 steps, and to 8 targets
+        self.assertEqual(timeouts, {0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0})
+        self.assertEqual(len(targets), len(timeouts))
+
+
+    def test_configured_timeout_unchanged(self):
+        engine = SnmpEngine()
+        with SimulatedAgent(b_c_series_data()) as agent:
+            hostname, port = agent.addresses[0]
+            driver = MimosaDriver(
+                "public",
+                "b_c_series",
+                hostname,
+                optional_args={
+                    "snmp_port": port,
+                    "snmp_engine": engine,
+                    "snmp_timeout": 4,
+                },
+            )
+            driver.get_dns_servers()
+            driver.close()
+
+        targets = engine.getUserContext("CommandGeneratorLcdConfigurator")["addr"]
+        self.assertEqual({timeout for (_, _, _, timeout, *_) in targets}, {4})
+
+if __name__ == "__main__":
+    unittest.main()
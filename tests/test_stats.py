@@ -0,0 +1,111 @@
+import unittest
+from benchmarks.agent import SimulatedAgent, b_c_series_data
+from napalm_mimosa import MimosaDriver
+from napalm_mimosa.stats import RequestEvent, SnmpStats, current_getter, getter_label
+from pyasn1.codec.ber import encoder
+from pysnmp.proto import api
+
+
+def event(**fields):
+    defaults = dict(
+        hostname="hostname",
+        getter="get_facts",
+        kind="get",
+        oids=(".1.3.6.1.2.1.1.3.0",),
+        varbinds_sent=1,
+        varbinds_received=1,
+        bytes_sent=40,
+        bytes_received=45,
+        attempts=1,
+        timeouts=0,
+        latency=0.02,
+        error=None,
+    )
+    return RequestEvent(**{**defaults, **fields})
+
+
+class TestSnmpStats(unittest.TestCase):
+    def test_counters_and_histograms(self):
+        stats = SnmpStats(buckets=(0.01, 0.1))
+
+        stats(event())
+        stats(event(attempts=3, timeouts=2, latency=2.5))
+        stats(event(attempts=2, timeouts=2, error="SNMP Error: timeout"))
+
+        result = stats.as_dict()
+        self.assertEqual(result["counters"]["requests"], 3)
+        self.assertEqual(result["counters"]["pdus_sent"], 6)
+        self.assertEqual(result["counters"]["retries"], 3)
+        self.assertEqual(result["counters"]["timeouts"], 4)
+        self.assertEqual(result["counters"]["errors"], 1)
+        self.assertEqual(result["counters"]["bytes_sent"], 120)
+        self.assertEqual(result["varbinds_per_pdu"], {1: 3})
+        # Failed requests have no latency
+        self.assertEqual(
+            result["latency_by_getter"]["get_facts"]["buckets"],
+            {0.01: 0, 0.1: 1, float("inf"): 2},
+        )
+        self.assertEqual(result["latency_by_oid"][".1.3.6.1.2.1.1.3.0"]["count"], 2)
+        self.assertAlmostEqual(result["latency_by_host"]["hostname"]["sum"], 2.52)
+
+    def test_getter_label(self):
+        def _get_facts_plan():
+            yield
+
+        def _get_interfaces_list_plan():
+            yield
+
+        with getter_label(_get_facts_plan()):
+            with getter_label(_get_interfaces_list_plan()):
+                self.assertEqual(current_getter(), "get_facts")
+        self.assertIsNone(current_getter())
+
+
+def message_size(pdu, var_binds):
+    # Size of an SNMPv2c message carrying ``var_binds`` with request-id 0
+    p_mod = api.protoModules[api.protoVersion2c]
+    p_mod.apiPDU.setDefaults(pdu)
+    p_mod.apiPDU.setRequestID(pdu, 0)
+    p_mod.apiPDU.setVarBinds(pdu, var_binds)
+    message = p_mod.Message()
+    p_mod.apiMessage.setDefaults(message)
+    p_mod.apiMessage.setCommunity(message, "public")
+    p_mod.apiMessage.setPDU(message, pdu)
+    return len(encoder.encode(message))
+
+
+class TestEngineTraffic(unittest.TestCase):
+    def test_bytes_on_the_wire(self):
+        data = b_c_series_data()
+        events = []
+        with SimulatedAgent(data) as agent:
+            hostname, port = agent.addresses[0]
+            driver = MimosaDriver(
+                "public",
+                "b_c_series",
+                hostname,
+                optional_args={"snmp_port": port, "stats": events.append},
+            )
+            dns_servers = driver.get_dns_servers()
+            driver.close()
+
+        (event,) = events
+        self.assertEqual(dns_servers["primary_dns_server"], "8.8.8.8")
+        self.assertEqual((event.getter, event.kind), ("get_dns_servers", "get"))
+        self.assertEqual((event.varbinds_sent, event.varbinds_received), (2, 2))
+
+        p_mod = api.protoModules[api.protoVersion2c]
+        oids = [oid.lstrip(".") for oid in event.oids]
+        request = message_size(
+            p_mod.GetRequestPDU(), [(oid, p_mod.Null("")) for oid in oids]
+        )
+        response = message_size(
+            p_mod.ResponsePDU(), [(oid, data[oid]) for oid in oids]
+        )
+        # The random request-id takes up to 4 bytes, 0 takes 1
+        self.assertIn(event.bytes_sent - request, range(4))
+        self.assertEqual(event.bytes_received - event.bytes_sent, response - request)
+
+
+if __name__ == "__main__":
+    unittest.main()
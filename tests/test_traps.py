@@ -0,0 +1,159 @@
+import socket
+import unittest
+from unittest import mock
+from pyasn1.codec.ber import decoder, encoder
+from pysnmp.proto import api
+from benchmarks.agent import SimulatedAgent, b_c_series_data
+from napalm_mimosa import MimosaDriver
+from napalm_mimosa.cache import SnmpCache
+from napalm_mimosa.traps import TrapReceiver
+
+LINK_DOWN = "1.3.6.1.6.3.1.1.5.3"
+MIMOSA_TRAP = "1.3.6.1.4.1.43356.2.0.1"
+
+
+def v2c_message(pdu, notification, community="public"):
+    p_mod = api.protoModules[api.protoVersion2c]
+    p_mod.apiPDU.setDefaults(pdu)
+    p_mod.apiPDU.setVarBinds(
+        pdu,
+        [
+            ("1.3.6.1.2.1.1.3.0", p_mod.TimeTicks(500)),
+            ("1.3.6.1.6.3.1.1.4.1.0", p_mod.ObjectIdentifier(notification)),
+            ("1.3.6.1.2.1.2.2.1.1.2", p_mod.Integer(2)),
+        ],
+    )
+    message = p_mod.Message()
+    p_mod.apiMessage.setDefaults(message)
+    p_mod.apiMessage.setCommunity(message, community)
+    p_mod.apiMessage.setPDU(message, pdu)
+    return encoder.encode(message)
+
+
+def v1_trap(enterprise, generic, specific=0):
+    p_mod = api.protoModules[api.protoVersion1]
+    pdu = p_mod.TrapPDU()
+    p_mod.apiTrapPDU.setDefaults(pdu)
+    p_mod.apiTrapPDU.setEnterprise(pdu, enterprise)
+    p_mod.apiTrapPDU.setGenericTrap(pdu, generic)
+    p_mod.apiTrapPDU.setSpecificTrap(pdu, specific)
+    message = p_mod.Message()
+    p_mod.apiMessage.setDefaults(message)
+    p_mod.apiMessage.setCommunity(message, "public")
+    p_mod.apiMessage.setPDU(message, pdu)
+    return encoder.encode(message)
+
+
+class TestTrapReceiver(unittest.TestCase):
+    def setUp(self):
+        # The getters of a driver sharing the cache fill every cache class
+        self.cache = SnmpCache()
+        with SimulatedAgent(b_c_series_data()) as agent:
+            hostname, port = agent.addresses[0]
+            driver = MimosaDriver(
+                "public",
+                "b_c_series",
+                hostname,
+                optional_args={
+                    "snmp_port": port,
+                    "cache": self.cache,
+                    "cache_ttl": {"operational": 60},
+                },
+            )
+            driver.get_facts()
+            driver.get_wireless_settings()
+            driver.close()
+        self.radio = driver.radio_address
+        self.filled = len(self.cache)
+        self.events = []
+        self.receiver = TrapReceiver(
+            communities=["public"],
+            cache=self.cache,
+            callback=self.events.append,
+            hostnames={"10.0.0.1": self.radio},
+        )
+
+    def cached(self):
+        return {cache_class for _, _, cache_class in self.cache._entries.values()}
+
+    def test_v2c_trap(self):
+        p_mod = api.protoModules[api.protoVersion2c]
+        self.assertEqual(self.cached(), {"static", "config", "operational"})
+        response = self.receiver.handle_message(
+            v2c_message(p_mod.SNMPv2TrapPDU(), LINK_DOWN), ("10.0.0.1", 40000)
+        )
+
+        self.assertIsNone(response)
+        (event,) = self.events
+        self.assertEqual(event.hostname, self.radio)
+        self.assertEqual(event.event, "link_down")
+        self.assertEqual(event.notification, LINK_DOWN)
+        self.assertEqual(event.var_binds[2], ("1.3.6.1.2.1.2.2.1.1.2", 2))
+        self.assertEqual(self.cached(), {"static", "config"})
+        self.assertEqual(self.receiver.changed(), {self.radio})
+        self.assertEqual(self.receiver.changed(), set())
+
+    def test_inform_is_acknowledged(self):
+        p_mod = api.protoModules[api.protoVersion2c]
+        request = v2c_message(p_mod.InformRequestPDU(), MIMOSA_TRAP)
+
+        response = self.receiver.handle_message(request, ("10.0.0.2", 40000))
+
+        message, _ = decoder.decode(response, asn1Spec=p_mod.Message())
+        pdu = p_mod.apiMessage.getPDU(message)
+        self.assertTrue(pdu.isSameTypeWith(p_mod.ResponsePDU()))
+        self.assertEqual(len(p_mod.apiPDU.getVarBinds(pdu)), 3)
+        # Radios not in hostnames are known by their address
+        self.assertEqual(self.events[0].hostname, "10.0.0.2")
+        self.assertEqual(self.events[0].event, "config")
+
+    @mock.patch("napalm_mimosa.traps.forget_usm_peers")
+    @mock.patch("napalm_mimosa.traps.forget_models")
+    def test_v1_traps(self, mock_forget_models, mock_forget_usm_peers):
+        self.receiver.handle_message(
+            v1_trap("1.3.6.1.4.1.43356.2", 0), ("10.0.0.1", 162)
+        )
+        self.receiver.handle_message(
+            v1_trap("1.3.6.1.4.1.43356.2", 6, 1), ("10.0.0.1", 162)
+        )
+
+        self.assertEqual(
+            [(event.event, event.notification) for event in self.events],
+            [("restart", "1.3.6.1.6.3.1.1.5.1"), ("config", MIMOSA_TRAP)],
+        )
+        mock_forget_models.assert_called_once_with(self.radio)
+        mock_forget_usm_peers.assert_called_once_with(self.radio)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_dropped_messages(self):
+        p_mod = api.protoModules[api.protoVersion2c]
+        self.receiver.handle_message(
+            v2c_message(p_mod.SNMPv2TrapPDU(), LINK_DOWN, "private"),
+            ("10.0.0.1", 162),
+        )
+        self.receiver.handle_message(
+            v2c_message(p_mod.GetRequestPDU(), LINK_DOWN), ("10.0.0.1", 162)
+        )
+        self.receiver.handle_message(b"not snmp", ("10.0.0.1", 162))
+
+        self.assertEqual(self.receiver.dropped, 3)
+        self.assertEqual(self.events, [])
+        self.assertEqual(len(self.cache), self.filled)
+
+    def test_receive_over_udp(self):
+        p_mod = api.protoModules[api.protoVersion2c]
+        self.receiver.address = ("127.0.0.1", 0)
+        with self.receiver, socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as radio:
+            radio.settimeout(5)
+            radio.sendto(
+                v2c_message(p_mod.InformRequestPDU(), LINK_DOWN),
+                self.receiver.address,
+            )
+            response, _ = radio.recvfrom(65535)
+
+        self.assertTrue(response)
+        self.assertEqual(self.receiver.changed(), {"127.0.0.1"})
+
+
+if __name__ == "__main__":
+    unittest.main()
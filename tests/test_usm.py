@@ -0,0 +1,93 @@
+import time
+import unittest
+from pysnmp.hlapi import (
+    SnmpEngine,
+    UdpTransportTarget,
+    usmAesCfb128Protocol,
+    usmHMACSHAAuthProtocol,
+    usmKeyTypeLocalized,
+    usmKeyTypePassphrase,
+)
+from napalm_mimosa import usm
+
+
+class TestUsm(unittest.TestCase):
+    def setUp(self):
+        self.peer = usm.UsmPeer(
+            b"\x80\x00\x4f\xb8\x05\x01", 3, 1000, time.monotonic() - 10, b"a", b"p"
+        )
+        self.addCleanup(usm.forget_usm_peers)
+
+    def test_user_data(self):
+        data = usm.user_data("poller", "authkey1", "privkey1", "sha", "aes")
+        self.assertEqual(data.authProtocol, usmHMACSHAAuthProtocol)
+        self.assertEqual(data.privProtocol, usmAesCfb128Protocol)
+        self.assertEqual(data.authKeyType, usmKeyTypePassphrase)
+
+        data = usm.user_data("poller", "authkey1", "privkey1", "sha", "aes", self.peer)
+        self.assertEqual(data.authKey, b"a")
+        self.assertEqual(data.privKey, b"p")
+        self.assertEqual(data.authKeyType, usmKeyTypeLocalized)
+        self.assertEqual(data.privKeyType, usmKeyTypeLocalized)
+        self.assertEqual(bytes(data.securityEngineId), self.peer.engine_id)
+
+        # Without auth there are no keys to reuse
+        data = usm.user_data("noauth", None, None, "sha", "aes", self.peer)
+        self.assertIsNone(data.authKey)
+        self.assertEqual(data.authKeyType, usmKeyTypePassphrase)
+
+    def test_prime_engine(self):
+        engine = SnmpEngine()
+        transport = UdpTransportTarget(("127.0.0.1", 161))
+        mp_model = engine.messageProcessingSubsystems[3]
+
+        usm.prime_engine(engine, transport, self.peer)
+        engine_id, _, _ = mp_model.getPeerEngineInfo(
+            transport.transportDomain, transport.transportAddr
+        )
+        self.assertEqual(engine_id, self.peer.engine_id)
+        timeline = engine.securityModels[3]._SnmpUSMSecurityModel__timeline
+        boots, engine_time, _, _ = timeline[self.peer.engine_id]
+        self.assertEqual(boots, 3)
+        self.assertGreaterEqual(engine_time, 1010)
+
+        usm.unprime_engine(engine, transport)
+        engine_id, _, _ = mp_model.getPeerEngineInfo(
+            transport.transportDomain, transport.transportAddr
+        )
+        self.assertIsNone(engine_id)
+
+    def test_remember_observed_peer(self):
+        engine = SnmpEngine()
+        transport = UdpTransportTarget(("127.0.0.1", 161))
+        usm.observe_usm(engine)
+        usm._observe_message(
+            engine,
+            "rfc3414.processIncomingMsg",
+            {
+                "securityEngineId": self.peer.engine_id,
+                "userName": b"poller",
+                "snmpEngineBoots": 3,
+                "snmpEngineTime": 1000,
+                "authKey": b"a",
+                "privKey": b"p",
+            },
+            None,
+        )
+
+        # Nothing is remembered until the engine knows the radio's engine ID
+        usm.remember_usm_peer("radio", "poller", engine, transport)
+        self.assertIsNone(usm.usm_peer("radio", "poller"))
+
+        usm.prime_engine(engine, transport, self.peer)
+        usm.remember_usm_peer("radio", "poller", engine, transport)
+        peer = usm.usm_peer("radio", "poller")
+        self.assertEqual(peer.engine_id, self.peer.engine_id)
+        self.assertEqual((peer.auth_key, peer.priv_key), (b"a", b"p"))
+
+        usm.forget_usm_peers("radio")
+        self.assertIsNone(usm.usm_peer("radio", "poller"))
+
+
+if __name__ == "__main__":
+    unittest.main()